@@ -27,6 +27,8 @@ app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DATABASE_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key')
 app.config['JSON_SORT_KEYS'] = False
+# Let a front server (Apache mod_xsendfile, lighttpd) send artifact files itself
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
 
 # Import db from models first
 from models import db, Researcher, SimulationProject, QuantumSimulation, SimulationResult, ReproducibilityMetadata
@@ -34,6 +36,75 @@ from models import db, Researcher, SimulationProject, QuantumSimulation, Simulat
 # Initialize db with app
 db.init_app(app)
 
+# Install trigger-maintained derived tables on existing databases
+from utils.rollups import ensure_rollups, rollups_cli
+from utils.search_index import ensure_search_index, search_cli
+from utils.access_counters import ensure_access_counters, audit_cli
+from utils.parameter_index import ensure_parameter_index, parameters_cli
+from utils.output_store import ensure_output_store, results_cli
+from utils.artifacts import ensure_artifact_store
+from utils.runner import jobs_cli
+from utils.statevector import statevector_cli
+with app.app_context():
+    try:
+        ensure_rollups()
+    except Exception as e:
+        print(f"⚠️  Could not install analytics rollups: {e}")
+    try:
+        ensure_search_index()
+    except Exception as e:
+        print(f"⚠️  Could not install search index: {e}")
+    try:
+        ensure_access_counters()
+    except Exception as e:
+        print(f"⚠️  Could not install access-log counters: {e}")
+    try:
+        ensure_parameter_index()
+    except Exception as e:
+        print(f"⚠️  Could not install parameter index: {e}")
+    try:
+        ensure_output_store()
+    except Exception as e:
+        print(f"⚠️  Could not install output blob store: {e}")
+    try:
+        ensure_artifact_store()
+    except Exception as e:
+        print(f"⚠️  Could not install artifact store: {e}")
+app.cli.add_command(rollups_cli)
+app.cli.add_command(search_cli)
+app.cli.add_command(audit_cli)
+app.cli.add_command(parameters_cli)
+app.cli.add_command(results_cli)
+app.cli.add_command(jobs_cli)
+app.cli.add_command(statevector_cli)
+
+# Cached GET responses and ETags follow the shared table versions; commits
+# of this process are also reported to the in-process on_commit listeners
+from utils.cache import ensure_table_versions, track_table_changes, cached_response
+with app.app_context():
+    try:
+        ensure_table_versions()
+    except Exception as e:
+        print(f"⚠️  Could not install table versions: {e}")
+track_table_changes(db.session)
+
+# AccessLog rows (logins, logouts, identified GETs) go through the batched audit writer
+from utils.audit import audit_writer, record_reads
+with app.app_context():
+    audit_writer.start(db.engine)
+record_reads(app)
+
+# Type-ahead suggestions: built in the background, kept current from commits
+from utils.suggest import suggestion_index, track_suggestion_changes
+with app.app_context():
+    suggestion_index.start(db.engine)
+track_suggestion_changes(db.session)
+
+# Change feed: local commits publish directly, other processes' writes are polled for
+from utils.changefeed import change_hub
+with app.app_context():
+    change_hub.start(db.engine)
+
 # Enable CORS
 CORS(app)
 
@@ -41,21 +112,25 @@ CORS(app)
 from routes.researchers import researchers_bp
 from routes.projects import projects_bp
 from routes.simulations import simulations_bp
+from routes.artifacts import artifacts_bp
 from routes.analytics import analytics_bp
 from routes.export import export_bp
 from routes.search import search_bp
 from routes.auth import auth_bp
 from routes.triggers import triggers_bp  # NEW
+from routes.stream import stream_bp
 
 # Register all blueprints
 app.register_blueprint(researchers_bp, url_prefix='/api/researchers')
 app.register_blueprint(projects_bp, url_prefix='/api/projects')
 app.register_blueprint(simulations_bp, url_prefix='/api/simulations')
+app.register_blueprint(artifacts_bp, url_prefix='/api/simulations')
 app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
 app.register_blueprint(export_bp, url_prefix='/api/export')
 app.register_blueprint(search_bp, url_prefix='/api/search')
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(triggers_bp, url_prefix='/api/triggers')  # NEW
+app.register_blueprint(stream_bp, url_prefix='/api/stream')
 
 # Root endpoint
 @app.route('/')
@@ -73,6 +148,7 @@ def index():
             'export': '/api/export',
             'auth': '/api/auth',
             'triggers': '/api/triggers',  # NEW
+            'stream': '/api/stream/changes',
             'dashboard': '/api/analytics/dashboard'
         }
     })
@@ -89,6 +165,7 @@ def health():
 
 # Analytics dashboard endpoint
 @app.route('/api/analytics/dashboard')
+@cached_response()
 def dashboard():
     try:
         total_researchers = Researcher.query.count()
@@ -97,12 +174,16 @@ def dashboard():
         total_simulations = QuantumSimulation.query.count()
         completed_sims = QuantumSimulation.query.filter_by(status='completed').count()
         
-        # Calculate averages
-        results = SimulationResult.query.all()
-        avg_fidelity = sum(r.fidelity for r in results if r.fidelity) / len(results) if results else 0
+        # Calculate averages (over all result/metadata rows, as before)
+        fidelity_sum, result_count = db.session.query(
+            db.func.sum(SimulationResult.fidelity), db.func.count(SimulationResult.result_id)
+        ).one()
+        avg_fidelity = (fidelity_sum or 0) / result_count if result_count else 0
         
-        metadata = ReproducibilityMetadata.query.all()
-        avg_repro = sum(m.reproducibility_score for m in metadata if m.reproducibility_score) / len(metadata) if metadata else 0
+        repro_sum, metadata_count = db.session.query(
+            db.func.sum(ReproducibilityMetadata.reproducibility_score), db.func.count(ReproducibilityMetadata.metadata_id)
+        ).one()
+        avg_repro = (repro_sum or 0) / metadata_count if metadata_count else 0
         
         return jsonify({
             'total_researchers': total_researchers,
@@ -139,6 +220,7 @@ if __name__ == '__main__':
     print(f"🔍 Search: http://localhost:5000/api/search")
     print(f"📤 Export: http://localhost:5000/api/export")
     print(f"⚡ Triggers: http://localhost:5000/api/triggers")  # NEW
+    print(f"📡 Changes: http://localhost:5000/api/stream/changes")
     print("="*60 + "\n")
     
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
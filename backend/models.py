@@ -58,13 +58,14 @@ class SimulationProject(db.Model):
     team_members = db.relationship('ProjectResearcher', backref='project', lazy='dynamic', cascade='all, delete-orphan')
     
     def to_dict(self, include_stats=False):
+        from utils.identity import researcher_directory
         data = {
             'project_id': self.project_id,
             'title': self.title,
             'description': self.description,
             'field_of_study': self.field_of_study,
             'owner_id': self.owner_id,
-            'owner_name': f"{self.owner.first_name} {self.owner.last_name}",
+            'owner_name': researcher_directory.name(self.owner_id),
             'status': self.status,
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'end_date': self.end_date.isoformat() if self.end_date else None,
@@ -104,14 +105,16 @@ class QuantumSimulation(db.Model):
     parameters = db.relationship('Parameter', backref='simulation', lazy='dynamic', cascade='all, delete-orphan')
     result = db.relationship('SimulationResult', backref='simulation', uselist=False, cascade='all, delete-orphan')
     repro_metadata = db.relationship('ReproducibilityMetadata', backref='simulation', uselist=False, cascade='all, delete-orphan')
+    artifacts = db.relationship('SimulationArtifact', backref='simulation', lazy='dynamic', cascade='all, delete-orphan')
     
     def to_dict(self, include_details=False):
+        from utils.identity import researcher_directory
         data = {
             'run_id': self.run_id,
             'project_id': self.project_id,
             'simulation_id': self.simulation_id,
             'researcher_id': self.researcher_id,
-            'researcher_name': f"{self.researcher.first_name} {self.researcher.last_name}",
+            'researcher_name': researcher_directory.name(self.researcher_id),
             'framework': self.framework,
             'num_qubits': self.num_qubits,
             'circuit_depth': self.circuit_depth,
@@ -151,23 +154,69 @@ class SimulationResult(db.Model):
     
     result_id = db.Column(db.Integer, primary_key=True)
     run_id = db.Column(db.Integer, db.ForeignKey('quantum_simulation.run_id'), unique=True, nullable=False)
-    output_data = db.Column(db.Text)
+    output_data = db.deferred(db.Column(db.Text))  # legacy inline payloads, see output_digest
+    output_digest = db.Column(db.String(64))  # payload in output_blob (utils/output_store.py)
     execution_time_seconds = db.Column(db.Float)
     success_probability = db.Column(db.Float)
     fidelity = db.Column(db.Float)
     energy_value = db.Column(db.Float)
-    measurement_counts = db.Column(db.Text)
+    measurement_counts = db.Column(db.LargeBinary)  # packed histogram (utils/counts_encoding.py), or legacy JSON text
     error_rate = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, include_output=False):
+        data = {
             'result_id': self.result_id,
             'run_id': self.run_id,
             'execution_time_seconds': self.execution_time_seconds,
             'success_probability': self.success_probability,
             'fidelity': self.fidelity,
-            'error_rate': self.error_rate
+            'error_rate': self.error_rate,
+            'output_digest': self.output_digest
+        }
+        if include_output:
+            from utils.output_store import get_output, legacy_payload
+            if self.output_digest:
+                data['output_data'] = get_output(self.output_digest)
+            else:
+                data['output_data'] = legacy_payload(self.output_data)
+        return data
+
+class OutputBlob(db.Model):
+    """Content-addressed, compressed output payloads (database/output_blobs.sql)"""
+    __tablename__ = 'output_blob'
+    
+    digest = db.Column(db.String(64), primary_key=True)
+    codec = db.Column(db.String(10), nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    stored_size = db.Column(db.Integer, nullable=False)
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SimulationArtifact(db.Model):
+    """Large per-run files kept on disk under ARTIFACT_DIR (database/artifacts.sql)"""
+    __tablename__ = 'simulation_artifact'
+    __table_args__ = (db.UniqueConstraint('run_id', 'name'),)
+    
+    artifact_id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('quantum_simulation.run_id'), nullable=False)
+    name = db.Column(db.String(128), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False)
+    content_type = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'artifact_id': self.artifact_id,
+            'run_id': self.run_id,
+            'name': self.name,
+            'size': self.size,
+            'sha256': self.sha256,
+            'content_type': self.content_type,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class ReproducibilityMetadata(db.Model):
@@ -192,6 +241,47 @@ class ReproducibilityMetadata(db.Model):
             'reproducibility_score': self.reproducibility_score
         }
 
+class SimulationRollup(db.Model):
+    """Trigger-maintained analytics aggregates (database/rollups.sql)"""
+    __tablename__ = 'simulation_rollup'
+    
+    framework = db.Column(db.String(50), primary_key=True)
+    algorithm_type = db.Column(db.String(100), primary_key=True, default='')
+    num_qubits = db.Column(db.Integer, primary_key=True)
+    researcher_id = db.Column(db.Integer, primary_key=True)
+    run_count = db.Column(db.Integer, default=0)
+    fidelity_sum = db.Column(db.Float, default=0)
+    fidelity_count = db.Column(db.Integer, default=0)
+    success_sum = db.Column(db.Float, default=0)
+    success_count = db.Column(db.Integer, default=0)
+    time_sum = db.Column(db.Float, default=0)
+    time_count = db.Column(db.Integer, default=0)
+    repro_sum = db.Column(db.Float, default=0)
+    repro_count = db.Column(db.Integer, default=0)
+
+class SimulationTrendRollup(db.Model):
+    """Trigger-maintained per-bucket trend aggregates (database/rollups.sql)"""
+    __tablename__ = 'simulation_trend_rollup'
+    
+    resolution = db.Column(db.String(10), primary_key=True)
+    bucket = db.Column(db.String(20), primary_key=True)
+    run_count = db.Column(db.Integer, default=0)
+    fidelity_sum = db.Column(db.Float, default=0)
+    fidelity_count = db.Column(db.Integer, default=0)
+    repro_sum = db.Column(db.Float, default=0)
+    repro_count = db.Column(db.Integer, default=0)
+
+class ParameterIndex(db.Model):
+    """Trigger-maintained typed copy of parameter values (database/parameter_index.sql)"""
+    __tablename__ = 'parameter_index'
+    
+    parameter_id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, nullable=False)
+    parameter_name = db.Column(db.String(100), nullable=False)
+    numeric_value = db.Column(db.Float)
+    bool_value = db.Column(db.Integer)
+    string_value = db.Column(db.Text)
+
 # NEW MODEL - Add this at the end
 class AccessLog(db.Model):
     __tablename__ = 'access_log'
@@ -218,4 +308,15 @@ class AccessLog(db.Model):
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'ip_address': self.ip_address,
             'user_agent': self.user_agent
-        }
\ No newline at end of file
+        }
+
+class AccessLogCounter(db.Model):
+    """Audit-writer-maintained event counts per time bucket (database/access_counters.sql)"""
+    __tablename__ = 'access_log_counter'
+    
+    resolution = db.Column(db.String(10), primary_key=True)
+    bucket = db.Column(db.String(20), primary_key=True)
+    action_type = db.Column(db.String(50), primary_key=True)
+    target_entity = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, default=0)
+    last_at = db.Column(db.DateTime)
\ No newline at end of file
@@ -3,25 +3,55 @@ Advanced Analytics Routes for QSLRM
 """
 
 from flask import Blueprint, jsonify, request
-from models import db, Researcher, SimulationProject, QuantumSimulation, SimulationResult, ReproducibilityMetadata
-from sqlalchemy import func, desc, and_
+from models import db, Researcher, SimulationProject, QuantumSimulation, SimulationResult, ReproducibilityMetadata, SimulationRollup, SimulationTrendRollup
+from utils.conditional import enable_conditional_get, etag_ttl, etag_exempt
+from utils.cache import cached_response, response_cache
+from utils.rollups import TREND_RESOLUTIONS
+from utils.identity import researcher_directory
+from utils.output_store import output_store_stats
+from sqlalchemy import func, desc, and_, case
 from datetime import datetime, timedelta
 
 analytics_bp = Blueprint('analytics', __name__)
 
+# ETag / 304 support, keyed on the tables these views read
+enable_conditional_get(analytics_bp, [
+    'researcher',
+    'simulation_project',
+    'quantum_simulation',
+    'simulation_result',
+    'reproducibility_metadata'
+])
+
+def _rollup_avg(sum_column, count_column):
+    """AVG() reconstructed from a rollup sum/count pair (NULL when nothing was counted)"""
+    return func.sum(sum_column) / func.nullif(func.sum(count_column), 0)
+
+PERIOD_UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+def _trend_bucket(moment, resolution):
+    """Bucket label for a datetime, matching vw_simulation_trend_bucket"""
+    if resolution == 'hour':
+        return moment.strftime('%Y-%m-%d %H:00:00')
+    if resolution == 'week':
+        moment -= timedelta(days=moment.weekday())
+    return moment.date().isoformat()
+
 # Framework Performance Comparison
 @analytics_bp.route('/frameworks', methods=['GET'])
+@cached_response()
 def framework_analysis():
     try:
+        # Reads O(groups) rows from simulation_rollup instead of joining every run
         frameworks = db.session.query(
-            QuantumSimulation.framework,
-            func.count(QuantumSimulation.run_id).label('total_runs'),
-            func.avg(SimulationResult.fidelity).label('avg_fidelity'),
-            func.avg(SimulationResult.execution_time_seconds).label('avg_time'),
-            func.avg(ReproducibilityMetadata.reproducibility_score).label('avg_reproducibility'),
-            func.avg(QuantumSimulation.num_qubits).label('avg_qubits')
-        ).outerjoin(SimulationResult).outerjoin(ReproducibilityMetadata)\
-         .group_by(QuantumSimulation.framework)\
+            SimulationRollup.framework,
+            func.sum(SimulationRollup.run_count).label('total_runs'),
+            _rollup_avg(SimulationRollup.fidelity_sum, SimulationRollup.fidelity_count).label('avg_fidelity'),
+            _rollup_avg(SimulationRollup.time_sum, SimulationRollup.time_count).label('avg_time'),
+            _rollup_avg(SimulationRollup.repro_sum, SimulationRollup.repro_count).label('avg_reproducibility'),
+            (func.sum(SimulationRollup.run_count * SimulationRollup.num_qubits) * 1.0
+             / func.nullif(func.sum(SimulationRollup.run_count), 0)).label('avg_qubits')
+        ).group_by(SimulationRollup.framework)\
          .all()
         
         results = []
@@ -44,15 +74,14 @@ def framework_analysis():
 def algorithm_analysis():
     try:
         algorithms = db.session.query(
-            QuantumSimulation.algorithm_type,
-            func.count(QuantumSimulation.run_id).label('count'),
-            func.avg(SimulationResult.fidelity).label('avg_fidelity'),
-            func.avg(SimulationResult.success_probability).label('avg_success'),
-            func.min(QuantumSimulation.num_qubits).label('min_qubits'),
-            func.max(QuantumSimulation.num_qubits).label('max_qubits')
-        ).outerjoin(SimulationResult)\
-         .filter(QuantumSimulation.algorithm_type.isnot(None))\
-         .group_by(QuantumSimulation.algorithm_type)\
+            SimulationRollup.algorithm_type,
+            func.sum(SimulationRollup.run_count).label('count'),
+            _rollup_avg(SimulationRollup.fidelity_sum, SimulationRollup.fidelity_count).label('avg_fidelity'),
+            _rollup_avg(SimulationRollup.success_sum, SimulationRollup.success_count).label('avg_success'),
+            func.min(SimulationRollup.num_qubits).label('min_qubits'),
+            func.max(SimulationRollup.num_qubits).label('max_qubits')
+        ).filter(SimulationRollup.algorithm_type != '')\
+         .group_by(SimulationRollup.algorithm_type)\
          .all()
         
         results = []
@@ -112,118 +141,161 @@ def leaderboard():
         return jsonify({'error': str(e)}), 500
 
 # Project Health Score
+def _project_health_query():
+    """Per-project run counts and quality sums, all in one grouped query"""
+    completed = QuantumSimulation.status == 'completed'
+    return db.session.query(
+        SimulationProject.project_id,
+        SimulationProject.title,
+        func.count(QuantumSimulation.run_id).label('total'),
+        func.coalesce(func.sum(case((completed, 1), else_=0)), 0).label('completed'),
+        func.coalesce(func.sum(case((QuantumSimulation.status == 'failed', 1), else_=0)), 0).label('failed'),
+        func.coalesce(func.sum(case((QuantumSimulation.status == 'running', 1), else_=0)), 0).label('running'),
+        func.coalesce(func.sum(case((completed, func.coalesce(SimulationResult.fidelity, 0)), else_=0)), 0).label('fidelity_sum'),
+        func.coalesce(func.sum(case((completed, func.coalesce(ReproducibilityMetadata.reproducibility_score, 0)), else_=0)), 0).label('repro_sum')
+    ).outerjoin(QuantumSimulation, QuantumSimulation.project_id == SimulationProject.project_id)\
+     .outerjoin(SimulationResult, SimulationResult.run_id == QuantumSimulation.run_id)\
+     .outerjoin(ReproducibilityMetadata, ReproducibilityMetadata.run_id == QuantumSimulation.run_id)\
+     .group_by(SimulationProject.project_id, SimulationProject.title)
+
+def _project_health(row):
+    """Health score (0-100) and metrics from a _project_health_query row"""
+    if row.total == 0:
+        return {
+            'project_id': row.project_id,
+            'project_name': row.title,
+            'health_score': 0,
+            'status': 'no_data',
+            'message': 'No simulations yet'
+        }
+    
+    completion_rate = row.completed / row.total
+    failure_rate = row.failed / row.total
+    
+    # Runs without a result or score count as 0 toward the averages
+    avg_fidelity = row.fidelity_sum / row.completed if row.completed else 0
+    avg_repro = row.repro_sum / row.completed if row.completed else 0
+    
+    # Health score calculation (0-100)
+    health_score = (
+        completion_rate * 30 +
+        (1 - failure_rate) * 20 +
+        avg_fidelity * 25 +
+        avg_repro * 25
+    )
+    
+    # Determine status
+    if health_score >= 80:
+        status = 'excellent'
+    elif health_score >= 60:
+        status = 'good'
+    elif health_score >= 40:
+        status = 'fair'
+    else:
+        status = 'poor'
+    
+    return {
+        'project_id': row.project_id,
+        'project_name': row.title,
+        'health_score': round(health_score, 2),
+        'status': status,
+        'metrics': {
+            'total_simulations': row.total,
+            'completed': row.completed,
+            'failed': row.failed,
+            'running': row.running,
+            'completion_rate': round(completion_rate, 4),
+            'failure_rate': round(failure_rate, 4),
+            'avg_fidelity': round(avg_fidelity, 4),
+            'avg_reproducibility': round(avg_repro, 4)
+        }
+    }
+
 @analytics_bp.route('/project-health/<int:id>', methods=['GET'])
 def project_health(id):
     try:
-        project = SimulationProject.query.get_or_404(id)
+        row = _project_health_query().filter(SimulationProject.project_id == id).first()
+        if not row:
+            return jsonify({'error': 'Project not found'}), 404
         
-        total_sims = project.simulations.count()
-        if total_sims == 0:
-            return jsonify({
-                'project_id': id,
-                'health_score': 0,
-                'status': 'no_data',
-                'message': 'No simulations yet'
-            })
-        
-        completed = project.simulations.filter_by(status='completed').count()
-        failed = project.simulations.filter_by(status='failed').count()
-        running = project.simulations.filter_by(status='running').count()
-        
-        completion_rate = completed / total_sims if total_sims > 0 else 0
-        failure_rate = failed / total_sims if total_sims > 0 else 0
-        
-        # Calculate average quality metrics
-        completed_sims = project.simulations.filter_by(status='completed').all()
-        avg_fidelity = sum([s.result.fidelity for s in completed_sims if s.result and s.result.fidelity]) / len(completed_sims) if completed_sims else 0
-        avg_repro = sum([s.repro_metadata.reproducibility_score for s in completed_sims if s.repro_metadata and s.repro_metadata.reproducibility_score]) / len(completed_sims) if completed_sims else 0
-        
-        # Health score calculation (0-100)
-        health_score = (
-            completion_rate * 30 +
-            (1 - failure_rate) * 20 +
-            avg_fidelity * 25 +
-            avg_repro * 25
-        )
-        
-        # Determine status
-        if health_score >= 80:
-            status = 'excellent'
-        elif health_score >= 60:
-            status = 'good'
-        elif health_score >= 40:
-            status = 'fair'
-        else:
-            status = 'poor'
+        return jsonify(_project_health(row))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Batch Project Health
+@analytics_bp.route('/project-health', methods=['GET'])
+@cached_response()
+def project_health_batch():
+    """Health for every project, or those matching ids=1,2,3 / status / owner_id / field"""
+    try:
+        query = _project_health_query()
+        
+        ids = request.args.get('ids')
+        status = request.args.get('status')
+        owner_id = request.args.get('owner_id', type=int)
+        field = request.args.get('field')
+        
+        if ids:
+            try:
+                project_ids = [int(i) for i in ids.split(',') if i.strip()]
+            except ValueError:
+                return jsonify({'error': 'ids must be a comma-separated list of integers'}), 400
+            query = query.filter(SimulationProject.project_id.in_(project_ids))
+        if status:
+            query = query.filter(SimulationProject.status == status)
+        if owner_id:
+            query = query.filter(SimulationProject.owner_id == owner_id)
+        if field:
+            query = query.filter(SimulationProject.field_of_study.ilike(f'%{field}%'))
+        
+        projects = [_project_health(row) for row in query.order_by(SimulationProject.project_id)]
         
         return jsonify({
-            'project_id': id,
-            'project_name': project.title,
-            'health_score': round(health_score, 2),
-            'status': status,
-            'metrics': {
-                'total_simulations': total_sims,
-                'completed': completed,
-                'failed': failed,
-                'running': running,
-                'completion_rate': round(completion_rate, 4),
-                'failure_rate': round(failure_rate, 4),
-                'avg_fidelity': round(avg_fidelity, 4),
-                'avg_reproducibility': round(avg_repro, 4)
-            }
+            'count': len(projects),
+            'projects': projects
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Trend Analysis
 @analytics_bp.route('/trends', methods=['GET'])
+@etag_ttl(60)
 def trends():
     try:
         period = request.args.get('period', '30d')
+        resolution = request.args.get('resolution', 'day')
+        
+        if resolution not in TREND_RESOLUTIONS:
+            return jsonify({'error': f"resolution must be one of: {', '.join(TREND_RESOLUTIONS)}"}), 400
         
         # Parse period
-        if period.endswith('d'):
-            days = int(period[:-1])
+        if period[-1:] in PERIOD_UNITS and period[:-1].isdigit():
+            window = timedelta(**{PERIOD_UNITS[period[-1]]: int(period[:-1])})
         else:
-            days = 30
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+            window = timedelta(days=30)
         
-        # Get simulations in period
-        sims = QuantumSimulation.query.filter(
-            QuantumSimulation.execution_date >= cutoff_date
-        ).order_by(QuantumSimulation.execution_date).all()
+        # Buckets are pre-aggregated on write (simulation_trend_rollup);
+        # the window starts at the bucket containing the cutoff
+        first_bucket = _trend_bucket(datetime.utcnow() - window, resolution)
         
-        # Group by date
-        daily_stats = {}
-        for sim in sims:
-            date_key = sim.execution_date.date().isoformat()
-            if date_key not in daily_stats:
-                daily_stats[date_key] = {
-                    'date': date_key,
-                    'count': 0,
-                    'fidelities': [],
-                    'repro_scores': []
-                }
-            
-            daily_stats[date_key]['count'] += 1
-            if sim.result and sim.result.fidelity:
-                daily_stats[date_key]['fidelities'].append(sim.result.fidelity)
-            if sim.repro_metadata and sim.repro_metadata.reproducibility_score:
-                daily_stats[date_key]['repro_scores'].append(sim.repro_metadata.reproducibility_score)
+        buckets = SimulationTrendRollup.query.filter(
+            SimulationTrendRollup.resolution == resolution,
+            SimulationTrendRollup.bucket >= first_bucket,
+            SimulationTrendRollup.run_count > 0
+        ).order_by(SimulationTrendRollup.bucket).all()
         
-        # Calculate averages
         trend_data = []
-        for date_key, stats in sorted(daily_stats.items()):
+        for b in buckets:
             trend_data.append({
-                'date': stats['date'],
-                'simulation_count': stats['count'],
-                'avg_fidelity': round(sum(stats['fidelities']) / len(stats['fidelities']), 4) if stats['fidelities'] else None,
-                'avg_reproducibility': round(sum(stats['repro_scores']) / len(stats['repro_scores']), 4) if stats['repro_scores'] else None
+                'date': b.bucket,
+                'simulation_count': b.run_count,
+                'avg_fidelity': round(b.fidelity_sum / b.fidelity_count, 4) if b.fidelity_count else None,
+                'avg_reproducibility': round(b.repro_sum / b.repro_count, 4) if b.repro_count else None
             })
         
         return jsonify({
             'period': period,
+            'resolution': resolution,
             'total_days': len(trend_data),
             'trends': trend_data
         })
@@ -235,13 +307,12 @@ def trends():
 def qubit_scaling():
     try:
         results = db.session.query(
-            QuantumSimulation.num_qubits,
-            func.count(QuantumSimulation.run_id).label('count'),
-            func.avg(SimulationResult.fidelity).label('avg_fidelity'),
-            func.avg(SimulationResult.execution_time_seconds).label('avg_time')
-        ).outerjoin(SimulationResult)\
-         .group_by(QuantumSimulation.num_qubits)\
-         .order_by(QuantumSimulation.num_qubits)\
+            SimulationRollup.num_qubits,
+            func.sum(SimulationRollup.run_count).label('count'),
+            _rollup_avg(SimulationRollup.fidelity_sum, SimulationRollup.fidelity_count).label('avg_fidelity'),
+            _rollup_avg(SimulationRollup.time_sum, SimulationRollup.time_count).label('avg_time')
+        ).group_by(SimulationRollup.num_qubits)\
+         .order_by(SimulationRollup.num_qubits)\
          .all()
         
         data = []
@@ -261,13 +332,20 @@ def qubit_scaling():
 @analytics_bp.route('/institutions', methods=['GET'])
 def institution_stats():
     try:
+        # Rollups are kept per researcher so institution edits need no maintenance
+        per_researcher = db.session.query(
+            SimulationRollup.researcher_id,
+            func.sum(SimulationRollup.run_count).label('run_count'),
+            func.sum(SimulationRollup.fidelity_sum).label('fidelity_sum'),
+            func.sum(SimulationRollup.fidelity_count).label('fidelity_count')
+        ).group_by(SimulationRollup.researcher_id).subquery()
+        
         stats = db.session.query(
             Researcher.institution,
-            func.count(func.distinct(Researcher.researcher_id)).label('researcher_count'),
-            func.count(QuantumSimulation.run_id).label('total_simulations'),
-            func.avg(SimulationResult.fidelity).label('avg_fidelity')
-        ).outerjoin(QuantumSimulation)\
-         .outerjoin(SimulationResult)\
+            func.count(Researcher.researcher_id).label('researcher_count'),
+            func.sum(per_researcher.c.run_count).label('total_simulations'),
+            _rollup_avg(per_researcher.c.fidelity_sum, per_researcher.c.fidelity_count).label('avg_fidelity')
+        ).outerjoin(per_researcher, per_researcher.c.researcher_id == Researcher.researcher_id)\
          .group_by(Researcher.institution)\
          .order_by(desc('total_simulations'))\
          .all()
@@ -287,6 +365,8 @@ def institution_stats():
 
 # Enhanced Dashboard with More Metrics
 @analytics_bp.route('/dashboard/enhanced', methods=['GET'])
+@etag_ttl(60)
+@cached_response(ttl=60)  # recent_activity depends on the clock as well as the data
 def enhanced_dashboard():
     try:
         # Basic counts
@@ -310,12 +390,16 @@ def enhanced_dashboard():
         
         framework_breakdown = {fw: count for fw, count in framework_counts}
         
-        # Quality metrics
-        results = SimulationResult.query.all()
-        metadata = ReproducibilityMetadata.query.all()
+        # Quality metrics (over all result/metadata rows, as before)
+        fidelity_sum, result_count = db.session.query(
+            func.sum(SimulationResult.fidelity), func.count(SimulationResult.result_id)
+        ).one()
+        repro_sum, metadata_count = db.session.query(
+            func.sum(ReproducibilityMetadata.reproducibility_score), func.count(ReproducibilityMetadata.metadata_id)
+        ).one()
         
-        avg_fidelity = sum(r.fidelity for r in results if r.fidelity) / len(results) if results else 0
-        avg_repro = sum(m.reproducibility_score for m in metadata if m.reproducibility_score) / len(metadata) if metadata else 0
+        avg_fidelity = (fidelity_sum or 0) / result_count if result_count else 0
+        avg_repro = (repro_sum or 0) / metadata_count if metadata_count else 0
         
         # Recent activity (last 7 days)
         recent_cutoff = datetime.utcnow() - timedelta(days=7)
@@ -338,4 +422,19 @@ def enhanced_dashboard():
             }
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# Response Cache Statistics
+@analytics_bp.route('/cache/stats', methods=['GET'])
+@etag_exempt
+def cache_stats():
+    return jsonify(dict(response_cache.stats(), researcher_identities=researcher_directory.stats()))
+
+# Output blob store size and dedup ratio
+@analytics_bp.route('/output-store/stats', methods=['GET'])
+@etag_exempt
+def output_store_statistics():
+    try:
+        return jsonify(output_store_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
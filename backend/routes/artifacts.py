@@ -0,0 +1,165 @@
+"""
+Simulation Artifacts API Routes
+Large per-run files stored on disk: streamed uploads, range downloads
+"""
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+from models import db, QuantumSimulation, SimulationArtifact
+from utils.artifacts import (
+    artifact_path, discard_partial, iter_range, publish_artifact, remove_artifact, stage_artifact, validate_name
+)
+from utils.validators import ValidationError
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+from datetime import datetime
+
+artifacts_bp = Blueprint('artifacts', __name__)
+
+
+def _get_artifact(run_id, name):
+    return SimulationArtifact.query.filter_by(run_id=run_id, name=validate_name(name)).first()
+
+
+# LIST - Artifacts of a run
+@artifacts_bp.route('/<int:id>/artifacts', methods=['GET'])
+def list_artifacts(id):
+    try:
+        QuantumSimulation.query.get_or_404(id)
+        artifacts = SimulationArtifact.query.filter_by(run_id=id).order_by(SimulationArtifact.name).all()
+        return jsonify({
+            'count': len(artifacts),
+            'artifacts': [a.to_dict() for a in artifacts]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# UPLOAD - Stream the request body to disk (PUT replaces an existing artifact)
+@artifacts_bp.route('/<int:id>/artifacts/<name>', methods=['PUT'])
+def upload_artifact(id, name):
+    try:
+        QuantumSimulation.query.get_or_404(id)
+        validate_name(name)
+
+        # The body goes to a temporary file; it replaces the artifact only once
+        # the row describing it is committed
+        partial, size, sha256 = stage_artifact(id, name, request.stream)
+        try:
+            artifact = _get_artifact(id, name)
+            created = artifact is None
+            if created:
+                artifact = SimulationArtifact(run_id=id, name=name, size=size, sha256=sha256)
+                db.session.add(artifact)
+            else:
+                artifact.size = size
+                artifact.sha256 = sha256
+                artifact.updated_at = datetime.utcnow()
+            artifact.content_type = request.mimetype or 'application/octet-stream'
+            db.session.commit()
+        except BaseException:
+            discard_partial(partial)
+            raise
+        publish_artifact(partial, id, name)
+
+        return jsonify({
+            'message': 'Artifact stored successfully',
+            'artifact': artifact.to_dict()
+        }), 201 if created else 200
+
+    except ValidationError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# DOWNLOAD - Whole file, or a single byte range (206) from a memory map
+@artifacts_bp.route('/<int:id>/artifacts/<name>', methods=['GET'])
+def download_artifact(id, name):
+    try:
+        artifact = _get_artifact(id, name)
+        path = artifact_path(id, name)
+        if artifact is None or not path.exists():
+            return jsonify({'error': f'Artifact {name} not found for run {id}'}), 404
+
+        size = path.stat().st_size
+        content_type = artifact.content_type or 'application/octet-stream'
+
+        # Without a Range header (or behind a server with X-Sendfile support)
+        # send_file hands the file to the front server or to wsgi.file_wrapper,
+        # which is sendfile(2) under gunicorn: no copy through Python. A
+        # malformed Range header parses to None and is ignored (RFC 9110).
+        if request.range is None or current_app.config.get('USE_X_SENDFILE'):
+            try:
+                response = send_file(
+                    path,
+                    mimetype=content_type,
+                    download_name=name,
+                    etag=artifact.sha256,
+                    conditional=True,
+                    max_age=0
+                )
+            except RequestedRangeNotSatisfiable:
+                # A malformed Range header is ignored: the whole file, 200
+                response = send_file(
+                    path,
+                    mimetype=content_type,
+                    download_name=name,
+                    etag=artifact.sha256,
+                    conditional=False,
+                    max_age=0
+                )
+            response.headers['Accept-Ranges'] = 'bytes'
+            return response
+
+        if artifact.sha256 in request.if_none_match:
+            response = current_app.response_class(status=304)
+            response.set_etag(artifact.sha256)
+            return response
+
+        # One range is served; multiple ranges, or an If-Range that no longer
+        # matches, get the whole file
+        byte_range = None
+        if len(request.range.ranges) == 1 and request.if_range.etag in (None, artifact.sha256):
+            byte_range = request.range.range_for_length(size)
+            if byte_range is None:
+                response = current_app.response_class(status=416)
+                response.headers['Content-Range'] = f'bytes */{size}'
+                return response
+
+        start, stop = byte_range or (0, size)
+        response = current_app.response_class(
+            iter_range(path, start, stop),
+            status=206 if byte_range else 200,
+            mimetype=content_type,
+            direct_passthrough=True
+        )
+        response.content_length = stop - start
+        if byte_range:
+            response.headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.set_etag(artifact.sha256)
+        return response
+
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# DELETE - Remove the file and its row
+@artifacts_bp.route('/<int:id>/artifacts/<name>', methods=['DELETE'])
+def delete_artifact(id, name):
+    try:
+        artifact = _get_artifact(id, name)
+        if artifact is None:
+            return jsonify({'error': f'Artifact {name} not found for run {id}'}), 404
+
+        db.session.delete(artifact)
+        db.session.commit()
+        remove_artifact(id, name)
+
+        return jsonify({'message': f'Artifact {name} deleted successfully'}), 200
+
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -4,8 +4,8 @@ Handles login, logout, and session management
 """
 
 from flask import Blueprint, jsonify, request
-from models import db, Researcher, AccessLog
-from datetime import datetime
+from models import db, Researcher
+from utils.audit import audit_writer
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -23,18 +23,15 @@ def login():
         if not researcher:
             return jsonify({'error': 'Researcher not found'}), 404
         
-        # Log the login action
-        log = AccessLog(
+        # Log the login action (written asynchronously by the audit writer)
+        audit_writer.record(
             researcher_id=researcher.researcher_id,
             action_type='login',
             target_entity='researcher',
             target_id=researcher.researcher_id,
-            timestamp=datetime.utcnow(),
             ip_address=request.remote_addr,
             user_agent=request.headers.get('User-Agent')
         )
-        db.session.add(log)
-        db.session.commit()
         
         return jsonify({
             'message': 'Login successful',
@@ -53,19 +50,18 @@ def logout():
         if 'researcher_id' not in data:
             return jsonify({'error': 'Missing researcher_id'}), 400
         
-        log = AccessLog(
+        audit_writer.record(
             researcher_id=data['researcher_id'],
             action_type='logout',
             target_entity='researcher',
             target_id=data['researcher_id'],
-            timestamp=datetime.utcnow(),
             ip_address=request.remote_addr
         )
-        db.session.add(log)
-        db.session.commit()
         
         return jsonify({'message': 'Logout successful'}), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
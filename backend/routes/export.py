@@ -2,71 +2,247 @@
 Data Export Routes for QSLRM
 """
 
-from flask import Blueprint, jsonify, Response, request
-from models import db, Researcher, SimulationProject, QuantumSimulation
+from flask import Blueprint, jsonify, Response, request, stream_with_context
+from models import db, Researcher, SimulationProject, ProjectResearcher, QuantumSimulation, SimulationResult, ReproducibilityMetadata
+from utils.loaders import simulation_query, iter_simulation_pages, iter_chunks
+from utils.identity import prime_researchers
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from datetime import datetime
 import csv
 import io
 import json
+import zlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # columnar exports answer 501 without it
+    pa = pq = None
 
 export_bp = Blueprint('export', __name__)
 
+CSV_HEADER = [
+    'Run ID', 'Simulation ID', 'Project ID', 'Researcher ID',
+    'Framework', 'Algorithm', 'Qubits', 'Circuit Depth',
+    'Status', 'Execution Date', 'Fidelity', 'Success Rate',
+    'Reproducibility Score', 'Execution Time (s)'
+]
+
+# Rows fetched from the database cursor per round trip when streaming
+EXPORT_CHUNK_SIZE = 1000
+
+# ORM objects kept alive per page by the full-database exports
+EXPORT_PAGE_SIZE = 500
+
+# Rows per Parquet row group / Arrow record batch, fetched as one cursor partition
+COLUMNAR_BATCH_SIZE = 50000
+
+PARQUET_COMPRESSIONS = ('snappy', 'zstd', 'gzip', 'none')
+
+def simulation_export_query():
+    """Flat simulation/result/metadata rows filtered by the export query string"""
+    project_id = request.args.get('project_id', type=int)
+    framework = request.args.get('framework')
+    status = request.args.get('status')
+    
+    query = db.session.query(
+        QuantumSimulation.run_id,
+        QuantumSimulation.simulation_id,
+        QuantumSimulation.project_id,
+        QuantumSimulation.researcher_id,
+        QuantumSimulation.framework,
+        QuantumSimulation.algorithm_type,
+        QuantumSimulation.num_qubits,
+        QuantumSimulation.circuit_depth,
+        QuantumSimulation.status,
+        QuantumSimulation.execution_date,
+        SimulationResult.fidelity,
+        SimulationResult.success_probability,
+        ReproducibilityMetadata.reproducibility_score,
+        SimulationResult.execution_time_seconds
+    ).outerjoin(SimulationResult, SimulationResult.run_id == QuantumSimulation.run_id)\
+     .outerjoin(ReproducibilityMetadata, ReproducibilityMetadata.run_id == QuantumSimulation.run_id)
+    
+    if project_id:
+        query = query.filter(QuantumSimulation.project_id == project_id)
+    if framework:
+        query = query.filter(QuantumSimulation.framework == framework)
+    if status:
+        query = query.filter(QuantumSimulation.status == status)
+    
+    return query.order_by(QuantumSimulation.run_id)
+
+def _stream_csv(rows, flush_bytes=64 * 1024):
+    """Encode rows to CSV, yielding the buffer whenever it grows past flush_bytes"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow([
+            row.run_id,
+            row.simulation_id,
+            row.project_id,
+            row.researcher_id,
+            row.framework,
+            row.algorithm_type or '',
+            row.num_qubits,
+            row.circuit_depth or '',
+            row.status,
+            row.execution_date.isoformat() if row.execution_date else '',
+            row.fidelity,
+            row.success_probability,
+            row.reproducibility_score,
+            row.execution_time_seconds
+        ])
+        if buffer.tell() >= flush_bytes:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
 # Export Simulations as CSV
 @export_bp.route('/simulations/csv', methods=['GET'])
 def export_simulations_csv():
     try:
-        # Get filters
-        project_id = request.args.get('project_id', type=int)
-        framework = request.args.get('framework')
-        status = request.args.get('status')
+        # Server-side cursor: rows are pulled EXPORT_CHUNK_SIZE at a time while the body streams
+        rows = simulation_export_query().yield_per(EXPORT_CHUNK_SIZE)
         
-        query = QuantumSimulation.query
-        
-        if project_id:
-            query = query.filter_by(project_id=project_id)
-        if framework:
-            query = query.filter_by(framework=framework)
-        if status:
-            query = query.filter_by(status=status)
+        return Response(
+            stream_with_context(_stream_csv(rows)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=simulations.csv'}
+        )
         
-        simulations = query.all()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def simulation_columnar_query():
+    """The CSV export's rows plus the remaining result and metadata columns"""
+    return simulation_export_query().add_columns(
+        SimulationResult.energy_value,
+        SimulationResult.error_rate,
+        ReproducibilityMetadata.random_seed,
+        ReproducibilityMetadata.hardware_backend,
+        ReproducibilityMetadata.framework_version
+    )
+
+def _columnar_schema():
+    """Arrow schema of simulation_columnar_query rows"""
+    return pa.schema([
+        ('run_id', pa.int64()),
+        ('simulation_id', pa.string()),
+        ('project_id', pa.int64()),
+        ('researcher_id', pa.int64()),
+        ('framework', pa.string()),
+        ('algorithm_type', pa.string()),
+        ('num_qubits', pa.int32()),
+        ('circuit_depth', pa.int32()),
+        ('status', pa.string()),
+        ('execution_date', pa.timestamp('us')),
+        ('fidelity', pa.float64()),
+        ('success_probability', pa.float64()),
+        ('reproducibility_score', pa.float64()),
+        ('execution_time_seconds', pa.float64()),
+        ('energy_value', pa.float64()),
+        ('error_rate', pa.float64()),
+        ('random_seed', pa.int64()),
+        ('hardware_backend', pa.string()),
+        ('framework_version', pa.string())
+    ])
+
+def _record_batches(schema):
+    """Arrow record batches of COLUMNAR_BATCH_SIZE rows, one cursor partition at a time"""
+    result = db.session.execute(
+        simulation_columnar_query().statement.execution_options(yield_per=COLUMNAR_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        columns = list(zip(*rows))
+        yield pa.record_batch(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands its bytes back to a streaming response"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def _stream_parquet(compression):
+    """Parquet file written one row group per record batch"""
+    schema = _columnar_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    try:
+        for batch in _record_batches(schema):
+            writer.write_batch(batch, row_group_size=COLUMNAR_BATCH_SIZE)
+            yield sink.drain()
+    finally:
+        writer.close()
+    # Footer
+    yield sink.drain()
+
+def _stream_arrow():
+    """Arrow IPC stream, one message per record batch"""
+    schema = _columnar_schema()
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.drain()
+        for batch in _record_batches(schema):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+# Export Simulations as Parquet
+@export_bp.route('/simulations/parquet', methods=['GET'])
+def export_simulations_parquet():
+    try:
+        if pq is None:
+            return jsonify({'error': 'Parquet export requires pyarrow'}), 501
+        compression = request.args.get('compression', 'snappy')
+        if compression not in PARQUET_COMPRESSIONS:
+            return jsonify({'error': f"compression must be one of: {', '.join(PARQUET_COMPRESSIONS)}"}), 400
         
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
+        return Response(
+            stream_with_context(_stream_parquet(compression)),
+            mimetype='application/vnd.apache.parquet',
+            headers={'Content-Disposition': 'attachment; filename=simulations.parquet'}
+        )
         
-        # Header
-        writer.writerow([
-            'Run ID', 'Simulation ID', 'Project ID', 'Researcher ID',
-            'Framework', 'Algorithm', 'Qubits', 'Circuit Depth',
-            'Status', 'Execution Date', 'Fidelity', 'Success Rate',
-            'Reproducibility Score', 'Execution Time (s)'
-        ])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Export Simulations as an Arrow IPC stream
+@export_bp.route('/simulations/arrow', methods=['GET'])
+def export_simulations_arrow():
+    try:
+        if pa is None:
+            return jsonify({'error': 'Arrow export requires pyarrow'}), 501
         
-        # Data rows
-        for sim in simulations:
-            writer.writerow([
-                sim.run_id,
-                sim.simulation_id,
-                sim.project_id,
-                sim.researcher_id,
-                sim.framework,
-                sim.algorithm_type or '',
-                sim.num_qubits,
-                sim.circuit_depth or '',
-                sim.status,
-                sim.execution_date.isoformat() if sim.execution_date else '',
-                sim.result.fidelity if sim.result else '',
-                sim.result.success_probability if sim.result else '',
-                sim.repro_metadata.reproducibility_score if sim.repro_metadata else '',
-                sim.result.execution_time_seconds if sim.result else ''
-            ])
-        
-        # Prepare response
-        output.seek(0)
         return Response(
-            output.getvalue(),
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=simulations.csv'}
+            stream_with_context(_stream_arrow()),
+            mimetype='application/vnd.apache.arrow.stream',
+            headers={'Content-Disposition': 'attachment; filename=simulations.arrows'}
         )
         
     except Exception as e:
@@ -203,24 +379,122 @@ def export_researcher_portfolio(id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _project_stats(project_ids):
+    """Team size and simulation count for a chunk of projects, two grouped queries"""
+    team_sizes = dict(db.session.query(
+        ProjectResearcher.project_id, func.count(ProjectResearcher.researcher_id)
+    ).filter(ProjectResearcher.project_id.in_(project_ids))
+     .group_by(ProjectResearcher.project_id).all())
+    
+    sim_counts = dict(db.session.query(
+        QuantumSimulation.project_id, func.count(QuantumSimulation.run_id)
+    ).filter(QuantumSimulation.project_id.in_(project_ids))
+     .group_by(QuantumSimulation.project_id).all())
+    
+    return team_sizes, sim_counts
+
+def _export_researchers():
+    """Researcher records in researcher_id chunks"""
+    for page in iter_chunks(Researcher.query, Researcher.researcher_id, EXPORT_PAGE_SIZE):
+        for researcher in page:
+            yield researcher.to_dict()
+
+def _export_projects():
+    """Project records with stats batched per chunk instead of two counts per project"""
+    project_query = SimulationProject.query.options(joinedload(SimulationProject.owner))
+    for page in iter_chunks(project_query, SimulationProject.project_id, EXPORT_PAGE_SIZE):
+        team_sizes, sim_counts = _project_stats([p.project_id for p in page])
+        for project in page:
+            data = project.to_dict()
+            data['team_size'] = team_sizes.get(project.project_id, 0)
+            data['simulation_count'] = sim_counts.get(project.project_id, 0)
+            yield data
+
+def _export_simulations():
+    """Simulation records with result and metadata, eager-loaded per keyset page"""
+    for page in iter_simulation_pages(simulation_query(), chunk_size=EXPORT_PAGE_SIZE):
+        for simulation in prime_researchers(page):
+            yield simulation.to_dict(include_details=True)
+
+# (document key, NDJSON record type, record generator) - one chunk of rows in memory at a time
+EXPORT_SECTIONS = [
+    ('researchers', 'researcher', _export_researchers),
+    ('projects', 'project', _export_projects),
+    ('simulations', 'simulation', _export_simulations)
+]
+
+def _encode_ndjson():
+    """One {"type": ..., "data": ...} object per line"""
+    for _, record_type, records in EXPORT_SECTIONS:
+        for record in records():
+            yield json.dumps({'type': record_type, 'data': record}, default=str) + '\n'
+
+def _encode_json_document():
+    """The same document shape as json.dumps of the full export, encoded incrementally"""
+    yield '{'
+    for key, _, records in EXPORT_SECTIONS:
+        yield f'\n  "{key}": ['
+        separator = '\n    '
+        for record in records():
+            yield separator + json.dumps(record, default=str)
+            separator = ',\n    '
+        yield '\n  ],'
+    yield f'\n  "export_timestamp": {json.dumps(datetime.utcnow().isoformat())}\n}}\n'
+
+def _buffered(chunks, flush_bytes=64 * 1024):
+    """Coalesce small string chunks into ~flush_bytes UTF-8 blocks"""
+    parts = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8')
+        parts.append(data)
+        size += len(data)
+        if size >= flush_bytes:
+            yield b''.join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield b''.join(parts)
+
+def _gzip(blocks, level=6):
+    """Compress a byte stream on the fly into a single gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def _stream_full_export(encoder, filename, mimetype):
+    """Build the streaming Response shared by the full JSON and NDJSON exports"""
+    compress = request.args.get('compress')
+    if compress not in (None, '', 'gzip'):
+        return jsonify({'error': 'compress must be "gzip"'}), 400
+    
+    body = _buffered(encoder())
+    if compress == 'gzip':
+        body = _gzip(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 # Bulk Export All Data
 @export_bp.route('/all/json', methods=['GET'])
 def export_all_data():
     try:
-        data = {
-            'researchers': [r.to_dict() for r in Researcher.query.all()],
-            'projects': [p.to_dict(include_stats=True) for p in SimulationProject.query.all()],
-            'simulations': [s.to_dict(include_details=True) for s in QuantumSimulation.query.all()],
-            'export_timestamp': db.func.current_timestamp()
-        }
-        
-        json_str = json.dumps(data, indent=2, default=str)
-        
-        return Response(
-            json_str,
-            mimetype='application/json',
-            headers={'Content-Disposition': 'attachment; filename=qslrm_full_export.json'}
-        )
-        
+        return _stream_full_export(_encode_json_document, 'qslrm_full_export.json', 'application/json')
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# Bulk Export All Data - newline-delimited JSON
+@export_bp.route('/all/ndjson', methods=['GET'])
+def export_all_ndjson():
+    try:
+        return _stream_full_export(_encode_ndjson, 'qslrm_full_export.ndjson', 'application/x-ndjson')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -4,12 +4,27 @@ Projects API Routes - Complete CRUD
 
 from flask import Blueprint, jsonify, request
 from models import db, SimulationProject, ProjectResearcher, Researcher
+from utils.identity import researcher_directory, prime_researchers
+from utils.conditional import enable_conditional_get
+from utils.cache import cached_response
+from utils.sweep import SWEEP_METRICS, sweep_matrix
 from datetime import datetime
 
 projects_bp = Blueprint('projects', __name__)
 
+# ETag / 304 support, keyed on the tables these views read
+enable_conditional_get(projects_bp, [
+    'simulation_project',
+    'project_researchers',
+    'researcher',
+    'quantum_simulation',
+    'parameter',
+    'simulation_result'
+])
+
 # LIST - Get all projects
 @projects_bp.route('', methods=['GET'])
+@cached_response()
 def get_projects():
     try:
         status = request.args.get('status')
@@ -26,7 +41,7 @@ def get_projects():
             query = query.filter_by(owner_id=owner_id)
         
         projects = query.all()
-        return jsonify([p.to_dict(include_stats=True) for p in projects])
+        return jsonify([p.to_dict(include_stats=True) for p in prime_researchers(projects, 'owner_id')])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -35,23 +50,29 @@ def get_projects():
 def get_project(id):
     try:
         project = SimulationProject.query.get_or_404(id)
+        members = project.team_members.all()
+        recent_sims = project.simulations.order_by(
+            db.desc('execution_date')
+        ).limit(10).all()
+        
+        # Owner, team and run authors resolved in one lookup
+        identities = researcher_directory.lookup(
+            [project.owner_id] + [m.researcher_id for m in members] + [s.researcher_id for s in recent_sims]
+        )
         data = project.to_dict(include_stats=True)
         
         # Add team members
         data['team'] = [
             {
                 'researcher_id': member.researcher_id,
-                'researcher_name': f"{member.researcher.first_name} {member.researcher.last_name}",
+                'researcher_name': identities[member.researcher_id]['name'],
                 'role': member.role,
                 'joined_date': member.joined_date.isoformat() if member.joined_date else None
             }
-            for member in project.team_members.all()
+            for member in members
         ]
         
         # Add recent simulations
-        recent_sims = project.simulations.order_by(
-            db.desc('execution_date')
-        ).limit(10).all()
         data['recent_simulations'] = [s.to_dict() for s in recent_sims]
         
         return jsonify(data)
@@ -169,15 +190,17 @@ def delete_project(id):
 def get_team(id):
     try:
         project = SimulationProject.query.get_or_404(id)
+        members = project.team_members.all()
+        identities = researcher_directory.lookup(m.researcher_id for m in members)
         team = [
             {
                 'researcher_id': member.researcher_id,
-                'researcher_name': f"{member.researcher.first_name} {member.researcher.last_name}",
-                'email': member.researcher.email,
+                'researcher_name': identities[member.researcher_id]['name'],
+                'email': identities[member.researcher_id]['email'],
                 'role': member.role,
                 'joined_date': member.joined_date.isoformat() if member.joined_date else None
             }
-            for member in project.team_members.all()
+            for member in members
         ]
         return jsonify(team)
     except Exception as e:
@@ -250,4 +273,27 @@ def remove_team_member(id, researcher_id):
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# SWEEP MATRIX - parameters x metrics for every run in the project, columnar
+@projects_bp.route('/<int:id>/sweep-matrix', methods=['GET'])
+@cached_response()
+def get_sweep_matrix(id):
+    try:
+        project = SimulationProject.query.get(id)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        parameters = [p for p in request.args.get('parameters', '').split(',') if p] or None
+        metrics = [m for m in request.args.get('metrics', '').split(',') if m] or list(SWEEP_METRICS)
+        unknown = [m for m in metrics if m not in SWEEP_METRICS]
+        if unknown:
+            return jsonify({'error': f"Invalid metric(s): {', '.join(unknown)}. Must be among: {', '.join(SWEEP_METRICS)}"}), 400
+        
+        matrix = sweep_matrix(db.session, project.project_id, parameters, metrics)
+        return jsonify({
+            'project_id': project.project_id,
+            'run_count': len(matrix['run_ids']),
+            **matrix
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
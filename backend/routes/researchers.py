@@ -4,12 +4,28 @@ Researchers API Routes - Complete CRUD
 
 from flask import Blueprint, jsonify, request
 from models import db, Researcher, QuantumSimulation
+from utils.conditional import enable_conditional_get
+from utils.cache import cached_response
+from utils.loaders import simulation_query, paginate_simulations
+from utils.identity import researcher_directory, prime_researchers
+from utils.validators import ValidationError
 from sqlalchemy import or_
 
 researchers_bp = Blueprint('researchers', __name__)
 
+# ETag / 304 support, keyed on the tables these views read
+enable_conditional_get(researchers_bp, [
+    'researcher',
+    'quantum_simulation',
+    'simulation_result',
+    'reproducibility_metadata',
+    'simulation_project',
+    'project_researchers'
+])
+
 # LIST - Get all researchers with filtering
 @researchers_bp.route('', methods=['GET'])
+@cached_response()
 def get_researchers():
     try:
         # Query parameters for filtering
@@ -139,6 +155,7 @@ def update_researcher(id):
             researcher.role = data['role']
         
         db.session.commit()
+        researcher_directory.invalidate(id)
         
         return jsonify({
             'message': 'Researcher updated successfully',
@@ -173,6 +190,7 @@ def delete_researcher(id):
         name = f"{researcher.first_name} {researcher.last_name}"
         db.session.delete(researcher)
         db.session.commit()
+        researcher_directory.invalidate(id)
         
         return jsonify({
             'message': f'Researcher {name} deleted successfully'
@@ -187,12 +205,29 @@ def delete_researcher(id):
 def get_researcher_simulations(id):
     try:
         researcher = Researcher.query.get_or_404(id)
-        simulations = [s.to_dict(include_details=True) for s in researcher.simulations.all()]
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+        
+        query = simulation_query().filter(QuantumSimulation.researcher_id == id)
+        
+        if cursor or limit:
+            simulations, next_cursor = paginate_simulations(query, cursor=cursor, limit=limit)
+            return jsonify({
+                'researcher': researcher.to_dict(),
+                'simulation_count': len(simulations),
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None,
+                'simulations': [s.to_dict(include_details=True) for s in simulations]
+            })
+        
+        simulations = [s.to_dict(include_details=True) for s in query.all()]
         return jsonify({
             'researcher': researcher.to_dict(),
             'simulation_count': len(simulations),
             'simulations': simulations
         })
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -204,8 +239,11 @@ def get_researcher_projects(id):
         
         owned = [p.to_dict(include_stats=True) for p in researcher.owned_projects.all()]
         
+        memberships = researcher.project_memberships
+        prime_researchers([m.project for m in memberships], 'owner_id')
+        
         participated = []
-        for membership in researcher.project_memberships:
+        for membership in memberships:
             project_dict = membership.project.to_dict(include_stats=True)
             project_dict['role_in_project'] = membership.role
             project_dict['joined_date'] = membership.joined_date.isoformat() if membership.joined_date else None
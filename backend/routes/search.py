@@ -4,10 +4,23 @@ Advanced Search and Pagination Routes for QSLRM
 
 from flask import Blueprint, jsonify, request
 from models import db, Researcher, SimulationProject, QuantumSimulation
+from utils.conditional import enable_conditional_get
+from utils.search_index import build_match_query, ranked_search
+from utils.suggest import SUGGEST_TYPES, suggestion_index
+from utils.identity import prime_researchers
 from sqlalchemy import or_, and_, func
 
 search_bp = Blueprint('search', __name__)
 
+# ETag / 304 support, keyed on the tables these views read
+enable_conditional_get(search_bp, [
+    'researcher',
+    'simulation_project',
+    'quantum_simulation',
+    'simulation_result',
+    'reproducibility_metadata'
+])
+
 # Global Search Across All Entities
 @search_bp.route('', methods=['GET'])
 def global_search():
@@ -19,35 +32,13 @@ def global_search():
         if len(query) < 2:
             return jsonify({'error': 'Query must be at least 2 characters'}), 400
         
-        # Search researchers
-        researchers = Researcher.query.filter(
-            or_(
-                Researcher.first_name.ilike(f'%{query}%'),
-                Researcher.last_name.ilike(f'%{query}%'),
-                Researcher.email.ilike(f'%{query}%'),
-                Researcher.institution.ilike(f'%{query}%'),
-                Researcher.department.ilike(f'%{query}%')
-            )
-        ).limit(10).all()
-        
-        # Search projects
-        projects = SimulationProject.query.filter(
-            or_(
-                SimulationProject.title.ilike(f'%{query}%'),
-                SimulationProject.description.ilike(f'%{query}%'),
-                SimulationProject.field_of_study.ilike(f'%{query}%')
-            )
-        ).limit(10).all()
-        
-        # Search simulations
-        simulations = QuantumSimulation.query.filter(
-            or_(
-                QuantumSimulation.simulation_id.ilike(f'%{query}%'),
-                QuantumSimulation.description.ilike(f'%{query}%'),
-                QuantumSimulation.algorithm_type.ilike(f'%{query}%'),
-                QuantumSimulation.framework.ilike(f'%{query}%')
-            )
-        ).limit(10).all()
+        if build_match_query(query) is None:
+            return jsonify({'error': 'Query must contain letters or digits'}), 400
+        
+        # BM25-ranked FTS5 lookups, one per entity
+        researchers = ranked_search('researcher_fts', query).limit(10).all()
+        projects = ranked_search('project_fts', query).limit(10).all()
+        simulations = ranked_search('simulation_fts', query).limit(10).all()
         
         return jsonify({
             'query': query,
@@ -60,9 +51,10 @@ def global_search():
                             'name': f"{r.first_name} {r.last_name}",
                             'institution': r.institution,
                             'email': r.email,
-                            'type': 'researcher'
+                            'type': 'researcher',
+                            'score': round(-score, 4)
                         }
-                        for r in researchers
+                        for r, score in researchers
                     ]
                 },
                 'projects': {
@@ -73,9 +65,10 @@ def global_search():
                             'title': p.title,
                             'field': p.field_of_study,
                             'status': p.status,
-                            'type': 'project'
+                            'type': 'project',
+                            'score': round(-score, 4)
                         }
-                        for p in projects
+                        for p, score in projects
                     ]
                 },
                 'simulations': {
@@ -87,9 +80,10 @@ def global_search():
                             'framework': s.framework,
                             'algorithm': s.algorithm_type,
                             'status': s.status,
-                            'type': 'simulation'
+                            'type': 'simulation',
+                            'score': round(-score, 4)
                         }
-                        for s in simulations
+                        for s, score in simulations
                     ]
                 }
             },
@@ -175,7 +169,7 @@ def search_simulations():
             'total_pages': paginated.pages,
             'has_next': paginated.has_next,
             'has_prev': paginated.has_prev,
-            'items': [s.to_dict(include_details=True) for s in paginated.items]
+            'items': [s.to_dict(include_details=True) for s in prime_researchers(paginated.items)]
         })
         
     except Exception as e:
@@ -196,15 +190,6 @@ def search_researchers():
         
         query = Researcher.query
         
-        if query_text:
-            query = query.filter(
-                or_(
-                    Researcher.first_name.ilike(f'%{query_text}%'),
-                    Researcher.last_name.ilike(f'%{query_text}%'),
-                    Researcher.email.ilike(f'%{query_text}%')
-                )
-            )
-        
         if institution:
             query = query.filter(Researcher.institution.ilike(f'%{institution}%'))
         if department:
@@ -212,6 +197,10 @@ def search_researchers():
         if role:
             query = query.filter(Researcher.role.ilike(f'%{role}%'))
         
+        # Full-text match, most relevant first
+        if build_match_query(query_text):
+            query = ranked_search('researcher_fts', query_text, base_query=query, with_score=False)
+        
         paginated = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
@@ -242,14 +231,6 @@ def search_projects():
         
         query = SimulationProject.query
         
-        if query_text:
-            query = query.filter(
-                or_(
-                    SimulationProject.title.ilike(f'%{query_text}%'),
-                    SimulationProject.description.ilike(f'%{query_text}%')
-                )
-            )
-        
         if status:
             query = query.filter(SimulationProject.status == status)
         if field:
@@ -257,6 +238,10 @@ def search_projects():
         if owner_id:
             query = query.filter(SimulationProject.owner_id == owner_id)
         
+        # Full-text match, most relevant first
+        if build_match_query(query_text):
+            query = ranked_search('project_fts', query_text, base_query=query, with_score=False)
+        
         paginated = query.paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
@@ -266,7 +251,29 @@ def search_projects():
             'total_pages': paginated.pages,
             'has_next': paginated.has_next,
             'has_prev': paginated.has_prev,
-            'items': [p.to_dict(include_stats=True) for p in paginated.items]
+            'items': [p.to_dict(include_stats=True) for p in prime_researchers(paginated.items, 'owner_id')]
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Type-ahead Suggestions
+@search_bp.route('/suggest', methods=['GET'])
+def suggest():
+    """Top completions for researcher names, institutions and algorithm types, by usage"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        kind = request.args.get('type')
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        
+        if kind and kind not in SUGGEST_TYPES:
+            return jsonify({'error': f"type must be one of: {', '.join(SUGGEST_TYPES)}"}), 400
+        if not prefix:
+            return jsonify({'query': prefix, 'suggestions': []})
+        
+        return jsonify({
+            'query': prefix,
+            'suggestions': suggestion_index.suggest(prefix, limit, kind)
         })
         
     except Exception as e:
@@ -3,13 +3,44 @@ Simulations API Routes - Complete CRUD
 """
 
 from flask import Blueprint, jsonify, request
-from models import db, QuantumSimulation, SimulationResult, ReproducibilityMetadata, Parameter
+from models import (
+    db, Researcher, SimulationProject, QuantumSimulation, SimulationResult, ReproducibilityMetadata, Parameter,
+    SimulationArtifact
+)
+from utils.conditional import enable_conditional_get
+from utils.cache import cached_response
+from utils.loaders import simulation_query, paginate_simulations
+from utils.identity import prime_researchers
+from utils.parameter_index import matching_run_ids, parse_predicates
+from utils.distributions import (
+    MAX_COMPARE_RUNS, CountSet, compare_pairwise, compare_to_reference, load_counts, metric_json
+)
+from utils.counts_encoding import decode_counts, encode_counts, is_binary
+from utils.output_store import put_outputs
+from utils.results import measurement_counts_column, save_result
+from utils.statevector import CIRCUIT_ARTIFACT, REEXECUTE_MAX_WORK, load_circuit, run_circuit
+from utils.artifacts import artifact_path, remove_run_artifacts, write_artifact
+from utils.validators import ValidationError, validate_simulation_record
+from sqlalchemy import insert, tuple_
 from datetime import datetime
+import base64
+import uuid
+import numpy as np
 
 simulations_bp = Blueprint('simulations', __name__)
 
+# ETag / 304 support, keyed on the tables these views read
+enable_conditional_get(simulations_bp, [
+    'quantum_simulation',
+    'simulation_result',
+    'reproducibility_metadata',
+    'parameter',
+    'researcher'
+])
+
 # LIST - Get all simulations with filtering
 @simulations_bp.route('', methods=['GET'])
+@cached_response()
 def get_simulations():
     try:
         status = request.args.get('status')
@@ -19,8 +50,10 @@ def get_simulations():
         min_qubits = request.args.get('min_qubits', type=int)
         max_qubits = request.args.get('max_qubits', type=int)
         algorithm = request.args.get('algorithm')
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
         
-        query = QuantumSimulation.query
+        query = simulation_query()
         
         if status:
             query = query.filter_by(status=status)
@@ -37,8 +70,88 @@ def get_simulations():
         if algorithm:
             query = query.filter(QuantumSimulation.algorithm_type.ilike(f'%{algorithm}%'))
         
-        simulations = query.order_by(db.desc(QuantumSimulation.execution_date)).all()
-        return jsonify([s.to_dict(include_details=True) for s in simulations])
+        # Cursor mode - keyset pages on (execution_date, run_id)
+        if cursor or limit:
+            simulations, next_cursor = paginate_simulations(query, cursor=cursor, limit=limit)
+            return jsonify({
+                'count': len(simulations),
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None,
+                'items': [s.to_dict(include_details=True) for s in prime_researchers(simulations)]
+            })
+        
+        simulations = query.order_by(
+            db.desc(QuantumSimulation.execution_date),
+            db.desc(QuantumSimulation.run_id)
+        ).all()
+        return jsonify([s.to_dict(include_details=True) for s in prime_researchers(simulations)])
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# QUERY BY PARAMETERS - ?param=shots:gte:1000&param=noise_model:eq:depolarizing
+@simulations_bp.route('/by-parameters', methods=['GET'])
+@cached_response()
+def get_simulations_by_parameters():
+    try:
+        predicates = parse_predicates(request.args.getlist('param'))
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+        
+        query = simulation_query().filter(QuantumSimulation.run_id.in_(matching_run_ids(predicates)))
+        simulations, next_cursor = paginate_simulations(query, cursor=cursor, limit=limit)
+        return jsonify({
+            'count': len(simulations),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+            'items': [s.to_dict(include_details=True) for s in prime_researchers(simulations)]
+        })
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# COMPARE COUNTS - ?runs=2,3,4&reference=1 (1 x N) or ?runs=1,2,3 (N x N)
+@simulations_bp.route('/compare-counts', methods=['GET'])
+@cached_response()
+def compare_counts():
+    try:
+        try:
+            run_ids = list(dict.fromkeys(int(r) for r in request.args.get('runs', '').split(',') if r.strip()))
+        except ValueError:
+            return jsonify({'error': 'runs must be a comma-separated list of run ids'}), 400
+        reference = request.args.get('reference', type=int)
+        if not run_ids:
+            return jsonify({'error': 'runs is required'}), 400
+        if len(run_ids) > MAX_COMPARE_RUNS:
+            return jsonify({'error': f'At most {MAX_COMPARE_RUNS} runs can be compared at once'}), 400
+        
+        wanted = run_ids + ([reference] if reference is not None and reference not in run_ids else [])
+        histograms = load_counts(wanted)
+        missing = [r for r in wanted if r not in histograms]
+        if missing:
+            return jsonify({
+                'error': 'No measurement counts for some runs',
+                'run_ids': missing
+            }), 404
+        
+        counts = CountSet(wanted, [histograms[r] for r in wanted])
+        response = {
+            'run_ids': run_ids,
+            'outcomes': len(counts.outcomes),
+            'shots': counts.shots[:len(run_ids)].tolist()
+        }
+        if reference is not None:
+            metrics = compare_to_reference(counts, wanted.index(reference))
+            response['reference'] = reference
+            response['metrics'] = {name: metric_json(values[:len(run_ids)]) for name, values in metrics.items()}
+        else:
+            metrics = compare_pairwise(counts)
+            response['metrics'] = {name: metric_json(values) for name, values in metrics.items()}
+        return jsonify(response)
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -109,6 +222,179 @@ def create_simulation():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# Maximum run records accepted by one bulk request
+MAX_BULK_RECORDS = 5000
+
+# CREATE - Bulk ingestion of complete run records
+@simulations_bp.route('/bulk', methods=['POST'])
+def bulk_create_simulations():
+    """
+    Insert many runs with nested result, metadata and parameters in one transaction.
+    Body: a JSON array of records (or {"simulations": [...]}); ?atomic=true rejects
+    the whole batch if any record fails.
+    """
+    try:
+        data = request.get_json()
+        records = data.get('simulations') if isinstance(data, dict) else data
+        atomic = request.args.get('atomic', 'false').lower() == 'true'
+        
+        if not isinstance(records, list) or not records:
+            return jsonify({'error': 'Expected a non-empty array of simulation records'}), 400
+        if len(records) > MAX_BULK_RECORDS:
+            return jsonify({'error': f'Too many records (max {MAX_BULK_RECORDS})'}), 413
+        
+        statuses = [{'index': i, 'status': 'pending'} for i in range(len(records))]
+        
+        def reject(i, message):
+            statuses[i]['status'] = 'error'
+            statuses[i]['error'] = message
+        
+        # Pass 1 - validate every record (and pack result histograms)
+        counts_columns = {}
+        for i, record in enumerate(records):
+            try:
+                validate_simulation_record(record)
+                if record.get('result'):
+                    counts_columns[i] = measurement_counts_column(record['result'])
+            except ValidationError as e:
+                reject(i, str(e))
+        
+        valid = [i for i, st in enumerate(statuses) if st['status'] == 'pending']
+        
+        # Pass 2 - set-based reference and duplicate checks
+        project_ids = {records[i]['project_id'] for i in valid}
+        researcher_ids = {records[i]['researcher_id'] for i in valid}
+        pairs = {(records[i]['project_id'], records[i]['simulation_id']) for i in valid}
+        
+        known_projects = {row[0] for row in db.session.query(SimulationProject.project_id)
+                          .filter(SimulationProject.project_id.in_(project_ids))} if project_ids else set()
+        known_researchers = {row[0] for row in db.session.query(Researcher.researcher_id)
+                             .filter(Researcher.researcher_id.in_(researcher_ids))} if researcher_ids else set()
+        existing = {tuple(row) for row in db.session.query(
+            QuantumSimulation.project_id, QuantumSimulation.simulation_id
+        ).filter(tuple_(QuantumSimulation.project_id, QuantumSimulation.simulation_id).in_(pairs))} if pairs else set()
+        
+        seen = set()
+        for i in valid:
+            record = records[i]
+            key = (record['project_id'], record['simulation_id'])
+            if record['project_id'] not in known_projects:
+                reject(i, 'Project not found')
+            elif record['researcher_id'] not in known_researchers:
+                reject(i, 'Researcher not found')
+            elif key in existing:
+                reject(i, 'Simulation ID already exists in this project')
+            elif key in seen:
+                reject(i, 'Duplicate simulation ID within this batch')
+            seen.add(key)
+        
+        accepted = [i for i, st in enumerate(statuses) if st['status'] == 'pending']
+        failed = len(records) - len(accepted)
+        
+        if atomic and failed:
+            for i in accepted:
+                statuses[i]['status'] = 'skipped'
+            return jsonify({'created': 0, 'failed': failed, 'items': statuses}), 400
+        
+        if accepted:
+            now = datetime.utcnow()
+            simulation_rows = []
+            for i in accepted:
+                record = records[i]
+                simulation_rows.append({
+                    'project_id': record['project_id'],
+                    'simulation_id': record['simulation_id'],
+                    'researcher_id': record['researcher_id'],
+                    'framework': record['framework'],
+                    'num_qubits': record['num_qubits'],
+                    'circuit_depth': record.get('circuit_depth'),
+                    'algorithm_type': record.get('algorithm_type'),
+                    'description': record.get('description'),
+                    # A record that arrives with its result is a finished run
+                    'status': record.get('status', 'completed' if record.get('result') else 'pending'),
+                    'execution_date': now
+                })
+            
+            db.session.execute(insert(QuantumSimulation.__table__), simulation_rows)
+            
+            # One lookup maps the new (project_id, simulation_id) pairs back to run_ids
+            accepted_pairs = [(records[i]['project_id'], records[i]['simulation_id']) for i in accepted]
+            run_ids = dict(((row.project_id, row.simulation_id), row.run_id) for row in db.session.query(
+                QuantumSimulation.project_id, QuantumSimulation.simulation_id, QuantumSimulation.run_id
+            ).filter(tuple_(QuantumSimulation.project_id, QuantumSimulation.simulation_id).in_(accepted_pairs)))
+            
+            result_rows, metadata_rows, parameter_rows, outputs = [], [], [], []
+            for i, pair in zip(accepted, accepted_pairs):
+                record = records[i]
+                run_id = run_ids[pair]
+                statuses[i].update({'status': 'created', 'run_id': run_id, 'simulation_id': record['simulation_id']})
+                
+                result = record.get('result')
+                if result:
+                    result_rows.append({
+                        'run_id': run_id,
+                        'execution_time_seconds': result.get('execution_time_seconds'),
+                        'success_probability': result.get('success_probability'),
+                        'fidelity': result.get('fidelity'),
+                        'energy_value': result.get('energy_value'),
+                        'error_rate': result.get('error_rate'),
+                        'output_digest': None,
+                        'measurement_counts': counts_columns[i]
+                    })
+                    if result.get('output_data') is not None:
+                        outputs.append((len(result_rows) - 1, result['output_data']))
+                
+                metadata = record.get('metadata')
+                if metadata:
+                    metadata_rows.append({
+                        'run_id': run_id,
+                        'random_seed': metadata.get('random_seed'),
+                        'hardware_backend': metadata.get('hardware_backend'),
+                        'framework_version': metadata.get('framework_version'),
+                        'reproducibility_score': metadata.get('reproducibility_score'),
+                        'verified_by': metadata.get('verified_by'),
+                        'verification_date': now if metadata.get('verified_by') else None
+                    })
+                
+                for param in record.get('parameters') or []:
+                    parameter_rows.append({
+                        'run_id': run_id,
+                        'parameter_name': param['parameter_name'],
+                        'parameter_value': str(param['parameter_value']),
+                        'parameter_unit': param.get('parameter_unit'),
+                        'parameter_type': param.get('parameter_type', 'string')
+                    })
+            
+            # Output payloads are deduplicated into output_blob with one lookup for the batch
+            for (row, _), digest in zip(outputs, put_outputs([output for _, output in outputs])):
+                result_rows[row]['output_digest'] = digest
+            
+            if result_rows:
+                db.session.execute(insert(SimulationResult.__table__), result_rows)
+            if metadata_rows:
+                db.session.execute(insert(ReproducibilityMetadata.__table__), metadata_rows)
+            if parameter_rows:
+                db.session.execute(insert(Parameter.__table__), parameter_rows)
+            
+            db.session.commit()
+        
+        if not accepted:
+            status_code = 400
+        elif failed:
+            status_code = 207
+        else:
+            status_code = 201
+        
+        return jsonify({
+            'created': len(accepted),
+            'failed': failed,
+            'items': statuses
+        }), status_code
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # UPDATE
 @simulations_bp.route('/<int:id>', methods=['PUT'])
 def update_simulation(id):
@@ -148,6 +434,7 @@ def delete_simulation(id):
         sim_id = simulation.simulation_id
         db.session.delete(simulation)
         db.session.commit()
+        remove_run_artifacts(id)
         
         return jsonify({
             'message': f'Simulation {sim_id} deleted successfully'
@@ -164,49 +451,17 @@ def save_results(id):
         simulation = QuantumSimulation.query.get_or_404(id)
         data = request.get_json()
         
-        result = simulation.result
-        
-        if result:
-            # Update existing
-            if 'execution_time_seconds' in data:
-                result.execution_time_seconds = data['execution_time_seconds']
-            if 'success_probability' in data:
-                if not (0 <= data['success_probability'] <= 1):
-                    return jsonify({'error': 'success_probability must be between 0 and 1'}), 400
-                result.success_probability = data['success_probability']
-            if 'fidelity' in data:
-                if not (0 <= data['fidelity'] <= 1):
-                    return jsonify({'error': 'fidelity must be between 0 and 1'}), 400
-                result.fidelity = data['fidelity']
-            if 'error_rate' in data:
-                if not (0 <= data['error_rate'] <= 1):
-                    return jsonify({'error': 'error_rate must be between 0 and 1'}), 400
-                result.error_rate = data['error_rate']
-            if 'output_data' in data:
-                result.output_data = str(data['output_data'])
-        else:
-            # Create new
-            result = SimulationResult(
-                run_id=id,
-                execution_time_seconds=data.get('execution_time_seconds'),
-                success_probability=data.get('success_probability'),
-                fidelity=data.get('fidelity'),
-                error_rate=data.get('error_rate'),
-                output_data=str(data.get('output_data', ''))
-            )
-            db.session.add(result)
-        
-        # Auto-update simulation status
-        if simulation.status == 'running':
-            simulation.status = 'completed'
-        
+        result, created = save_result(simulation, data)
         db.session.commit()
         
         return jsonify({
             'message': 'Results saved successfully',
             'result': result.to_dict()
-        }), 201 if not result.result_id else 200
+        }), 201 if created else 200
         
+    except ValidationError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -219,7 +474,21 @@ def get_results(id):
         if not simulation.result:
             return jsonify({'message': 'No results available'}), 404
         
-        return jsonify(simulation.result.to_dict())
+        # ?output=true adds the output payload, ?counts=json the histogram,
+        # ?counts=binary the packed histogram blob (base64)
+        counts_format = request.args.get('counts')
+        if counts_format not in (None, 'json', 'binary'):
+            return jsonify({'error': 'counts must be "json" or "binary"'}), 400
+        
+        data = simulation.result.to_dict(include_output=request.args.get('output') == 'true')
+        stored = simulation.result.measurement_counts
+        if counts_format == 'json':
+            data['measurement_counts'] = decode_counts(stored) if stored else None
+        elif counts_format == 'binary':
+            if stored and not is_binary(stored):
+                stored = encode_counts(decode_counts(stored))
+            data['measurement_counts_binary'] = base64.b64encode(stored).decode('ascii') if stored else None
+        return jsonify(data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -283,6 +552,116 @@ def get_metadata(id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _queue_reexecution(simulation, seed):
+    """
+    A pending copy of the run (same parameters and circuit, executor
+    'statevector', the given seed) for the job runner; returns it committed
+    """
+    parameters = {p.parameter_name: p for p in simulation.parameters}
+    copy = QuantumSimulation(
+        project_id=simulation.project_id,
+        simulation_id=f"{simulation.simulation_id[:80]}-rx-{uuid.uuid4().hex[:8]}",
+        researcher_id=simulation.researcher_id,
+        framework=simulation.framework,
+        num_qubits=simulation.num_qubits,
+        circuit_depth=simulation.circuit_depth,
+        algorithm_type=simulation.algorithm_type,
+        description=f"Re-execution of run {simulation.run_id}",
+        status='pending',
+        execution_date=datetime.utcnow()
+    )
+    db.session.add(copy)
+    db.session.flush()
+    for name, param in parameters.items():
+        if name not in ('executor', 'reexecution_of'):
+            db.session.add(Parameter(run_id=copy.run_id, parameter_name=name, parameter_value=param.parameter_value,
+                                     parameter_unit=param.parameter_unit, parameter_type=param.parameter_type))
+    db.session.add(Parameter(run_id=copy.run_id, parameter_name='executor', parameter_value='statevector',
+                             parameter_type='string'))
+    db.session.add(Parameter(run_id=copy.run_id, parameter_name='reexecution_of',
+                             parameter_value=str(simulation.run_id), parameter_type='numeric'))
+    db.session.add(ReproducibilityMetadata(run_id=copy.run_id, random_seed=seed))
+
+    # A circuit kept as an artifact is copied; the copy is only visible to the runner once committed
+    source = artifact_path(simulation.run_id, CIRCUIT_ARTIFACT)
+    if 'circuit' not in parameters and source.exists():
+        with open(source, 'rb') as stream:
+            size, sha256 = write_artifact(copy.run_id, CIRCUIT_ARTIFACT, stream)
+        db.session.add(SimulationArtifact(run_id=copy.run_id, name=CIRCUIT_ARTIFACT, size=size,
+                                          sha256=sha256, content_type='application/json'))
+    try:
+        db.session.commit()
+    except Exception:
+        remove_run_artifacts(copy.run_id)
+        raise
+    return copy
+
+# REEXECUTE - Re-run the recorded circuit on the reference simulator and compare
+@simulations_bp.route('/<int:id>/reexecute', methods=['POST'])
+def reexecute_simulation(id):
+    try:
+        simulation = QuantumSimulation.query.get_or_404(id)
+        data = request.get_json(silent=True) or {}
+        
+        metadata = simulation.repro_metadata
+        seed = data.get('seed', metadata.random_seed if metadata else None)
+        if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+            return jsonify({'error': 'A non-negative random_seed is needed to re-execute deterministically'}), 400
+        
+        parameters = {p.parameter_name: p.parameter_value for p in simulation.parameters}
+        circuit = load_circuit(id, parameters, simulation.num_qubits)
+        
+        # Circuits too large to run inside a request go to the job runner as a new pending run
+        if circuit.work > REEXECUTE_MAX_WORK:
+            copy = _queue_reexecution(simulation, seed)
+            return jsonify({
+                'message': 'Circuit exceeds the inline re-execution budget; queued for the job runner',
+                'run_id': id,
+                'queued_run_id': copy.run_id,
+                'work': circuit.work,
+                'max_work': REEXECUTE_MAX_WORK,
+                'compare': f'/api/simulations/compare-counts?runs={id},{copy.run_id}'
+            }), 202
+        
+        counts, stats = run_circuit(circuit, seed)
+        
+        # Compare against the stored histogram, which is taken as the reference
+        comparison = None
+        stored = load_counts([id]).get(id)
+        if stored is not None:
+            keys = np.array(list(counts), dtype=str)
+            values = np.fromiter(counts.values(), dtype=np.uint64, count=len(counts))
+            metrics = compare_to_reference(CountSet(['reexecuted', id], [(keys, values), stored]), 1)
+            comparison = {name: metric_json(metric[:1])[0] for name, metric in metrics.items()}
+            comparison['identical'] = counts == dict(zip(stored[0].tolist(), stored[1].tolist()))
+            
+            # ?record=true stores the Hellinger fidelity as the reproducibility score
+            if request.args.get('record', 'false').lower() == 'true':
+                if metadata is None:
+                    metadata = ReproducibilityMetadata(run_id=id, random_seed=seed)
+                    db.session.add(metadata)
+                metadata.reproducibility_score = round(comparison['hellinger_fidelity'], 6)
+                verified_by = request.headers.get('X-Researcher-ID', type=int)
+                if verified_by is not None:
+                    metadata.verified_by = verified_by
+                metadata.verification_date = datetime.utcnow()
+                db.session.commit()
+        
+        return jsonify({
+            'run_id': id,
+            'simulator': 'numpy-statevector',
+            **stats,
+            'measurement_counts': counts,
+            'comparison': comparison
+        }), 200
+        
+    except ValidationError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # PARAMETERS - Add
 @simulations_bp.route('/<int:id>/parameters', methods=['POST'])
 def add_parameter(id):
@@ -0,0 +1,54 @@
+"""
+Server-Sent Events Routes for QSLRM
+Push committed changes to dashboards instead of having them poll
+"""
+
+from flask import Blueprint, jsonify, Response, request, stream_with_context
+from utils.changefeed import change_hub, format_sse, FEED_ENTITIES
+
+stream_bp = Blueprint('stream', __name__)
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+
+# Change feed - one compact event per committed row change
+@stream_bp.route('/changes', methods=['GET'])
+def stream_changes():
+    try:
+        entities = request.args.get('entities')
+        entities = [e.strip() for e in entities.split(',') if e.strip()] if entities else None
+        
+        valid_entities = set(FEED_ENTITIES.values())
+        if entities and not set(entities) <= valid_entities:
+            return jsonify({'error': f'Invalid entity. Must be any of: {", ".join(sorted(valid_entities))}'}), 400
+        
+        # Browsers resend the last id they saw when the connection drops
+        last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id')) or None
+        
+        subscription = change_hub.subscribe(entities, last_event_id)
+        
+        def generate():
+            try:
+                yield 'retry: 3000\n\n'
+                while True:
+                    event = subscription.next_event(timeout=KEEPALIVE_SECONDS)
+                    if event is None:
+                        yield ': keep-alive\n\n'
+                    else:
+                        yield format_sse(event)
+            finally:
+                change_hub.unsubscribe(subscription)
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Hub statistics
+@stream_bp.route('/stats', methods=['GET'])
+def stream_stats():
+    return jsonify(change_hub.stats())
@@ -4,7 +4,11 @@ Real-time trigger statistics and management
 """
 
 from flask import Blueprint, jsonify, request
-from models import db, AccessLog, Researcher
+from models import db, AccessLogCounter
+from utils.access_counters import window_filter
+from utils.log_partitions import recent_logs
+from utils.audit import audit_writer
+from utils.identity import researcher_directory
 from sqlalchemy import text, func
 from datetime import datetime, timedelta
 
@@ -51,29 +55,32 @@ def get_trigger_activity():
     try:
         # Get time range from query params (default: last 24 hours)
         hours = request.args.get('hours', 24, type=int)
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        now = datetime.utcnow()
+        cutoff = now - timedelta(hours=hours)
         
-        # Get action counts (proxy for trigger activity)
+        # Get action counts (proxy for trigger activity) from the access-log counters
+        in_window = window_filter(cutoff, now)
         activity = db.session.query(
-            AccessLog.action_type,
-            AccessLog.target_entity,
-            func.count(AccessLog.log_id).label('count'),
-            func.max(AccessLog.timestamp).label('last_fired')
+            AccessLogCounter.action_type,
+            AccessLogCounter.target_entity,
+            func.sum(AccessLogCounter.count).label('count'),
+            func.max(AccessLogCounter.last_at).label('last_fired')
         ).filter(
-            AccessLog.timestamp >= cutoff
+            in_window
         ).group_by(
-            AccessLog.action_type,
-            AccessLog.target_entity
+            AccessLogCounter.action_type,
+            AccessLogCounter.target_entity
         ).all()
         
-        # Get hourly breakdown for charts
+        # Get hourly breakdown for charts (hour of day, as before)
+        hour_of_day = func.substr(AccessLogCounter.bucket, 12, 2) + ':00'
         hourly = db.session.query(
-            func.strftime('%H:00', AccessLog.timestamp).label('hour'),
-            func.count(AccessLog.log_id).label('executions')
+            hour_of_day.label('hour'),
+            func.sum(AccessLogCounter.count).label('executions')
         ).filter(
-            AccessLog.timestamp >= cutoff
+            in_window
         ).group_by(
-            func.strftime('%H', AccessLog.timestamp)
+            hour_of_day
         ).order_by('hour').all()
         
         hourly_data = [{'time': h.hour, 'executions': h.executions} for h in hourly]
@@ -87,7 +94,7 @@ def get_trigger_activity():
                 'table': act.target_entity,
                 'status': 'active',
                 'fires': act.count,
-                'lastFired': f"{(datetime.utcnow() - act.last_fired).seconds // 60} mins ago" if act.last_fired else 'Never'
+                'lastFired': f"{(now - act.last_fired).seconds // 60} mins ago" if act.last_fired else 'Never'
             })
         
         return jsonify({
@@ -106,14 +113,15 @@ def get_recent_trigger_events():
     try:
         limit = request.args.get('limit', 20, type=int)
         
-        # Get recent access logs (represents trigger activity)
-        logs = AccessLog.query.order_by(
-            AccessLog.timestamp.desc()
-        ).limit(limit).all()
+        # Get recent access logs (represents trigger activity), newest partitions first
+        logs = recent_logs(limit)
+        
+        # Every researcher named in the page, one lookup for all of them
+        identities = researcher_directory.lookup(log.researcher_id for log in logs)
         
         events = []
         for log in logs:
-            researcher = Researcher.query.get(log.researcher_id)
+            researcher = identities.get(log.researcher_id)
             
             # Determine severity
             if log.action_type in ['create', 'update']:
@@ -128,7 +136,7 @@ def get_recent_trigger_events():
             # Create message
             message = f"{log.action_type.capitalize()} {log.target_entity}"
             if researcher:
-                message += f" by {researcher.first_name} {researcher.last_name}"
+                message += f" by {researcher['name']}"
             
             time_diff = datetime.utcnow() - log.timestamp
             if time_diff.seconds < 60:
@@ -156,26 +164,20 @@ def get_recent_trigger_events():
 def get_trigger_statistics():
     """Get overall trigger statistics"""
     try:
-        # Total trigger executions (from access logs)
-        total_executions = AccessLog.query.count()
+        # Total trigger executions (lifetime counters, one row per action/entity)
+        lifetime = AccessLogCounter.query.filter(AccessLogCounter.resolution == 'all')
+        total_executions = lifetime.with_entities(func.sum(AccessLogCounter.count)).scalar() or 0
         
         # Executions in last hour
-        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-        recent_executions = AccessLog.query.filter(
-            AccessLog.timestamp >= one_hour_ago
-        ).count()
+        now = datetime.utcnow()
+        recent_executions = db.session.query(
+            func.sum(AccessLogCounter.count)
+        ).filter(
+            window_filter(now - timedelta(hours=1), now)
+        ).scalar() or 0
         
         # Most active trigger (most common action)
-        most_active = db.session.query(
-            AccessLog.action_type,
-            AccessLog.target_entity,
-            func.count(AccessLog.log_id).label('count')
-        ).group_by(
-            AccessLog.action_type,
-            AccessLog.target_entity
-        ).order_by(
-            func.count(AccessLog.log_id).desc()
-        ).first()
+        most_active = lifetime.order_by(AccessLogCounter.count.desc()).first()
         
         # Get actual database triggers count
         trigger_count_query = text("""
@@ -199,6 +201,12 @@ def get_trigger_statistics():
         return jsonify({'error': str(e)}), 500
 
 
+@triggers_bp.route('/audit-queue', methods=['GET'])
+def get_audit_queue_stats():
+    """Get audit writer queue depth, throughput and flush latency"""
+    return jsonify(audit_writer.stats())
+
+
 @triggers_bp.route('/create', methods=['POST'])
 def create_trigger():
     """Create a new database trigger"""
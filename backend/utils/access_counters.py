@@ -0,0 +1,144 @@
+"""
+Access-Log Counters for QSLRM
+Event counts per (action_type, target_entity) at minute, hour and lifetime
+resolution, upserted by the audit writer in the same transaction as the
+AccessLog rows they count, so reads no longer scan access_log.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+import click
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import db, AccessLogCounter
+from utils.log_partitions import attach, audit_cli, list_partitions, partition_name
+from utils.schema import apply_script, table_exists
+
+# Minute buckets are only read for recent windows; older ones are pruned
+MINUTE_RETENTION = timedelta(days=2)
+
+BUCKET_FORMATS = {
+    'minute': '%Y-%m-%d %H:%M:00',
+    'hour': '%Y-%m-%d %H:00:00'
+}
+
+_counters = AccessLogCounter.__table__
+
+
+def bucket_of(moment, resolution):
+    """Bucket label of a datetime at the given resolution"""
+    return moment.strftime(BUCKET_FORMATS[resolution]) if resolution in BUCKET_FORMATS else ''
+
+
+def ensure_access_counters():
+    """Install the counter table; backfill it from access_log when new"""
+    if not table_exists('access_log'):
+        return False
+
+    created = not table_exists('access_log_counter')
+    apply_script('access_counters.sql')
+    if created:
+        rebuild_access_counters()
+    return True
+
+
+def rebuild_access_counters():
+    """Recount everything from the main access_log and every online partition,
+    returns the number of counter rows"""
+    with db.engine.connect() as connection:
+        connection.execute(text("DELETE FROM access_log_counter"))
+        connection.commit()
+        
+        for month in [None] + list_partitions():
+            # One source at a time: ATTACH must happen outside the write transaction
+            schema = 'main'
+            if month is not None:
+                attach(connection, [month])
+                connection.commit()
+                schema = partition_name(month)
+            
+            for resolution, bucket_sql in (
+                ('minute', "strftime('%Y-%m-%d %H:%M:00', timestamp)"),
+                ('hour', "strftime('%Y-%m-%d %H:00:00', timestamp)"),
+                ('all', "''")
+            ):
+                connection.execute(text(f"""
+                    INSERT INTO access_log_counter (resolution, bucket, action_type, target_entity, count, last_at)
+                    SELECT '{resolution}', {bucket_sql}, action_type, target_entity, COUNT(*), MAX(timestamp)
+                    FROM {schema}.access_log
+                    WHERE timestamp IS NOT NULL
+                    GROUP BY {bucket_sql}, action_type, target_entity
+                    ON CONFLICT (resolution, bucket, action_type, target_entity) DO UPDATE SET
+                        count = count + excluded.count,
+                        last_at = max(COALESCE(last_at, ''), excluded.last_at)
+                """))
+            connection.commit()
+        
+        return connection.execute(text("SELECT COUNT(*) FROM access_log_counter")).scalar()
+
+
+def counter_deltas(rows):
+    """Aggregate AccessLog row dicts into counter upsert parameters"""
+    deltas = defaultdict(lambda: [0, None])
+    for row in rows:
+        moment = row['timestamp']
+        for resolution in ('minute', 'hour', 'all'):
+            delta = deltas[(resolution, bucket_of(moment, resolution), row['action_type'], row['target_entity'])]
+            delta[0] += 1
+            delta[1] = moment if delta[1] is None or moment > delta[1] else delta[1]
+    return [
+        {
+            'resolution': resolution, 'bucket': bucket, 'action_type': action_type,
+            'target_entity': target_entity, 'count': count, 'last_at': last_at
+        }
+        for (resolution, bucket, action_type, target_entity), (count, last_at) in deltas.items()
+    ]
+
+
+def apply_counter_deltas(connection, rows, now):
+    """Add a flushed batch to the counters (executemany upsert) and prune old minutes"""
+    deltas = counter_deltas(rows)
+    if deltas:
+        statement = sqlite_insert(_counters)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['resolution', 'bucket', 'action_type', 'target_entity'],
+            set_={
+                'count': _counters.c.count + statement.excluded.count,
+                'last_at': func.max(func.coalesce(_counters.c.last_at, ''), statement.excluded.last_at)
+            }
+        ), deltas)
+    connection.execute(
+        _counters.delete().where(
+            _counters.c.resolution == 'minute',
+            _counters.c.bucket < bucket_of(now - MINUTE_RETENTION, 'minute')
+        )
+    )
+
+
+def window_filter(cutoff, now):
+    """
+    Predicate selecting the counters that cover [cutoff, now]: whole hours
+    after the cutoff hour plus the minutes of the cutoff hour itself
+    (the whole cutoff hour once its minutes have been pruned)
+    """
+    cutoff_hour = bucket_of(cutoff, 'hour')
+    if cutoff < now - MINUTE_RETENTION:
+        return (AccessLogCounter.resolution == 'hour') & (AccessLogCounter.bucket >= cutoff_hour)
+
+    next_hour = bucket_of(cutoff + timedelta(hours=1), 'hour')
+    return (
+        ((AccessLogCounter.resolution == 'hour') & (AccessLogCounter.bucket >= next_hour)) |
+        ((AccessLogCounter.resolution == 'minute') &
+         (AccessLogCounter.bucket >= bucket_of(cutoff, 'minute')) &
+         (AccessLogCounter.bucket < next_hour))
+    )
+
+
+@audit_cli.command('rebuild-counters')
+def rebuild_counters_command():
+    """Recount access_log_counter from access_log and its partitions."""
+    ensure_access_counters()
+    rows = rebuild_access_counters()
+    click.echo(f"Rebuilt access_log_counter: {rows} rows")
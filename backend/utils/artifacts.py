@@ -0,0 +1,123 @@
+"""
+Simulation Artifact Store for QSLRM
+Large per-run files (statevectors, density matrices, shot logs) live on the
+local filesystem under ARTIFACT_DIR/<run_id>/<name>, with one
+simulation_artifact row each (database/artifacts.sql). Uploads are streamed
+to disk in chunks; downloads map the file and send only the requested range.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import uuid
+from pathlib import Path
+
+from utils.schema import DATABASE_DIR, apply_script, table_exists
+from utils.validators import ValidationError
+
+ARTIFACT_DIR = Path(os.getenv('ARTIFACT_DIR', DATABASE_DIR / 'artifacts'))
+
+# Largest accepted upload (default 64 GiB)
+ARTIFACT_MAX_BYTES = int(os.getenv('ARTIFACT_MAX_BYTES', str(64 * 2 ** 30)))
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SERVE_CHUNK_SIZE = 1024 * 1024
+
+_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]{0,127}')
+
+
+def ensure_artifact_store():
+    """Install the simulation_artifact table"""
+    if not table_exists('quantum_simulation'):
+        return False
+    apply_script('artifacts.sql')
+    return True
+
+
+def validate_name(name):
+    """Artifact names are plain file names: letters, digits, '.', '_', '-'"""
+    if not _NAME.fullmatch(name) or name in ('.', '..'):
+        raise ValidationError(f"Invalid artifact name: {name}")
+    return name
+
+
+def run_dir(run_id):
+    return ARTIFACT_DIR / str(int(run_id))
+
+
+def artifact_path(run_id, name):
+    return run_dir(run_id) / validate_name(name)
+
+
+def stage_artifact(run_id, name, stream, max_bytes=ARTIFACT_MAX_BYTES):
+    """
+    Copy a request body stream to a temporary file beside the artifact, chunk
+    by chunk, hashing as it goes. Returns (partial_path, size, sha256); the
+    caller renames it into place with publish_artifact once the artifact's
+    row is committed, or removes it with discard_partial.
+    """
+    target = artifact_path(run_id, name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{name}.{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, 'wb') as out:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValidationError(f"Artifact exceeds the {max_bytes:,}-byte limit")
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        discard_partial(partial)
+        raise
+    return partial, size, digest.hexdigest()
+
+
+def publish_artifact(partial, run_id, name):
+    """Rename a staged file into place: readers see either the old or the new content"""
+    os.replace(partial, artifact_path(run_id, name))
+
+
+def discard_partial(partial):
+    if partial.exists():
+        partial.unlink()
+
+
+def write_artifact(run_id, name, stream, max_bytes=ARTIFACT_MAX_BYTES):
+    """Stage and publish in one step (for runs no reader can see yet). Returns (size, sha256)."""
+    partial, size, sha256 = stage_artifact(run_id, name, stream, max_bytes)
+    publish_artifact(partial, run_id, name)
+    return size, sha256
+
+
+def remove_artifact(run_id, name):
+    path = artifact_path(run_id, name)
+    if path.exists():
+        path.unlink()
+
+
+def remove_run_artifacts(run_id):
+    shutil.rmtree(run_dir(run_id), ignore_errors=True)
+
+
+def iter_range(path, start, stop, chunk_size=SERVE_CHUNK_SIZE):
+    """
+    Yield bytes [start, stop) of a file through a read-only memory map: only
+    the pages of the requested range are touched, and the file keeps serving
+    its old content if it is replaced mid-download.
+    """
+    if stop <= start:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in range(start, stop, chunk_size):
+            yield mapped[offset:min(offset + chunk_size, stop)]
@@ -0,0 +1,258 @@
+"""
+Asynchronous Audit Logging for QSLRM
+AccessLog rows are queued in-process and written by a background thread in
+batches (one executemany per monthly partition and one transaction per
+flush, which also updates access_log_counter), so requests never wait on an
+audit commit.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+from flask import request
+from sqlalchemy.exc import IntegrityError
+
+from utils.access_counters import apply_counter_deltas
+from utils.log_partitions import apply_retention, insert_rows, prepare_partitions
+
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0
+AUDIT_PUT_TIMEOUT = 0.5
+
+# Values allowed by the access_log CHECK constraints
+ACTION_TYPES = ('create', 'read', 'update', 'delete', 'login', 'logout')
+TARGET_ENTITIES = ('researcher', 'project', 'simulation', 'result', 'metadata', 'parameter', 'circuit')
+
+_STOP = object()
+
+
+def _as_id(value, field):
+    """An integer id (or None); rejects values the writer thread could not insert"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{field} must be an integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer")
+
+
+class AuditWriter:
+    """Bounded queue of AccessLog rows drained by one writer thread"""
+
+    def __init__(self, max_queue=AUDIT_QUEUE_SIZE, batch_size=AUDIT_BATCH_SIZE,
+                 flush_interval=AUDIT_FLUSH_INTERVAL, put_timeout=AUDIT_PUT_TIMEOUT):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._engine = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.flush_ms_total = 0.0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def start(self, engine):
+        """Start the writer thread (once) against the given engine"""
+        with self._lock:
+            self._engine = engine
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def record(self, researcher_id, action_type, target_entity, target_id=None,
+               ip_address=None, user_agent=None, timestamp=None):
+        """
+        Queue one AccessLog row. When the queue is full the caller waits up to
+        put_timeout seconds for room (backpressure); after that the row is
+        dropped and counted. Returns whether the row was queued.
+        """
+        if action_type not in ACTION_TYPES or target_entity not in TARGET_ENTITIES:
+            raise ValueError(f"Invalid audit event: {action_type} {target_entity}")
+        researcher_id = _as_id(researcher_id, 'researcher_id')
+        if researcher_id is None:
+            raise ValueError("Audit events need a researcher_id")
+        target_id = _as_id(target_id, 'target_id')
+
+        row = {
+            'researcher_id': researcher_id,
+            'action_type': action_type,
+            'target_entity': target_entity,
+            'target_id': target_id,
+            'timestamp': timestamp or datetime.utcnow(),
+            'ip_address': ip_address,
+            'user_agent': user_agent
+        }
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far has been written; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout=10):
+        """Write out the queue and stop the thread (called at interpreter exit)"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': bool(self._thread and self._thread.is_alive()),
+                'queue_depth': self._queue.qsize(),
+                'max_queue': self._queue.maxsize,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'last_flush_ms': round(self.last_flush_ms, 3),
+                'avg_flush_ms': round(self.flush_ms_total / self.batches, 3) if self.batches else 0,
+                'max_flush_ms': round(self.max_flush_ms, 3)
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            item = first
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._write(batch)
+            finally:
+                # One task_done per item taken, including the stop marker
+                for _ in range(len(batch) + (1 if stopping else 0)):
+                    self._queue.task_done()
+
+    @staticmethod
+    def _insert(connection, rows):
+        with connection.begin():
+            insert_rows(connection, rows)
+            apply_counter_deltas(connection, rows, datetime.utcnow())
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            # Audit rows back no cached response, so these commits leave the data version alone
+            with self._engine.connect() as connection:
+                created = prepare_partitions(connection, batch)
+                connection.commit()
+                try:
+                    self._insert(connection, batch)
+                    written = len(batch)
+                except IntegrityError:
+                    # Retry row by row so only the offending rows are dropped
+                    written = 0
+                    for row in batch:
+                        try:
+                            self._insert(connection, [row])
+                            written += 1
+                        except IntegrityError as e:
+                            print(f"⚠️  Audit row rejected: {e.orig}")
+        except Exception as e:
+            print(f"⚠️  Audit flush failed, {len(batch)} rows lost: {e}")
+            with self._lock:
+                self.failed += len(batch)
+            return
+
+        # A new month's partition is the cue to archive the ones past retention
+        if created:
+            try:
+                apply_retention(engine=self._engine)
+            except Exception as e:
+                print(f"⚠️  Access-log retention failed: {e}")
+
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.written += written
+            self.failed += len(batch) - written
+            self.batches += 1
+            self.last_flush_ms = elapsed
+            self.flush_ms_total += elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+
+audit_writer = AuditWriter()
+
+
+# blueprint -> audited entity for GET requests; a trailing sub-resource overrides it
+READ_ENTITIES = {'researchers': 'researcher', 'projects': 'project', 'simulations': 'simulation', 'artifacts': 'simulation'}
+READ_SUBRESOURCES = {'results': 'result', 'metadata': 'metadata', 'parameters': 'parameter'}
+
+
+def _read_entity():
+    entity = READ_ENTITIES.get(request.blueprint)
+    if entity and request.url_rule is not None:
+        last_segment = request.url_rule.rule.rstrip('/').rsplit('/', 1)[-1]
+        entity = READ_SUBRESOURCES.get(last_segment, entity)
+    return entity
+
+
+def record_reads(app):
+    """Queue a 'read' AccessLog row for successful entity GETs by an identified
+    researcher (X-Researcher-ID header); anonymous reads are not logged"""
+    @app.after_request
+    def _audit_read(response):
+        if request.method != 'GET' or response.status_code not in (200, 304):
+            return response
+        researcher_id = request.headers.get('X-Researcher-ID', type=int)
+        entity = _read_entity()
+        if researcher_id is None or entity is None:
+            return response
+
+        target_id = (request.view_args or {}).get('id')
+        audit_writer.record(
+            researcher_id=researcher_id,
+            action_type='read',
+            target_entity=entity,
+            target_id=target_id,
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent')
+        )
+        return response
@@ -0,0 +1,239 @@
+"""
+Response Caching for QSLRM
+GET responses are cached against the database's table versions
+(database/table_versions.sql): triggers bump a table's counter on every row
+written, whichever process wrote it, and each request reads the counters
+once. Polling clients share one computation per write, and writes from the
+job runner, CLI commands or other workers invalidate the cache as well.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, has_request_context, request
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import OperationalError
+
+from models import db
+from utils.schema import apply_script, table_exists
+
+_versions_key = 'qslrm.table_versions'
+
+
+def ensure_table_versions():
+    """Install table_version and its triggers (after every table they watch exists)"""
+    if not table_exists('quantum_simulation'):
+        return False
+    apply_script('table_versions.sql')
+    return True
+
+
+def shared_versions(fresh=False):
+    """
+    {table: version} as stored in table_version, read once per request unless
+    fresh. None when the table is missing, in which case nothing is cached.
+    """
+    memo = request.environ if has_request_context() else {}
+    if not fresh and _versions_key in memo:
+        return memo[_versions_key]
+    try:
+        with db.engine.connect() as connection:
+            versions = dict(connection.execute(text("SELECT table_name, version FROM table_version")).all())
+    except OperationalError:
+        versions = None
+    memo[_versions_key] = versions
+    return versions
+
+
+def data_version():
+    """Global data version: the sum of all table versions (None when unavailable)"""
+    versions = shared_versions()
+    return sum(versions.values()) if versions is not None else None
+
+
+def table_versions(tables):
+    """Change versions for the given tables, or None when unavailable"""
+    versions = shared_versions()
+    if versions is None:
+        return None
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+# Commits are also reported in-process, with the rows they wrote, to the
+# on_commit listeners (change feed, identity and suggestion caches).
+# ALL_TABLES marks a commit whose targets are unknown (raw SQL).
+ALL_TABLES = '*'
+_pending_key = 'qslrm_pending_changes'
+_commit_listeners = []
+
+
+def on_commit(listener):
+    """Register listener(changes, versions), called after each commit that wrote data.
+    changes is a list of (table, primary_key or None, operation)."""
+    _commit_listeners.append(listener)
+    return listener
+
+
+def _pending(session):
+    return session.info.setdefault(_pending_key, [])
+
+
+def _primary_key(obj):
+    key = inspect(obj).mapper.primary_key_from_instance(obj)
+    return key[0] if len(key) == 1 else list(key)
+
+
+def _collect_flushed(session, flush_context):
+    pending = _pending(session)
+    for operation, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            if operation == 'update' and not session.is_modified(obj):
+                continue
+            table = getattr(obj, '__tablename__', None) or ALL_TABLES
+            pending.append((table, _primary_key(obj), operation))
+
+
+def _collect_executed(state):
+    if state.is_select:
+        return
+    statement_text = getattr(state.statement, 'text', None)
+    if isinstance(statement_text, str) and statement_text.lstrip().upper().startswith('SELECT'):
+        return
+    table = getattr(state.statement, 'table', None)
+    if state.is_insert:
+        operation = 'insert'
+    elif state.is_update:
+        operation = 'update'
+    elif state.is_delete:
+        operation = 'delete'
+    else:
+        operation = 'unknown'
+    # text() and other opaque statements: assume anything may have changed
+    _pending(state.session).append((getattr(table, 'name', None) or ALL_TABLES, None, operation))
+
+
+def _publish(session):
+    changes = session.info.pop(_pending_key, None)
+    if not changes:
+        return
+    versions = shared_versions(fresh=True) or {}
+    for listener in _commit_listeners:
+        listener(changes, versions)
+
+
+def _discard(session):
+    session.info.pop(_pending_key, None)
+
+
+def track_table_changes(session):
+    """Record which tables each commit of this (scoped) session wrote to"""
+    event.listen(session, 'after_flush', _collect_flushed)
+    event.listen(session, 'do_orm_execute', _collect_executed)
+    event.listen(session, 'after_commit', _publish)
+    event.listen(session, 'after_rollback', _discard)
+
+
+class ResponseCache:
+    """Bounded LRU of serialized responses, tagged with the data version they were built at"""
+
+    def __init__(self, max_entries=256, lock_stripes=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(lock_stripes)]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version, ttl=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['version'] == version and (ttl is None or time.monotonic() - entry['stored'] < ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            return None
+
+    def put(self, key, version, body, status, mimetype):
+        with self._lock:
+            self._entries[key] = {
+                'version': version,
+                'stored': time.monotonic(),
+                'body': body,
+                'status': status,
+                'mimetype': mimetype
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def key_lock(self, key):
+        """Striped per-key lock so concurrent misses compute a response only once"""
+        return self._key_locks[hash(key) % len(self._key_locks)]
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        version = data_version()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'data_version': version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _from_entry(entry):
+    return Response(entry['body'], status=entry['status'], mimetype=entry['mimetype'])
+
+
+def cached_response(ttl=None):
+    """
+    Cache a GET view's 200 responses per full request path until the next write
+    to any watched table. ttl (seconds) additionally expires entries that depend
+    on the clock. Without table versions the view simply runs uncached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.full_path
+            version = data_version()
+            if version is None:
+                return view(*args, **kwargs)
+
+            entry = response_cache.get(key, version, ttl)
+            if entry:
+                return _from_entry(entry)
+
+            with response_cache.key_lock(key):
+                # Another request may have filled the entry while we waited
+                entry = response_cache.get(key, version, ttl)
+                if entry:
+                    return _from_entry(entry)
+
+                response_cache.record_miss()
+                result = view(*args, **kwargs)
+
+                # Views return either a Response or (Response, status); only plain 200s are kept
+                if isinstance(result, Response) and result.status_code == 200:
+                    response_cache.put(key, version, result.get_data(), 200, result.mimetype)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,259 @@
+"""
+Change Feed Hub for QSLRM
+Fans committed changes out to Server-Sent Events subscribers.
+One commit produces one publish; every subscriber gets it from its own
+bounded queue, so no client ever polls the database.
+
+Per-row events only exist for commits made by this process. Writes from
+other workers (or other tools) are noticed by one background thread that
+polls table_version and publishes a per-entity reset, so subscribers
+refetch that entity. A foreign write that lands between a local commit and
+its version read is folded into that commit's events instead.
+"""
+
+import itertools
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import deque
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from utils.cache import ALL_TABLES, on_commit
+
+# Tables exposed on the feed and the entity names clients see
+FEED_ENTITIES = {
+    'researcher': 'researcher',
+    'simulation_project': 'project',
+    'quantum_simulation': 'simulation',
+    'simulation_result': 'result',
+    'reproducibility_metadata': 'metadata',
+    'parameter': 'parameter'
+}
+
+# Above this many rows in one commit, per-row events collapse into one per entity
+MAX_EVENTS_PER_COMMIT = 100
+
+# Seconds between table_version polls for writes made by other processes
+CHANGEFEED_POLL_INTERVAL = float(os.getenv('CHANGEFEED_POLL_INTERVAL', '1'))
+
+
+class Subscription:
+    """A subscriber's bounded event queue; overflow turns into a single reset event"""
+
+    def __init__(self, entities=None, max_pending=1000):
+        self.entities = set(entities) if entities else None
+        self.events = queue.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def wants(self, event):
+        return self.entities is None or event['entity'] in self.entities or event['entity'] == '*'
+
+    def offer(self, event):
+        if self.overflowed or not self.wants(event):
+            return
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Slow client: drop the backlog, it has to refetch everything anyway
+            self.overflowed = True
+
+    def next_event(self, timeout):
+        if self.overflowed:
+            self.overflowed = False
+            while not self.events.empty():
+                self.events.get_nowait()
+            return {'id': None, 'entity': '*', 'operation': 'reset'}
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ChangeHub:
+    """
+    In-process publish/subscribe hub with a short replay buffer for reconnects.
+    Event ids are '<boot id>-<seq>': sequences restart with the process, so an
+    id issued by another process (or before a restart) cannot be replayed and
+    the client is sent a reset instead.
+    """
+
+    def __init__(self, history=1000):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._sequence = itertools.count(1)
+        self._last_seq = 0
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.published = 0
+        self.external_resets = 0
+        # Latest table_version values accounted for (local commits or polls)
+        self._versions = None
+        self._unexplained = {}
+        self._engine = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self, engine, interval=CHANGEFEED_POLL_INTERVAL):
+        """Start the table_version poller (once) against the given engine"""
+        with self._lock:
+            self._engine = engine
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._poll, args=(interval,), name='changefeed-poll', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def _own_sequence(self, event_id):
+        """The sequence number of an id this hub issued, else None"""
+        boot_id, _, seq = str(event_id).partition('-')
+        if boot_id != self.boot_id or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def subscribe(self, entities=None, last_event_id=None):
+        """last_event_id is the Last-Event-ID a reconnecting client sent, if any"""
+        subscription = Subscription(entities)
+        with self._lock:
+            if last_event_id is not None:
+                seq = self._own_sequence(last_event_id)
+                # Not ours, ahead of us, or older than the replay buffer reaches
+                if (seq is None or seq > self._last_seq
+                        or (self._history and self._history[0]['seq'] > seq + 1)):
+                    subscription.overflowed = True
+                else:
+                    for event in self._history:
+                        if event['seq'] > seq:
+                            subscription.offer(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events):
+        with self._lock:
+            for event in events:
+                event['seq'] = self._last_seq = next(self._sequence)
+                event['event_id'] = f"{self.boot_id}-{event['seq']}"
+                self._history.append(event)
+                for subscription in self._subscribers:
+                    subscription.offer(event)
+            self.published += len(events)
+
+    def account(self, versions):
+        """Record table versions a local commit left behind (its events are published already)"""
+        if not versions:
+            return
+        with self._lock:
+            if self._versions is None:
+                return
+            for table, version in versions.items():
+                if version > self._versions.get(table, 0):
+                    self._versions[table] = version
+
+    def check_versions(self, versions):
+        """
+        Compare polled versions with those accounted for; a table still ahead
+        on the next poll was written by someone else and gets a reset event.
+        The one-poll delay lets a local commit that is mid-publish catch up.
+        """
+        with self._lock:
+            if self._versions is None:
+                self._versions = dict(versions)
+                return []
+            known = self._versions
+            unexplained, self._unexplained = self._unexplained, {}
+            events = []
+            for table, version in versions.items():
+                if version <= known.get(table, 0):
+                    continue
+                seen = unexplained.get(table)
+                if seen is None or seen <= known.get(table, 0):
+                    self._unexplained[table] = version
+                    continue
+                known[table] = version
+                entity = FEED_ENTITIES.get(table)
+                if entity is not None:
+                    events.append({'entity': entity, 'id': None, 'operation': 'reset', 'version': version})
+            self.external_resets += len(events)
+        if events:
+            self.publish(events)
+        return events
+
+    def _poll(self, interval):
+        while not self._stopped.wait(interval):
+            try:
+                with self._engine.connect() as connection:
+                    versions = dict(connection.execute(text("SELECT table_name, version FROM table_version")).all())
+            except OperationalError:
+                continue
+            except Exception as e:
+                print(f"⚠️  Change feed poll failed: {e}")
+                continue
+            self.check_versions(versions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'external_resets': self.external_resets,
+                'polling': bool(self._thread and self._thread.is_alive()),
+                'history': len(self._history)
+            }
+
+
+change_hub = ChangeHub()
+
+
+def _feed_events(changes, versions):
+    """Turn a commit's (table, id, operation) records into feed events"""
+    if any(table == ALL_TABLES for table, _, _ in changes):
+        return [{'entity': '*', 'id': None, 'operation': 'reset', 'version': None}]
+
+    events = []
+    seen = set()
+    for table, key, operation in changes:
+        entity = FEED_ENTITIES.get(table)
+        if entity is None or (table, key, operation) in seen:
+            continue
+        seen.add((table, key, operation))
+        events.append({'entity': entity, 'id': key, 'operation': operation, 'version': versions.get(table)})
+
+    if len(events) > MAX_EVENTS_PER_COMMIT:
+        collapsed = {}
+        for event in events:
+            collapsed.setdefault(event['entity'], {
+                'entity': event['entity'], 'id': None, 'operation': 'bulk', 'version': event['version']
+            })
+        events = list(collapsed.values())
+    return events
+
+
+@on_commit
+def _publish_commit(changes, versions):
+    events = _feed_events(changes, versions)
+    if events:
+        change_hub.publish(events)
+    change_hub.account(versions)
+
+
+def format_sse(event):
+    """Serialize one event in text/event-stream framing"""
+    payload = {k: v for k, v in event.items() if k not in ('seq', 'event_id')}
+    lines = []
+    if event.get('event_id') is not None:
+        lines.append(f"id: {event['event_id']}")
+    lines.append(f"event: {'reset' if event['operation'] == 'reset' else 'change'}")
+    lines.append(f"data: {json.dumps(payload, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
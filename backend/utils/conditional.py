@@ -0,0 +1,70 @@
+"""
+Conditional GET (ETag / If-None-Match) for QSLRM Blueprints
+ETags are derived from the shared change versions of the tables a blueprint
+reads (utils/cache.table_versions), so a matching request is answered 304
+after one small query, before the view runs.
+"""
+
+import hashlib
+import time
+
+from flask import current_app, g, request
+
+from utils.cache import table_versions
+
+
+def etag_ttl(seconds):
+    """Mark a view whose output also depends on the clock; its ETag rolls over every `seconds`"""
+    def decorator(view):
+        view.etag_ttl = seconds
+        return view
+    return decorator
+
+
+def etag_exempt(view):
+    """Opt a view out of conditional GET (its output changes without any table write)"""
+    view.etag_exempt = True
+    return view
+
+
+def _current_etag(tables):
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'etag_exempt', False):
+        return None
+    versions = table_versions(tables)
+    if versions is None:
+        return None
+    parts = [request.full_path]
+    parts.extend(str(v) for v in versions)
+    ttl = getattr(view, 'etag_ttl', None)
+    if ttl:
+        parts.append(str(int(time.time() // ttl)))
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def enable_conditional_get(blueprint, tables):
+    """Give every GET of the blueprint an ETag built from the given tables' change versions"""
+    tables = tuple(tables)
+
+    @blueprint.before_request
+    def _check_if_none_match():
+        if request.method != 'GET':
+            return None
+        g.etag = _current_etag(tables)
+        if g.etag and g.etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+            response.set_etag(g.etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return None
+
+    @blueprint.after_request
+    def _set_etag(response):
+        etag = g.pop('etag', None)
+        if etag and response.status_code == 200 and not response.is_streamed:
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate on every poll
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return blueprint
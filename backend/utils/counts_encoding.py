@@ -0,0 +1,181 @@
+"""
+Binary Measurement-Count Encoding for QSLRM
+simulation_result.measurement_counts holds histograms as a packed BLOB:
+
+    16-byte header  b'QCNT', version, flags, num_bits (uint16), entries (uint64)
+    payload         bitstring indices (uint32, or uint64 above 32 bits),
+                    then counts (uint32, or uint64 when a count needs it),
+                    zlib-compressed as a whole when flagged
+
+Indices are the bitstrings read as binary numbers, sorted ascending. Rows
+written before this format (JSON text) still decode.
+"""
+
+import json
+import struct
+import zlib
+
+import click
+import numpy as np
+from flask.cli import AppGroup
+
+from models import db, SimulationResult
+from utils.validators import ValidationError
+
+MAGIC = b'QCNT'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHQ')
+
+FLAG_ZLIB = 0x01
+FLAG_WIDE_INDEX = 0x02
+FLAG_WIDE_COUNT = 0x04
+
+# Packed indices are uint64 at most
+MAX_BINARY_BITS = 64
+
+ZLIB_LEVEL = 6
+
+
+def bitstrings_to_indices(keys, num_bits):
+    """Equal-length '0'/'1' strings -> uint64 indices (vectorized through packbits)"""
+    bits = np.frombuffer(''.join(keys).encode('ascii'), dtype=np.uint8).reshape(-1, num_bits) - ord('0')
+    padded = np.zeros((len(keys), MAX_BINARY_BITS), dtype=np.uint8)
+    padded[:, MAX_BINARY_BITS - num_bits:] = bits
+    return np.packbits(padded, axis=1).view('>u8').ravel().astype(np.uint64)
+
+
+def indices_to_bitstrings(indices, num_bits):
+    """uint indices -> array of num_bits-wide bitstrings"""
+    octets = np.ascontiguousarray(indices, dtype='>u8').view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(octets, axis=1)[:, MAX_BINARY_BITS - num_bits:] + np.uint8(ord('0'))
+    return np.ascontiguousarray(bits).view(f'S{num_bits}').ravel().astype(str)
+
+
+def encode_counts(counts, compress=True):
+    """
+    Pack a {bitstring: count} histogram (as returned by parse_counts) into the
+    binary format; zlib is kept only when it makes the blob smaller. Returns
+    None when the histogram cannot be packed (mixed widths or more than 64
+    bits), in which case it is stored as JSON.
+    """
+    if not counts:
+        return None
+    widths = {len(key) for key in counts}
+    num_bits = widths.pop()
+    if widths or num_bits > MAX_BINARY_BITS:
+        return None
+
+    keys = list(counts)
+    indices = bitstrings_to_indices(keys, num_bits)
+    values = np.fromiter(counts.values(), dtype=np.uint64, count=len(keys))
+    order = np.argsort(indices, kind='stable')
+
+    flags = 0
+    index_dtype = '<u4'
+    if num_bits > 32:
+        flags |= FLAG_WIDE_INDEX
+        index_dtype = '<u8'
+    count_dtype = '<u4'
+    if values.max() > np.iinfo(np.uint32).max:
+        flags |= FLAG_WIDE_COUNT
+        count_dtype = '<u8'
+
+    payload = indices[order].astype(index_dtype).tobytes() + values[order].astype(count_dtype).tobytes()
+    if compress:
+        compressed = zlib.compress(payload, ZLIB_LEVEL)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, VERSION, flags, num_bits, len(keys)) + payload
+
+
+def is_binary(stored):
+    return isinstance(stored, (bytes, bytearray, memoryview)) and bytes(stored[:4]) == MAGIC
+
+
+def decode_arrays(blob):
+    """
+    (indices, counts, num_bits) of a binary blob. The arrays are read-only
+    frombuffer views over the blob (or over its decompressed payload).
+    """
+    if len(blob) < HEADER.size:
+        raise ValidationError("Truncated measurement_counts blob")
+    magic, version, flags, num_bits, entries = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValidationError("Unrecognised measurement_counts blob")
+    if not 1 <= num_bits <= MAX_BINARY_BITS:
+        raise ValidationError(f"measurement_counts blob num_bits must be between 1 and {MAX_BINARY_BITS}")
+
+    index_dtype = np.dtype('<u8' if flags & FLAG_WIDE_INDEX else '<u4')
+    count_dtype = np.dtype('<u8' if flags & FLAG_WIDE_COUNT else '<u4')
+    expected = entries * (index_dtype.itemsize + count_dtype.itemsize)
+    if flags & FLAG_ZLIB:
+        # Inflate no further than the header says the payload is
+        try:
+            payload = zlib.decompressobj().decompress(memoryview(blob)[HEADER.size:], expected + 1)
+        except zlib.error:
+            raise ValidationError("Corrupt measurement_counts blob (bad zlib stream)")
+        offset = 0
+    else:
+        payload, offset = blob, HEADER.size
+    if len(payload) - offset != expected:
+        raise ValidationError("Corrupt measurement_counts blob")
+
+    indices = np.frombuffer(payload, dtype=index_dtype, count=entries, offset=offset)
+    counts = np.frombuffer(payload, dtype=count_dtype, count=entries, offset=offset + entries * index_dtype.itemsize)
+    if entries and num_bits < MAX_BINARY_BITS and int(indices.max()) >> num_bits:
+        raise ValidationError(f"measurement_counts blob has an index wider than {num_bits} bits")
+    return indices, counts, num_bits
+
+
+def histogram_arrays(stored):
+    """(bitstrings, counts) arrays of a stored value, binary or legacy JSON; None when empty"""
+    if stored is None or len(stored) == 0:
+        return None
+    if is_binary(stored):
+        indices, counts, num_bits = decode_arrays(stored)
+        return indices_to_bitstrings(indices, num_bits), counts
+    if isinstance(stored, (bytes, bytearray, memoryview)):
+        stored = bytes(stored).decode('utf-8')
+    histogram = json.loads(stored)
+    if not isinstance(histogram, dict) or not histogram:
+        return None
+    return np.array(list(histogram), dtype=str), np.fromiter(histogram.values(), dtype=np.uint64, count=len(histogram))
+
+
+def decode_counts(stored):
+    """{bitstring: count} of a stored value, binary or legacy JSON"""
+    arrays = histogram_arrays(stored)
+    if arrays is None:
+        return {}
+    keys, counts = arrays
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def store_counts(counts):
+    """Column value for a parsed histogram: the binary blob, or JSON text when it can't be packed"""
+    return encode_counts(counts) or json.dumps(counts, separators=(',', ':'))
+
+
+results_cli = AppGroup('results', help='Maintain stored simulation results.')
+
+
+@results_cli.command('pack-counts')
+def pack_counts_command():
+    """Re-encode JSON measurement_counts rows in the binary format."""
+    packed = before = after = 0
+    rows = db.session.query(SimulationResult.result_id, SimulationResult.measurement_counts)\
+        .filter(SimulationResult.measurement_counts.isnot(None)).all()
+    for result_id, stored in rows:
+        if not stored or is_binary(stored):
+            continue
+        blob = encode_counts(decode_counts(stored))
+        if blob is None:
+            continue
+        db.session.query(SimulationResult).filter_by(result_id=result_id)\
+            .update({'measurement_counts': blob}, synchronize_session=False)
+        packed += 1
+        before += len(stored)
+        after += len(blob)
+    db.session.commit()
+    click.echo(f"Packed {packed} histogram(s): {before:,} -> {after:,} bytes")
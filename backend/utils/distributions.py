@@ -0,0 +1,182 @@
+"""
+Measurement-Count Distributions for QSLRM
+Decodes simulation_result.measurement_counts histograms into count arrays
+aligned on the union of their bitstrings and compares them in bulk: total
+variation distance, Hellinger fidelity and KL divergence, for one reference
+against many runs (sparse, O(outcomes observed)) or all pairs of a set (dense
+matrix products).
+"""
+
+import json
+import re
+
+import numpy as np
+
+from models import db, SimulationResult
+from utils.counts_encoding import histogram_arrays
+from utils.validators import ValidationError
+
+# Runs per 1 x N comparison; runs per N x N comparison, and outcome-union
+# cells held densely for it
+MAX_COMPARE_RUNS = 5000
+MAX_PAIRWISE_RUNS = 500
+MAX_DENSE_CELLS = 20_000_000
+
+# Cells (rows x N x outcomes floats) per broadcast step of the N x N TVD
+TVD_BLOCK_CELLS = 1_000_000
+
+_BITSTRING = re.compile(r'^[01]+$')
+
+
+def parse_counts(value):
+    """
+    Validate a {bitstring: count} histogram (a dict or its JSON text) and
+    return it with register separators removed ('01 10' -> '0110'). Raises
+    ValidationError on anything else.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValidationError("measurement_counts must be a JSON object of bitstring -> count")
+    if not isinstance(value, dict):
+        raise ValidationError("measurement_counts must be an object of bitstring -> count")
+
+    counts = {}
+    for key, count in value.items():
+        bitstring = str(key).replace(' ', '')
+        if not _BITSTRING.match(bitstring):
+            raise ValidationError(f"Invalid bitstring in measurement_counts: {key}")
+        if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+            raise ValidationError(f"Count for {key} must be a non-negative integer")
+        counts[bitstring] = counts.get(bitstring, 0) + count
+    return counts
+
+
+class CountSet:
+    """
+    Histograms of several runs over one outcome axis, in COO form: for
+    every (run, bitstring) observed, the run's row, the bitstring's column
+    in `outcomes` and its probability.
+    """
+
+    def __init__(self, run_ids, histograms):
+        """histograms: one (bitstrings, counts) array pair per run"""
+        self.run_ids = list(run_ids)
+        lengths = [len(keys) for keys, _ in histograms]
+        keys = np.concatenate([keys for keys, _ in histograms]) if histograms else np.array([], dtype=str)
+        counts = np.concatenate([c for _, c in histograms]).astype(np.float64) if histograms else np.array([])
+
+        self.outcomes, self.cols = np.unique(keys, return_inverse=True)
+        self.rows = np.repeat(np.arange(len(histograms)), lengths)
+        totals = np.bincount(self.rows, weights=counts, minlength=len(histograms))
+        if np.any(totals <= 0):
+            empty = [self.run_ids[i] for i in np.flatnonzero(totals <= 0)]
+            raise ValidationError(f"Runs without measurement counts: {', '.join(map(str, empty))}")
+        self.shots = totals.astype(np.int64)
+        self.probs = counts / totals[self.rows]
+
+    def __len__(self):
+        return len(self.run_ids)
+
+    def dense(self):
+        """runs x outcomes probability matrix"""
+        if len(self) * len(self.outcomes) > MAX_DENSE_CELLS:
+            raise ValidationError(
+                f"{len(self)} runs x {len(self.outcomes)} outcomes is too large to compare pairwise"
+            )
+        matrix = np.zeros((len(self), len(self.outcomes)))
+        matrix[self.rows, self.cols] = self.probs
+        return matrix
+
+
+def compare_to_reference(counts, reference):
+    """
+    Metrics of every run in `counts` against row `reference`, computed over
+    the COO entries only (the reference is the only dense vector).
+    KL is KL(reference || run): infinite (None) when the run never saw an
+    outcome the reference did.
+    """
+    p = np.zeros(len(counts.outcomes))
+    own = counts.rows == reference
+    p[counts.cols[own]] = counts.probs[own]
+    n = len(counts)
+
+    p_at = p[counts.cols]
+    q = counts.probs
+
+    # sum_j |p_j - q_j| = 1 + sum over the run's outcomes of (|p - q| - p)
+    tvd = 0.5 * (1 + np.bincount(counts.rows, weights=np.abs(p_at - q) - p_at, minlength=n))
+    bhattacharyya = np.bincount(counts.rows, weights=np.sqrt(p_at * q), minlength=n)
+
+    supported = p_at > 0
+    covered = np.bincount(counts.rows[supported], minlength=n)
+    cross = np.bincount(counts.rows[supported], weights=p_at[supported] * np.log(q[supported]), minlength=n)
+    reference_support = p[p > 0]
+    kl = np.sum(reference_support * np.log(reference_support)) - cross
+    kl[covered < len(reference_support)] = np.inf
+
+    return {
+        'total_variation_distance': np.clip(tvd, 0, 1),
+        'hellinger_fidelity': np.clip(bhattacharyya, 0, 1) ** 2,
+        'kl_divergence': np.maximum(kl, 0)
+    }
+
+
+def compare_pairwise(counts):
+    """
+    N x N metric matrices; entry [i, j] compares run i with run j
+    (KL is KL(i || j)).
+    """
+    n = len(counts)
+    if n > MAX_PAIRWISE_RUNS:
+        raise ValidationError(f"At most {MAX_PAIRWISE_RUNS} runs can be compared pairwise")
+    matrix = counts.dense()
+
+    # Hellinger: Bhattacharyya coefficients for every pair in one product
+    roots = np.sqrt(matrix)
+    bhattacharyya = roots @ roots.T
+
+    # KL(i || j) = sum p_i log p_i - sum p_i log p_j, infinite where p_i > 0 = p_j
+    with np.errstate(divide='ignore'):
+        logs = np.log(matrix)
+    support = matrix > 0
+    entropy_term = np.sum(matrix * np.where(support, logs, 0), axis=1)
+    cross = matrix @ np.where(support, logs, 0).T
+    uncovered = support.astype(np.float64) @ (~support).astype(np.float64).T
+    kl = entropy_term[:, None] - cross
+    kl[uncovered > 0] = np.inf
+
+    # TVD = 1 - sum min(p_i, p_j) has no product form: broadcast a block of rows
+    # against the rows from there on, mirroring into the lower triangle
+    tvd = np.empty((n, n))
+    block = max(1, TVD_BLOCK_CELLS // max(1, n * matrix.shape[1]))
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        tvd[start:stop, start:] = 1 - np.minimum(matrix[start:stop, None, :], matrix[None, start:, :]).sum(axis=2)
+        tvd[start:, start:stop] = tvd[start:stop, start:].T
+
+    return {
+        'total_variation_distance': np.clip(tvd, 0, 1),
+        'hellinger_fidelity': np.clip(bhattacharyya, 0, 1) ** 2,
+        'kl_divergence': np.maximum(kl, 0)
+    }
+
+
+def metric_json(values):
+    """JSON-ready nested lists, rounded; infinities become None"""
+    rounded = np.round(values, 12)
+    return np.where(np.isfinite(rounded), rounded, None).tolist()
+
+
+def load_counts(run_ids):
+    """{run_id: (bitstrings, counts)} for the given runs' stored histograms, one query"""
+    rows = db.session.query(SimulationResult.run_id, SimulationResult.measurement_counts)\
+        .filter(SimulationResult.run_id.in_(run_ids), SimulationResult.measurement_counts.isnot(None))\
+        .all()
+    histograms = {}
+    for run_id, stored in rows:
+        arrays = histogram_arrays(stored)
+        if arrays is not None:
+            histograms[run_id] = arrays
+    return histograms
@@ -0,0 +1,120 @@
+"""
+Researcher Identity Cache for QSLRM
+Bounded LRU of researcher display identities (name, email) keyed by
+researcher_id, so serializers resolve names without a query per row.
+Misses are fetched together with one IN (...) query. Entries remember the
+researcher table version they were read at; once the shared version moves
+past it (a write from any process) the whole cache is dropped.
+"""
+
+import threading
+from collections import OrderedDict
+
+from models import db, Researcher
+from utils.cache import ALL_TABLES, on_commit, shared_versions
+
+IDENTITY_CACHE_SIZE = 4096
+
+
+class ResearcherDirectory:
+    """researcher_id -> {'first_name', 'last_name', 'name', 'email'}"""
+
+    def __init__(self, max_entries=IDENTITY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # table_version['researcher'] the oldest cached entry was read at
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+
+    def lookup(self, researcher_ids):
+        """Identities for the given ids (unknown ids are left out), one query for all misses"""
+        found = {}
+        missing = []
+        version = (shared_versions() or {}).get('researcher')
+        with self._lock:
+            if version is not None and self._version is not None and version > self._version:
+                self._entries.clear()
+                self._version = None
+                self.resets += 1
+            for researcher_id in set(researcher_ids):
+                if researcher_id is None:
+                    continue
+                entry = self._entries.get(researcher_id)
+                if entry is None:
+                    missing.append(researcher_id)
+                else:
+                    self._entries.move_to_end(researcher_id)
+                    found[researcher_id] = entry
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            rows = db.session.query(
+                Researcher.researcher_id, Researcher.first_name, Researcher.last_name, Researcher.email
+            ).filter(Researcher.researcher_id.in_(missing)).all()
+            with self._lock:
+                if self._version is None or (version is not None and version < self._version):
+                    self._version = version
+                for researcher_id, first_name, last_name, email in rows:
+                    entry = {
+                        'first_name': first_name,
+                        'last_name': last_name,
+                        'name': f"{first_name} {last_name}",
+                        'email': email
+                    }
+                    self._entries[researcher_id] = entry
+                    found[researcher_id] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return found
+
+    def get(self, researcher_id):
+        """Identity of one researcher, or None"""
+        return self.lookup([researcher_id]).get(researcher_id)
+
+    def name(self, researcher_id):
+        """Display name of one researcher, or None"""
+        entry = self.get(researcher_id)
+        return entry['name'] if entry else None
+
+    def invalidate(self, researcher_id=None):
+        """Forget one researcher, or everyone"""
+        with self._lock:
+            if researcher_id is None:
+                self._entries.clear()
+                self._version = None
+            else:
+                self._entries.pop(researcher_id, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'resets': self.resets,
+                'version': self._version,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0
+            }
+
+
+researcher_directory = ResearcherDirectory()
+
+
+def prime_researchers(rows, attribute='researcher_id'):
+    """Resolve the researchers referenced by rows up front (one query for the misses); returns rows"""
+    researcher_directory.lookup(getattr(row, attribute) for row in rows)
+    return rows
+
+
+@on_commit
+def _forget_raw_writes(changes, versions):
+    # update_researcher / delete_researcher invalidate their own entry;
+    # opaque writes (raw SQL, bulk statements) may have touched anyone
+    if any(table == ALL_TABLES or (table == 'researcher' and key is None) for table, key, _ in changes):
+        researcher_directory.invalidate()
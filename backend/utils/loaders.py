@@ -0,0 +1,141 @@
+"""
+Simulation Listing Loaders for QSLRM
+Eager-loaded queries and keyset (cursor) pagination over quantum_simulation
+"""
+
+import base64
+import json
+
+from sqlalchemy import String, and_, inspect, or_
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.expression import type_coerce
+
+from models import db, QuantumSimulation
+from utils.validators import ValidationError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# execution_date is compared as the raw stored text so that cursors built from
+# rows written by sample_data.sql ('2024-01-20 10:30:00') and by the ORM
+# ('2024-01-20 10:30:00.000000') both round-trip exactly
+_execution_date_text = type_coerce(QuantumSimulation.execution_date, String)
+
+
+def simulation_query(include_details=True):
+    """Base simulation query with result/metadata joined in one SELECT
+    (researcher names come from utils.identity.prime_researchers)"""
+    options = []
+    if include_details:
+        options.append(joinedload(QuantumSimulation.result))
+        options.append(joinedload(QuantumSimulation.repro_metadata))
+    return QuantumSimulation.query.options(*options)
+
+
+def encode_cursor(execution_date, run_id):
+    """Encode an (execution_date, run_id) position as an opaque URL-safe token"""
+    raw = json.dumps([execution_date, run_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a cursor token produced by encode_cursor"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        execution_date, run_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if execution_date is not None and not isinstance(execution_date, str):
+            raise ValueError
+        return execution_date, int(run_id)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid cursor: {token}")
+
+
+def parse_page_size(limit):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _after(execution_date, run_id):
+    """Rows strictly after a cursor in (execution_date DESC, run_id DESC) order"""
+    # SQLite sorts NULL dates last when descending, so they always follow a dated row
+    if execution_date is None:
+        return and_(QuantumSimulation.execution_date.is_(None), QuantumSimulation.run_id < run_id)
+    return or_(
+        _execution_date_text < execution_date,
+        and_(_execution_date_text == execution_date, QuantumSimulation.run_id < run_id),
+        QuantumSimulation.execution_date.is_(None)
+    )
+
+
+def paginate_simulations(query, cursor=None, limit=None):
+    """
+    Fetch one keyset page from a simulation query.
+    Returns (simulations, next_cursor); next_cursor is None on the last page.
+    The ordering is served by idx_simulation_date, which in SQLite already
+    carries run_id (the rowid) as its trailing key.
+    """
+    limit = parse_page_size(limit)
+
+    if cursor:
+        query = query.filter(_after(*decode_cursor(cursor)))
+
+    rows = query.add_columns(_execution_date_text)\
+        .order_by(db.desc(QuantumSimulation.execution_date), db.desc(QuantumSimulation.run_id))\
+        .limit(limit + 1)\
+        .all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    simulations = [sim for sim, _ in rows]
+
+    next_cursor = None
+    if has_more:
+        last_sim, last_date = rows[-1]
+        next_cursor = encode_cursor(last_date, last_sim.run_id)
+
+    return simulations, next_cursor
+
+
+def _release(page, loaded_before):
+    """
+    Drop a page's objects (and their cascaded children) from the shared
+    session, except those the caller had loaded before the page was read
+    """
+    for obj in page:
+        state = inspect(obj)
+        if state.session is not None and state.key not in loaded_before:
+            db.session.expunge(obj)
+
+
+def iter_simulation_pages(query, chunk_size=DEFAULT_PAGE_SIZE):
+    """Walk a simulation query page by page, keeping one page of ORM objects alive"""
+    cursor = None
+    while True:
+        loaded_before = set(db.session.identity_map.keys())
+        simulations, cursor = paginate_simulations(query, cursor=cursor, limit=chunk_size)
+        if simulations:
+            yield simulations
+        # Drop the page from the identity map before loading the next one
+        _release(simulations, loaded_before)
+        if not cursor:
+            break
+
+
+def iter_chunks(query, key_column, chunk_size=DEFAULT_PAGE_SIZE):
+    """Walk any query in ascending primary-key chunks (keyset, no OFFSET)"""
+    last_key = None
+    while True:
+        page_query = query
+        if last_key is not None:
+            page_query = page_query.filter(key_column > last_key)
+        loaded_before = set(db.session.identity_map.keys())
+        page = page_query.order_by(key_column).limit(chunk_size).all()
+        if not page:
+            break
+        last_key = getattr(page[-1], key_column.key)
+        yield page
+        _release(page, loaded_before)
+        if len(page) < chunk_size:
+            break
@@ -0,0 +1,246 @@
+"""
+Access-Log Partitions for QSLRM
+Audit rows live in one SQLite file per month (database/access_log/), ATTACHed
+to a connection only when a query or flush touches that month. Partitions
+past the retention window are compacted into gzip archives and removed.
+"""
+
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import insert, select
+
+from models import db, AccessLog
+from utils.schema import DATABASE_DIR, read_script, table_exists
+
+PARTITION_DIR = DATABASE_DIR / 'access_log'
+ARCHIVE_DIR = PARTITION_DIR / 'archive'
+
+# Months of partitions kept online (0 keeps everything)
+RETENTION_MONTHS = int(os.getenv('ACCESS_LOG_RETENTION_MONTHS', '12'))
+
+# SQLite allows 10 attached databases per connection by default
+MAX_ATTACHED = 8
+
+_PARTITION = re.compile(r'^access_log_(\d{4})_(\d{2})$')
+_log = AccessLog.__table__
+
+
+def month_of(moment):
+    return (moment.year, moment.month)
+
+
+def partition_name(month):
+    """Schema / file stem of a (year, month) partition"""
+    return f"access_log_{month[0]:04d}_{month[1]:02d}"
+
+
+def partition_path(month):
+    return PARTITION_DIR / f"{partition_name(month)}.db"
+
+
+def list_partitions():
+    """(year, month) of every online partition, oldest first"""
+    if not PARTITION_DIR.exists():
+        return []
+    months = []
+    for path in PARTITION_DIR.glob('access_log_*.db'):
+        match = _PARTITION.match(path.stem)
+        if match:
+            months.append((int(match.group(1)), int(match.group(2))))
+    return sorted(months)
+
+
+def ensure_partition(month):
+    """Create a month's partition file if needed; returns whether it was created"""
+    path = partition_path(month)
+    if path.exists():
+        return False
+    PARTITION_DIR.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(read_script('access_log_partition.sql'))
+    finally:
+        connection.close()
+    return True
+
+
+def attach(connection, months):
+    """
+    ATTACH the given months' partitions to a SQLAlchemy connection, detaching
+    others when the attach limit would be exceeded. Must run outside a write
+    transaction (SQLite refuses ATTACH/DETACH inside one). Returns the schema
+    names of the partitions that exist.
+    """
+    wanted = [partition_name(m) for m in months if partition_path(m).exists()]
+    if len(wanted) > MAX_ATTACHED:
+        raise ValueError(f"Cannot attach {len(wanted)} partitions at once (limit {MAX_ATTACHED})")
+
+    attached = [row[1] for row in connection.exec_driver_sql("PRAGMA database_list") if _PARTITION.match(row[1])]
+    missing = [name for name in wanted if name not in attached]
+    spare = [name for name in attached if name not in wanted]
+    while spare and len(attached) + len(missing) > MAX_ATTACHED:
+        name = spare.pop()
+        connection.exec_driver_sql(f"DETACH DATABASE {name}")
+        attached.remove(name)
+
+    for name in missing:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {name}", (str(PARTITION_DIR / f"{name}.db"),))
+    return wanted
+
+
+def prepare_partitions(connection, rows):
+    """Create and attach the partitions a batch of row dicts will be written to;
+    returns the months whose partition was created"""
+    months = sorted({month_of(row['timestamp']) for row in rows})
+    created = [month for month in months if ensure_partition(month)]
+    attach(connection, months)
+    return created
+
+
+def insert_rows(connection, rows):
+    """Insert AccessLog row dicts into their monthly partitions (executemany per month)"""
+    by_month = defaultdict(list)
+    for row in rows:
+        by_month[month_of(row['timestamp'])].append(row)
+    for month, month_rows in by_month.items():
+        connection.execute(
+            insert(_log), month_rows,
+            execution_options={'schema_translate_map': {None: partition_name(month)}}
+        )
+
+
+def recent_logs(limit):
+    """
+    The newest access-log rows (Core rows with AccessLog's columns), walking
+    partitions newest-first and stopping once limit rows are found. Rows still
+    in the main database's access_log (before migration) are merged in.
+    """
+    newest_first = select(_log).order_by(_log.c.timestamp.desc())
+    rows = db.session.execute(newest_first.limit(limit)).all()
+
+    connection = db.session.connection()
+    found = 0
+    for month in reversed(list_partitions()):
+        if found >= limit:
+            break
+        for schema in attach(connection, [month]):
+            partition_rows = db.session.execute(
+                newest_first.limit(limit - found),
+                execution_options={'schema_translate_map': {None: schema}}
+            ).all()
+            rows.extend(partition_rows)
+            found += len(partition_rows)
+
+    rows.sort(key=lambda row: row.timestamp or datetime.min, reverse=True)
+    return rows[:limit]
+
+
+def expired_partitions(now=None):
+    """Online partitions older than the retention window"""
+    if RETENTION_MONTHS <= 0:
+        return []
+    year, month = month_of(now or datetime.utcnow())
+    oldest_kept = year * 12 + month - 1 - (RETENTION_MONTHS - 1)
+    return [m for m in list_partitions() if m[0] * 12 + m[1] - 1 < oldest_kept]
+
+
+def archive_partition(month):
+    """Compact a partition (VACUUM INTO), gzip it into archive/ and remove it; returns the archive path"""
+    path = partition_path(month)
+    compacted = path.with_suffix('.compact')
+    archive = ARCHIVE_DIR / f"{partition_name(month)}.db.gz"
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("VACUUM INTO ?", (str(compacted),))
+    finally:
+        connection.close()
+
+    with open(compacted, 'rb') as source, gzip.open(archive, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    compacted.unlink()
+    path.unlink()
+    return archive
+
+
+def apply_retention(now=None, engine=None):
+    """Archive every partition past the retention window; returns the archived months"""
+    expired = expired_partitions(now)
+    if expired:
+        # Drop idle pooled connections so no attached handle keeps the files open
+        (engine or db.engine).dispose()
+    for month in expired:
+        archive_partition(month)
+    return expired
+
+
+def migrate_main_log(chunk_size=10000):
+    """Move rows from the main database's access_log into partitions, a month
+    at a time; returns the number moved"""
+    if not table_exists('access_log'):
+        return 0
+    columns = [c for c in _log.columns if c.name != 'log_id']
+    moved = 0
+    with db.engine.connect() as connection:
+        months = sorted({
+            month_of(row.timestamp)
+            for row in connection.execute(select(_log.c.timestamp).where(_log.c.timestamp.isnot(None)).distinct())
+        })
+        for year, month in months:
+            start = datetime(year, month, 1)
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+            while True:
+                chunk = connection.execute(
+                    select(_log).where(_log.c.timestamp >= start, _log.c.timestamp < end)
+                    .order_by(_log.c.log_id).limit(chunk_size)
+                ).all()
+                if not chunk:
+                    break
+                rows = [{c.name: getattr(row, c.name) for c in columns} for row in chunk]
+                prepare_partitions(connection, rows)
+                connection.commit()
+                insert_rows(connection, rows)
+                connection.execute(_log.delete().where(_log.c.log_id.in_([row.log_id for row in chunk])))
+                connection.commit()
+                moved += len(chunk)
+    return moved
+
+
+audit_cli = AppGroup('audit', help='Maintain the access-log audit tables.')
+
+
+@audit_cli.command('partitions')
+def partitions_command():
+    """List online partitions and archives."""
+    for month in list_partitions():
+        path = partition_path(month)
+        click.echo(f"{path.name:<28}{path.stat().st_size:>14,} bytes")
+    if ARCHIVE_DIR.exists():
+        for path in sorted(ARCHIVE_DIR.glob('*.db.gz')):
+            click.echo(f"archive/{path.name:<20}{path.stat().st_size:>14,} bytes")
+
+
+@audit_cli.command('retention')
+def retention_command():
+    """Archive partitions older than ACCESS_LOG_RETENTION_MONTHS."""
+    archived = apply_retention()
+    for month in archived:
+        click.echo(f"Archived {partition_name(month)}")
+    click.echo(f"{len(archived)} partition(s) archived, retention {RETENTION_MONTHS or 'unlimited'} months")
+
+
+@audit_cli.command('migrate')
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows moved per transaction.')
+def migrate_command(chunk_size):
+    """Move access_log rows from the main database into monthly partitions."""
+    moved = migrate_main_log(chunk_size)
+    click.echo(f"Moved {moved} row(s) into {len(list_partitions())} partition(s)")
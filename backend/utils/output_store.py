@@ -0,0 +1,222 @@
+"""
+Output Blob Store for QSLRM
+Simulation output payloads are serialized to canonical JSON, keyed by the
+SHA-256 of those bytes and kept compressed in output_blob
+(database/output_blobs.sql). simulation_result rows hold only the digest,
+so repeated runs producing the same output share one stored copy.
+"""
+
+import ast
+import hashlib
+import json
+import lzma
+import zlib
+
+import click
+from sqlalchemy import bindparam, func, inspect, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import db, OutputBlob, SimulationResult
+from utils.counts_encoding import results_cli
+from utils.schema import apply_script, table_exists
+
+# Payloads from this size up are worth lzma's slower, tighter compression
+LZMA_THRESHOLD = 256 * 1024
+ZLIB_LEVEL = 6
+
+# Unreferenced blobs younger than this are left to garbage collection's next pass
+OUTPUT_GC_GRACE_SECONDS = 3600
+
+_blobs = OutputBlob.__table__
+
+
+def ensure_output_store():
+    """Add simulation_result.output_digest to older databases and install output_blob"""
+    if not table_exists('simulation_result'):
+        return False
+
+    columns = {column['name'] for column in inspect(db.engine).get_columns('simulation_result')}
+    if 'output_digest' not in columns:
+        with db.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE simulation_result ADD COLUMN output_digest TEXT"))
+    apply_script('output_blobs.sql')
+    return True
+
+
+def canonical_payload(output):
+    """Canonical JSON bytes of an output payload (sorted keys, no whitespace)"""
+    return json.dumps(output, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def compress_payload(raw):
+    """(codec, data) with the smallest encoding among the one tried and raw"""
+    if len(raw) >= LZMA_THRESHOLD:
+        codec, data = 'lzma', lzma.compress(raw, preset=6)
+    else:
+        codec, data = 'zlib', zlib.compress(raw, ZLIB_LEVEL)
+    if len(data) >= len(raw):
+        return 'raw', raw
+    return codec, data
+
+
+def decompress_payload(codec, data):
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'lzma':
+        return lzma.decompress(data)
+    return bytes(data)
+
+
+def put_outputs(outputs):
+    """
+    Store payloads in the current transaction and return their digests, in
+    order. Payloads already present are not compressed again, but every
+    digest is still inserted (ON CONFLICT DO NOTHING): the insert takes the
+    write lock, so garbage collection cannot delete a blob between the check
+    and the commit of the rows that reference it. A blob removed in between
+    comes back stored raw.
+    """
+    raws = [canonical_payload(output) for output in outputs]
+    digests = [hashlib.sha256(raw).hexdigest() for raw in raws]
+    wanted = dict(zip(digests, raws))
+    if not wanted:
+        return digests
+
+    present = set(db.session.scalars(select(OutputBlob.digest).where(OutputBlob.digest.in_(list(wanted)))))
+    rows = []
+    for digest, raw in wanted.items():
+        codec, data = ('raw', raw) if digest in present else compress_payload(raw)
+        rows.append({'digest': digest, 'codec': codec, 'size': len(raw), 'stored_size': len(data), 'data': data})
+    db.session.execute(sqlite_insert(_blobs).on_conflict_do_nothing(index_elements=['digest']), rows)
+    return digests
+
+
+def put_output(output):
+    """Store one payload; returns its digest"""
+    return put_outputs([output])[0]
+
+
+def get_output(digest):
+    """The decoded payload stored under a digest, or None"""
+    blob = db.session.execute(
+        select(OutputBlob.codec, OutputBlob.data).where(OutputBlob.digest == digest)
+    ).first()
+    if blob is None:
+        return None
+    return json.loads(decompress_payload(blob.codec, blob.data))
+
+
+def _unreferenced():
+    return OutputBlob.digest.notin_(
+        select(SimulationResult.output_digest).where(SimulationResult.output_digest.isnot(None))
+    )
+
+
+def collect_garbage(grace_seconds=OUTPUT_GC_GRACE_SECONDS):
+    """
+    Delete blobs no result references and that are older than grace_seconds
+    (a writer may store a blob before the row that references it); returns
+    (blobs, stored bytes) removed
+    """
+    cutoff = func.datetime('now', f'-{max(0, int(grace_seconds))} seconds')
+    orphans = _unreferenced() & (OutputBlob.created_at.is_(None) | (OutputBlob.created_at < cutoff))
+    count, stored = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(OutputBlob.stored_size), 0)).where(orphans)
+    ).one()
+    if count:
+        db.session.execute(_blobs.delete().where(orphans))
+    db.session.commit()
+    return count, stored
+
+
+def output_store_stats():
+    """Blob counts, sizes and the dedup / compression ratios"""
+    blobs, unique_bytes, stored_bytes = db.session.execute(select(
+        func.count(),
+        func.coalesce(func.sum(OutputBlob.size), 0),
+        func.coalesce(func.sum(OutputBlob.stored_size), 0)
+    )).one()
+    references, logical_bytes = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(OutputBlob.size), 0))
+        .select_from(SimulationResult)
+        .join(OutputBlob, OutputBlob.digest == SimulationResult.output_digest)
+    ).one()
+    by_codec = dict(db.session.execute(
+        select(OutputBlob.codec, func.count()).group_by(OutputBlob.codec)
+    ).all())
+    return {
+        'blobs': blobs,
+        'references': references,
+        'unreferenced': db.session.scalar(select(func.count()).where(_unreferenced())),
+        'logical_bytes': logical_bytes,
+        'unique_bytes': unique_bytes,
+        'stored_bytes': stored_bytes,
+        'dedup_ratio': round(logical_bytes / unique_bytes, 3) if unique_bytes else 0,
+        'compression_ratio': round(unique_bytes / stored_bytes, 3) if stored_bytes else 0,
+        'codecs': by_codec
+    }
+
+
+def legacy_payload(output_data):
+    """Best reading of an inline output_data value: JSON, else the Python repr
+    save_results used to store, else the text itself; None when empty"""
+    if not output_data:
+        return None
+    try:
+        return json.loads(output_data)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(output_data)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return output_data
+
+
+def migrate_inline_outputs(chunk_size=500):
+    """Move legacy simulation_result.output_data text into the blob store; returns rows moved"""
+    results = SimulationResult.__table__
+    moved = 0
+    while True:
+        rows = db.session.execute(
+            select(results.c.result_id, results.c.output_data)
+            .where(results.c.output_data.isnot(None), results.c.output_digest.is_(None))
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        payloads = [legacy_payload(output_data) for _, output_data in rows]
+        stored = [i for i, payload in enumerate(payloads) if payload is not None]
+        digests = dict(zip(stored, put_outputs([payloads[i] for i in stored])))
+        db.session.execute(
+            results.update()
+            .where(results.c.result_id == bindparam('rid'))
+            .values(output_digest=bindparam('digest'), output_data=None),
+            [{'rid': result_id, 'digest': digests.get(i)} for i, (result_id, _) in enumerate(rows)]
+        )
+        db.session.commit()
+        moved += len(stored)
+    return moved
+
+
+@results_cli.command('gc-outputs')
+@click.option('--grace', default=OUTPUT_GC_GRACE_SECONDS, show_default=True,
+              help='Keep unreferenced blobs younger than this many seconds.')
+def gc_outputs_command(grace):
+    """Delete output blobs that no result references."""
+    count, stored = collect_garbage(grace)
+    click.echo(f"Removed {count} unreferenced blob(s), {stored:,} bytes")
+
+
+@results_cli.command('output-stats')
+def output_stats_command():
+    """Show output blob store size and dedup ratio."""
+    for key, value in output_store_stats().items():
+        click.echo(f"{key:<20}{value}")
+
+
+@results_cli.command('migrate-outputs')
+@click.option('--chunk-size', default=500, show_default=True, help='Results moved per transaction.')
+def migrate_outputs_command(chunk_size):
+    """Move inline output_data text into the blob store."""
+    moved = migrate_inline_outputs(chunk_size)
+    click.echo(f"Moved {moved} output payload(s) into output_blob")
@@ -0,0 +1,117 @@
+"""
+Typed Parameter Index for QSLRM
+parameter_index (database/parameter_index.sql) shadows every parameter row
+with its value parsed into numeric / boolean / string columns, so
+"runs where shots >= 1000 and noise_model = depolarizing" becomes one index
+range scan per parameter and an INTERSECT of their run_ids.
+"""
+
+import re
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import intersect, select, text
+
+from models import db, ParameterIndex
+from utils.schema import apply_script, table_exists
+from utils.validators import ValidationError
+
+# Predicates per request; each one is an index range scan
+MAX_PREDICATES = 10
+
+PREDICATE_OPERATORS = {
+    'eq': lambda column, value: column == value,
+    'ne': lambda column, value: column != value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value
+}
+RANGE_OPERATORS = ('lt', 'lte', 'gt', 'gte')
+
+# Same spellings the view maps to bool_value (except 1/0, which stay numeric here)
+BOOLEAN_VALUES = {'true': 1, 'yes': 1, 'on': 1, 'false': 0, 'no': 0, 'off': 0}
+
+_NUMBER = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+
+def ensure_parameter_index():
+    """Install the shadow table and its triggers; backfill it when new"""
+    if not table_exists('parameter'):
+        return False
+
+    created = not table_exists('parameter_index')
+    apply_script('parameter_index.sql')
+    if created:
+        rebuild_parameter_index()
+    return True
+
+
+def rebuild_parameter_index():
+    """Re-derive every typed row from parameter; returns the row count"""
+    db.session.execute(text("DELETE FROM parameter_index"))
+    db.session.execute(text("INSERT INTO parameter_index SELECT * FROM vw_parameter_typed"))
+    db.session.commit()
+    return db.session.execute(text("SELECT COUNT(*) FROM parameter_index")).scalar()
+
+
+def typed_value(raw, operator):
+    """(column, value) a predicate value is compared through: numbers against
+    numeric_value, true/false words against bool_value, anything else as text"""
+    value = raw.strip()
+    if _NUMBER.match(value):
+        return ParameterIndex.numeric_value, float(value)
+    if operator in RANGE_OPERATORS:
+        raise ValidationError(f"Range predicate needs a numeric value, got: {raw}")
+    if value.lower() in BOOLEAN_VALUES:
+        return ParameterIndex.bool_value, BOOLEAN_VALUES[value.lower()]
+    return ParameterIndex.string_value, raw
+
+
+def parse_predicates(specs):
+    """
+    Parse 'name:op:value' strings (op one of eq, ne, lt, lte, gt, gte) into
+    {parameter_name: [condition, ...]}. Conditions on the same parameter are
+    kept together so a range (gte + lt) is one index scan.
+    """
+    if not specs:
+        raise ValidationError("At least one param=name:op:value predicate is required")
+    if len(specs) > MAX_PREDICATES:
+        raise ValidationError(f"At most {MAX_PREDICATES} parameter predicates are allowed")
+
+    predicates = {}
+    for spec in specs:
+        name, _, rest = spec.partition(':')
+        operator, _, raw = rest.partition(':')
+        if not name or not raw:
+            raise ValidationError(f"Invalid predicate '{spec}', expected name:op:value")
+        if operator not in PREDICATE_OPERATORS:
+            raise ValidationError(
+                f"Invalid operator '{operator}'. Must be one of: {', '.join(PREDICATE_OPERATORS)}"
+            )
+        column, value = typed_value(raw, operator)
+        predicates.setdefault(name, []).append(PREDICATE_OPERATORS[operator](column, value))
+    return predicates
+
+
+def matching_run_ids(predicates):
+    """Select of the run_ids satisfying every parameter's conditions
+    (one covering-index scan per parameter, INTERSECTed)"""
+    selects = [
+        select(ParameterIndex.run_id).where(ParameterIndex.parameter_name == name, *conditions)
+        for name, conditions in predicates.items()
+    ]
+    if len(selects) == 1:
+        return selects[0]
+    return select(intersect(*selects).subquery().c.run_id)
+
+
+parameters_cli = AppGroup('parameters', help='Maintain the typed parameter index.')
+
+
+@parameters_cli.command('rebuild')
+def rebuild_command():
+    """Re-derive parameter_index from the parameter table."""
+    ensure_parameter_index()
+    rows = rebuild_parameter_index()
+    click.echo(f"Rebuilt parameter_index: {rows} rows")
@@ -0,0 +1,71 @@
+"""
+Result Recording for QSLRM
+The one place simulation_result rows are written from a results payload:
+POST/PUT /api/simulations/<id>/results and the local job runner both go
+through save_result.
+"""
+
+import base64
+
+from models import db, SimulationResult
+from utils.counts_encoding import decode_arrays, store_counts
+from utils.distributions import parse_counts
+from utils.output_store import put_output
+from utils.validators import ValidationError
+
+# Result fields that must lie in [0, 1]
+UNIT_INTERVAL_FIELDS = ('success_probability', 'fidelity', 'error_rate')
+
+
+def measurement_counts_column(data):
+    """Column value for the payload's counts: a JSON histogram or a base64 binary blob, stored packed"""
+    if data.get('measurement_counts') is not None:
+        return store_counts(parse_counts(data['measurement_counts']))
+    if data.get('measurement_counts_binary') is not None:
+        try:
+            blob = base64.b64decode(data['measurement_counts_binary'], validate=True)
+        except (TypeError, ValueError):
+            raise ValidationError("measurement_counts_binary must be base64")
+        decode_arrays(blob)
+        return blob
+    return None
+
+
+def save_result(simulation, data):
+    """
+    Create or update the run's result from a results payload and mark a
+    running simulation completed, in the current transaction (the caller
+    commits). Returns (result, created); raises ValidationError on bad values.
+    """
+    for field in UNIT_INTERVAL_FIELDS:
+        if data.get(field) is not None and not (0 <= data[field] <= 1):
+            raise ValidationError(f"{field} must be between 0 and 1")
+    measurement_counts = measurement_counts_column(data)
+
+    result = simulation.result
+    created = result is None
+    if not created:
+        for field in ('execution_time_seconds', 'energy_value') + UNIT_INTERVAL_FIELDS:
+            if field in data:
+                setattr(result, field, data[field])
+        if 'output_data' in data:
+            result.output_digest = put_output(data['output_data']) if data['output_data'] is not None else None
+            result.output_data = None
+        if 'measurement_counts' in data or 'measurement_counts_binary' in data:
+            result.measurement_counts = measurement_counts
+    else:
+        result = SimulationResult(
+            run_id=simulation.run_id,
+            execution_time_seconds=data.get('execution_time_seconds'),
+            success_probability=data.get('success_probability'),
+            fidelity=data.get('fidelity'),
+            energy_value=data.get('energy_value'),
+            error_rate=data.get('error_rate'),
+            output_digest=put_output(data['output_data']) if data.get('output_data') is not None else None,
+            measurement_counts=measurement_counts
+        )
+        db.session.add(result)
+
+    if simulation.status == 'running':
+        simulation.status = 'completed'
+    return result, created
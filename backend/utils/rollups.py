@@ -0,0 +1,145 @@
+"""
+Analytics Rollup Maintenance for QSLRM
+simulation_rollup and simulation_trend_rollup are kept current by the
+triggers in database/rollups.sql; this module installs them, rebuilds the
+tables and checks them against the base tables
+"""
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import text
+
+from models import db
+from utils.schema import apply_script, table_exists
+
+ROLLUP_KEY = ('framework', 'algorithm_type', 'num_qubits', 'researcher_id')
+ROLLUP_VALUES = (
+    'run_count', 'fidelity_sum', 'fidelity_count', 'success_sum', 'success_count',
+    'time_sum', 'time_count', 'repro_sum', 'repro_count'
+)
+
+# The full-scan aggregate the triggers maintain incrementally
+ROLLUP_SOURCE_SQL = """
+    SELECT
+        qs.framework,
+        COALESCE(qs.algorithm_type, '') AS algorithm_type,
+        qs.num_qubits,
+        qs.researcher_id,
+        COUNT(*) AS run_count,
+        COALESCE(SUM(sr.fidelity), 0) AS fidelity_sum,
+        COUNT(sr.fidelity) AS fidelity_count,
+        COALESCE(SUM(sr.success_probability), 0) AS success_sum,
+        COUNT(sr.success_probability) AS success_count,
+        COALESCE(SUM(sr.execution_time_seconds), 0) AS time_sum,
+        COUNT(sr.execution_time_seconds) AS time_count,
+        COALESCE(SUM(rm.reproducibility_score), 0) AS repro_sum,
+        COUNT(rm.reproducibility_score) AS repro_count
+    FROM quantum_simulation qs
+    LEFT JOIN simulation_result sr ON sr.run_id = qs.run_id
+    LEFT JOIN reproducibility_metadata rm ON rm.run_id = qs.run_id
+    GROUP BY qs.framework, COALESCE(qs.algorithm_type, ''), qs.num_qubits, qs.researcher_id
+"""
+
+TREND_RESOLUTIONS = ('hour', 'day', 'week')
+TREND_KEY = ('resolution', 'bucket')
+TREND_VALUES = ('run_count', 'fidelity_sum', 'fidelity_count', 'repro_sum', 'repro_count')
+
+TREND_SOURCE_SQL = """
+    SELECT
+        b.resolution,
+        b.bucket,
+        COUNT(*) AS run_count,
+        COALESCE(SUM(sr.fidelity), 0) AS fidelity_sum,
+        COUNT(sr.fidelity) AS fidelity_count,
+        COALESCE(SUM(rm.reproducibility_score), 0) AS repro_sum,
+        COUNT(rm.reproducibility_score) AS repro_count
+    FROM vw_simulation_trend_bucket b
+    LEFT JOIN simulation_result sr ON sr.run_id = b.run_id
+    LEFT JOIN reproducibility_metadata rm ON rm.run_id = b.run_id
+    WHERE b.bucket IS NOT NULL
+    GROUP BY b.resolution, b.bucket
+"""
+
+# rollup table -> (key columns, value columns, source aggregate)
+ROLLUP_TABLES = {
+    'simulation_rollup': (ROLLUP_KEY, ROLLUP_VALUES, ROLLUP_SOURCE_SQL),
+    'simulation_trend_rollup': (TREND_KEY, TREND_VALUES, TREND_SOURCE_SQL)
+}
+
+
+def ensure_rollups():
+    """Install the rollup tables and triggers; backfill the tables that are new"""
+    if not table_exists('quantum_simulation'):
+        return False
+    
+    created = [table for table in ROLLUP_TABLES if not table_exists(table)]
+    apply_script('rollups.sql')
+    for table in created:
+        rebuild_rollups(table)
+    return True
+
+
+def rebuild_rollups(table='simulation_rollup'):
+    """Recompute a rollup table from scratch, returns the number of groups"""
+    key, values, source_sql = ROLLUP_TABLES[table]
+    db.session.execute(text(f"DELETE FROM {table}"))
+    db.session.execute(text(f"INSERT INTO {table} ({', '.join(key + values)}) {source_sql}"))
+    db.session.commit()
+    return db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def verify_rollups(table='simulation_rollup', tolerance=1e-6):
+    """Compare a rollup table to a fresh aggregate; returns a list of mismatched groups"""
+    key_columns, value_columns, source_sql = ROLLUP_TABLES[table]
+    width = len(key_columns)
+    expected = {tuple(row[:width]): row[width:] for row in db.session.execute(text(source_sql))}
+    actual = {
+        tuple(row[:width]): row[width:]
+        for row in db.session.execute(text(
+            f"SELECT {', '.join(key_columns + value_columns)} FROM {table}"
+        ))
+    }
+    
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        want = expected.get(key)
+        have = actual.get(key)
+        if want is None or have is None or any(
+            abs((w or 0) - (h or 0)) > tolerance * max(1.0, abs(w or 0))
+            for w, h in zip(want, have)
+        ):
+            mismatches.append({
+                'group': dict(zip(key_columns, key)),
+                'expected': dict(zip(value_columns, want)) if want else None,
+                'actual': dict(zip(value_columns, have)) if have else None
+            })
+    return mismatches
+
+
+rollups_cli = AppGroup('rollups', help='Maintain the analytics rollup tables.')
+
+
+@rollups_cli.command('rebuild')
+def rebuild_command():
+    """Recompute the rollups from the base tables and verify them."""
+    ensure_rollups()
+    for table in ROLLUP_TABLES:
+        groups = rebuild_rollups(table)
+        click.echo(f"Rebuilt {table}: {groups} groups")
+    verify_command.callback()
+
+
+@rollups_cli.command('verify')
+def verify_command():
+    """Check the rollups against the base tables."""
+    stale = 0
+    for table in ROLLUP_TABLES:
+        mismatches = verify_rollups(table)
+        for mismatch in mismatches:
+            click.echo(f"Mismatch in {table}: {mismatch}")
+        if mismatches:
+            stale += len(mismatches)
+        else:
+            click.echo(f"{table} is consistent")
+    if stale:
+        raise click.ClickException(f"{stale} rollup group(s) out of date")
@@ -0,0 +1,436 @@
+"""
+Local Simulation Runner for QSLRM
+Executes pending runs on this machine. A run opts in with an 'executor'
+parameter naming a registered executor; the scheduler claims it
+(pending -> running), runs it in a ProcessPoolExecutor worker and records
+the returned payload through utils/results.save_result, as if it had been
+POSTed to /api/simulations/<id>/results.
+
+Scheduling is round-robin across researchers (whoever has the fewest jobs
+in flight goes next) under two caps: one job per worker process, and a
+total estimated cost (num_qubits x circuit_depth) of the jobs in flight.
+
+Executors are module-level functions executor(spec, checkpoint) -> payload.
+checkpoint() raises once the run has been cancelled or has run past its
+timeout; an executor that stops calling it is killed after a grace period.
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, update
+
+from models import db, Parameter, QuantumSimulation, ReproducibilityMetadata
+from utils.results import save_result
+
+RUNNER_WORKERS = int(os.getenv('RUNNER_WORKERS', str(os.cpu_count() or 1)))
+
+# Estimated-cost units (num_qubits x circuit_depth) allowed in flight per worker
+RUNNER_COST_PER_WORKER = int(os.getenv('RUNNER_COST_PER_WORKER', '4096'))
+
+RUNNER_JOB_TIMEOUT = float(os.getenv('RUNNER_JOB_TIMEOUT', '3600'))
+RUNNER_POLL_INTERVAL = 1.0
+
+# Seconds a job may ignore its cancellation or timeout before its worker is killed
+KILL_GRACE = 10.0
+
+# Times a run goes back to pending after its worker died under it (crash,
+# OOM killer, another job's kill) before it is marked failed
+MAX_REQUEUES = 3
+
+# Pending runs considered per scheduling pass
+CANDIDATE_LIMIT = 500
+
+EXECUTORS = {}
+
+
+def register_executor(name):
+    """Decorator: make a module-level function available as executor `name`"""
+    def decorator(fn):
+        EXECUTORS[name] = fn
+        return fn
+    return decorator
+
+
+def estimated_cost(num_qubits, circuit_depth):
+    return max(1, num_qubits or 1) * max(1, circuit_depth or 1)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobTimeout(Exception):
+    pass
+
+
+# Worker-process side. Each in-flight job owns a slot of a shared array;
+# the scheduler cancels it by writing the job's run_id into that slot.
+_cancel_slots = None
+_started = None
+
+
+def _init_worker(cancel_slots, started):
+    global _cancel_slots, _started
+    _cancel_slots = cancel_slots
+    _started = started
+
+
+def _execute(executor, spec, slot, timeout):
+    """Run one job in a pool worker; returns (payload, seconds)"""
+    run_id = spec['run_id']
+    _started.put((run_id, os.getpid()))
+    deadline = time.monotonic() + timeout
+
+    def checkpoint():
+        if _cancel_slots[slot] == run_id:
+            raise JobCancelled(f"Run {run_id} was cancelled")
+        if time.monotonic() > deadline:
+            raise JobTimeout(f"Run {run_id} exceeded its {timeout:g}s timeout")
+
+    started = time.perf_counter()
+    payload = executor(spec, checkpoint)
+    return payload, time.perf_counter() - started
+
+
+def _ran_to_end(future):
+    """Whether a job returned or failed on its own, rather than being stopped or killed"""
+    if not future.done() or future.cancelled():
+        return False
+    return not isinstance(future.exception(), (JobCancelled, BrokenProcessPool))
+
+
+class Job:
+    def __init__(self, simulation, spec, executor, timeout, slot):
+        self.run_id = simulation.run_id
+        self.researcher_id = simulation.researcher_id
+        self.cost = estimated_cost(simulation.num_qubits, simulation.circuit_depth)
+        self.spec = spec
+        self.executor = executor
+        self.timeout = timeout
+        self.slot = slot
+        self.future = None
+        self.pool = None
+        self.pid = None
+        self.deadline = None
+        self.kill_at = None
+        self.cancelled = False
+
+
+class JobRunner:
+    """Claims pending runs, keeps the pool busy within its caps and records outcomes"""
+
+    def __init__(self, workers=RUNNER_WORKERS, cost_budget=None, default_timeout=RUNNER_JOB_TIMEOUT,
+                 poll_interval=RUNNER_POLL_INTERVAL, executors=None, log=print):
+        self.workers = max(1, workers)
+        self.cost_budget = cost_budget or self.workers * RUNNER_COST_PER_WORKER
+        self.default_timeout = default_timeout
+        self.poll_interval = poll_interval
+        self.executors = dict(EXECUTORS if executors is None else executors)
+        self.log = log
+        self._context = multiprocessing.get_context(os.getenv('RUNNER_START_METHOD', 'spawn'))
+        self._cancel_slots = self._context.Array('q', self.workers, lock=False)
+        self._started = self._context.SimpleQueue()
+        self._pool = None
+        self._jobs = {}
+        self._requeues = defaultdict(int)
+        self.stats = defaultdict(int)
+
+    # -- pool -----------------------------------------------------------------
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._cancel_slots, self._started)
+        )
+
+    def _free_slot(self):
+        used = {job.slot for job in self._jobs.values()}
+        return next(slot for slot in range(self.workers) if slot not in used)
+
+    def _cost_in_flight(self):
+        return sum(job.cost for job in self._jobs.values())
+
+    # -- scheduling -----------------------------------------------------------
+
+    def _candidates(self):
+        """Oldest pending runs that name a known executor, queued per researcher"""
+        rows = db.session.execute(
+            select(QuantumSimulation, Parameter.parameter_value)
+            .join(Parameter, Parameter.run_id == QuantumSimulation.run_id)
+            .where(
+                QuantumSimulation.status == 'pending',
+                Parameter.parameter_name == 'executor',
+                Parameter.parameter_value.in_(list(self.executors))
+            )
+            .order_by(QuantumSimulation.created_at, QuantumSimulation.run_id)
+            .limit(CANDIDATE_LIMIT)
+        ).all()
+        queues = defaultdict(deque)
+        for simulation, executor in rows:
+            queues[simulation.researcher_id].append((simulation, executor))
+        return queues
+
+    def _pick(self, queues, running_by_researcher):
+        """
+        Next (simulation, executor) to start: from the researcher with the fewest
+        jobs in flight, their oldest run that fits the remaining cost budget.
+        A run costing more than the whole budget only starts on an idle runner.
+        """
+        remaining = self.cost_budget - self._cost_in_flight()
+        for researcher_id in sorted(queues, key=lambda r: (running_by_researcher[r], queues[r][0][0].created_at or datetime.min)):
+            for simulation, executor in queues[researcher_id]:
+                cost = estimated_cost(simulation.num_qubits, simulation.circuit_depth)
+                if cost <= remaining or not self._jobs:
+                    queues[researcher_id].remove((simulation, executor))
+                    if not queues[researcher_id]:
+                        del queues[researcher_id]
+                    return simulation, executor
+        return None
+
+    def _claim(self, run_id):
+        """pending -> running, unless another runner or a client got there first"""
+        claimed = db.session.execute(
+            update(QuantumSimulation)
+            .where(QuantumSimulation.run_id == run_id, QuantumSimulation.status == 'pending')
+            .values(status='running', execution_date=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        return claimed == 1
+
+    def _spec(self, simulation):
+        parameters = {p.parameter_name: p.parameter_value for p in simulation.parameters}
+        seed = db.session.scalar(
+            select(ReproducibilityMetadata.random_seed).where(ReproducibilityMetadata.run_id == simulation.run_id)
+        )
+        return {
+            'run_id': simulation.run_id,
+            'framework': simulation.framework,
+            'num_qubits': simulation.num_qubits,
+            'circuit_depth': simulation.circuit_depth,
+            'algorithm_type': simulation.algorithm_type,
+            'parameters': parameters,
+            'random_seed': seed
+        }
+
+    def _timeout(self, spec):
+        try:
+            timeout = float(spec['parameters'].get('timeout_seconds', self.default_timeout))
+        except (TypeError, ValueError):
+            timeout = self.default_timeout
+        return timeout if timeout > 0 else self.default_timeout
+
+    def _schedule(self):
+        """Start runs until the pool or the cost budget is full"""
+        if len(self._jobs) >= self.workers:
+            return
+        queues = self._candidates()
+        running_by_researcher = defaultdict(int)
+        for job in self._jobs.values():
+            running_by_researcher[job.researcher_id] += 1
+
+        while queues and len(self._jobs) < self.workers:
+            picked = self._pick(queues, running_by_researcher)
+            if picked is None:
+                break
+            simulation, executor_name = picked
+            if not self._claim(simulation.run_id):
+                continue
+            spec = self._spec(simulation)
+            job = Job(simulation, spec, self.executors[executor_name], self._timeout(spec), self._free_slot())
+            self._cancel_slots[job.slot] = 0
+            job.pool = self._pool
+            job.future = self._pool.submit(_execute, job.executor, spec, job.slot, job.timeout)
+            job.deadline = time.monotonic() + job.timeout
+            self._jobs[job.run_id] = job
+            running_by_researcher[job.researcher_id] += 1
+            self.stats['started'] += 1
+            self.log(f"▶️  run {job.run_id} ({executor_name}, cost {job.cost}) started")
+
+    # -- supervision ----------------------------------------------------------
+
+    def _drain_started(self):
+        while not self._started.empty():
+            run_id, pid = self._started.get()
+            if run_id in self._jobs:
+                self._jobs[run_id].pid = pid
+
+    def _supervise(self):
+        """Signal cancelled runs, and kill workers whose job ignored cancellation or its timeout"""
+        if not self._jobs:
+            return
+        self._drain_started()
+        cancelled = set(db.session.scalars(
+            select(QuantumSimulation.run_id)
+            .where(QuantumSimulation.run_id.in_(list(self._jobs)), QuantumSimulation.status == 'cancelled')
+        ))
+        db.session.commit()
+        now = time.monotonic()
+        for job in list(self._jobs.values()):
+            if job.run_id in cancelled and not job.cancelled:
+                job.cancelled = True
+                self._cancel_slots[job.slot] = job.run_id
+                job.kill_at = now + KILL_GRACE
+            elif job.kill_at is None and now > job.deadline:
+                job.kill_at = job.deadline + KILL_GRACE
+            if job.kill_at is not None and now > job.kill_at and job.pid and not job.future.done():
+                self.log(f"⚠️  run {job.run_id} did not stop; killing worker {job.pid}")
+                try:
+                    os.kill(job.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def _set_status(self, run_id, status, only_if=('running',)):
+        db.session.execute(
+            update(QuantumSimulation)
+            .where(QuantumSimulation.run_id == run_id, QuantumSimulation.status.in_(only_if))
+            .values(status=status)
+        )
+
+    def _finish(self, job):
+        """Record a finished job's result or failure"""
+        del self._jobs[job.run_id]
+        self._cancel_slots[job.slot] = 0
+        try:
+            payload, seconds = job.future.result()
+        except BrokenProcessPool:
+            if job.kill_at is not None:
+                # This job's worker was killed: it ran past its timeout or was cancelled
+                self._set_status(job.run_id, 'failed')
+                self.stats['killed'] += 1
+                self.log(f"❌ run {job.run_id} killed")
+            elif self._requeues[job.run_id] < MAX_REQUEUES:
+                # A worker died under it (or another job was killed): give it back to the queue
+                self._requeues[job.run_id] += 1
+                self._set_status(job.run_id, 'pending')
+                self.stats['requeued'] += 1
+            else:
+                self._set_status(job.run_id, 'failed')
+                self.stats['failed'] += 1
+                self.log(f"❌ run {job.run_id} failed: its worker process died {MAX_REQUEUES + 1} times")
+            db.session.commit()
+            return
+        except JobCancelled:
+            self.stats['cancelled'] += 1
+            self.log(f"⏹️  run {job.run_id} cancelled")
+            return
+        except Exception as e:
+            self._set_status(job.run_id, 'failed')
+            db.session.commit()
+            self.stats['failed'] += 1
+            self.log(f"❌ run {job.run_id} failed: {e}")
+            return
+
+        simulation = db.session.get(QuantumSimulation, job.run_id)
+        if simulation is None or simulation.status != 'running':
+            # Deleted or cancelled while the last checkpoint had already passed
+            self.stats['cancelled'] += 1
+            return
+        payload = dict(payload or {})
+        payload.setdefault('execution_time_seconds', round(seconds, 6))
+        try:
+            save_result(simulation, payload)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self._set_status(job.run_id, 'failed')
+            db.session.commit()
+            self.stats['failed'] += 1
+            self.log(f"❌ run {job.run_id} returned an unusable result: {e}")
+            return
+        self.stats['completed'] += 1
+        self.log(f"✅ run {job.run_id} completed in {seconds:.3f}s")
+
+    def _collect(self, timeout):
+        futures = {job.future: job for job in self._jobs.values()}
+        if not futures:
+            time.sleep(timeout)
+            return
+        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        broken = False
+        for future in done:
+            self._finish(futures[future])
+            broken = broken or isinstance(future.exception(), BrokenProcessPool)
+        if broken:
+            # A killed worker breaks the whole pool: settle its other jobs, then replace it
+            stranded = [job for job in self._jobs.values() if job.pool is self._pool]
+            wait([job.future for job in stranded])
+            for job in stranded:
+                self._finish(job)
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+
+    def _stop_jobs(self):
+        """
+        Ask every job in flight to stop at its next checkpoint, kill the workers
+        of those still busy after KILL_GRACE, then shut the pool down
+        """
+        for job in self._jobs.values():
+            self._cancel_slots[job.slot] = job.run_id
+        wait([job.future for job in self._jobs.values()], timeout=KILL_GRACE)
+        self._drain_started()
+        for job in self._jobs.values():
+            if job.pid and not job.future.done():
+                self.log(f"⚠️  run {job.run_id} did not stop; killing worker {job.pid}")
+                try:
+                    os.kill(job.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    # -- main loop ------------------------------------------------------------
+
+    def run(self, drain=False):
+        """Schedule until interrupted; with drain, return once nothing is pending or in flight"""
+        self._pool = self._new_pool()
+        try:
+            while True:
+                self._schedule()
+                if drain and not self._jobs:
+                    break
+                self._collect(self.poll_interval)
+                self._supervise()
+        finally:
+            self._stop_jobs()
+            for job in list(self._jobs.values()):
+                if _ran_to_end(job.future):
+                    # Finished during the stop grace period: keep its result
+                    self._finish(job)
+                else:
+                    self._set_status(job.run_id, 'pending')
+            db.session.commit()
+        return dict(self.stats)
+
+
+jobs_cli = AppGroup('jobs', help='Execute pending simulations locally.')
+
+
+@jobs_cli.command('run')
+@click.option('--workers', default=RUNNER_WORKERS, show_default=True, help='Worker processes.')
+@click.option('--cost-budget', type=int, default=None,
+              help=f'Total num_qubits x circuit_depth in flight [default: workers x {RUNNER_COST_PER_WORKER}].')
+@click.option('--timeout', default=RUNNER_JOB_TIMEOUT, show_default=True,
+              help="Seconds per job, unless the run has a 'timeout_seconds' parameter.")
+@click.option('--drain', is_flag=True, help='Exit once no runnable pending runs are left.')
+def run_command(workers, cost_budget, timeout, drain):
+    """Run pending simulations that name a local executor."""
+    runner = JobRunner(workers=workers, cost_budget=cost_budget, default_timeout=timeout, log=click.echo)
+    if not runner.executors:
+        raise click.ClickException('No local executors are registered')
+    click.echo(f"Runner: {runner.workers} worker(s), cost budget {runner.cost_budget}, "
+               f"executors: {', '.join(sorted(runner.executors))}")
+    try:
+        stats = runner.run(drain=drain)
+    except KeyboardInterrupt:
+        stats = dict(runner.stats)
+    click.echo(' '.join(f"{key}={value}" for key, value in sorted(stats.items())) or 'Nothing to run')
@@ -0,0 +1,32 @@
+"""
+Auxiliary Schema Scripts for QSLRM
+Applies the idempotent SQL scripts kept next to schema.sql in database/
+"""
+
+from pathlib import Path
+
+from sqlalchemy import inspect
+
+from models import db
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent.parent / "database"
+
+
+def table_exists(name):
+    """Check whether a table exists in the bound database"""
+    return inspect(db.engine).has_table(name)
+
+
+def read_script(filename):
+    """Text of a database/ SQL script"""
+    return (DATABASE_DIR / filename).read_text(encoding='utf-8-sig')
+
+
+def apply_script(filename):
+    """Run a database/ SQL script (CREATE ... IF NOT EXISTS statements) in one go"""
+    sql = read_script(filename)
+    connection = db.engine.raw_connection()
+    try:
+        connection.driver_connection.executescript(sql)
+    finally:
+        connection.close()
@@ -0,0 +1,142 @@
+"""
+Full-Text Search Index for QSLRM
+FTS5 tables from database/search_index.sql, MATCH-query building,
+BM25-ranked lookups and index maintenance commands
+"""
+
+import re
+import time
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Float, Integer, or_, text
+
+from models import db, Researcher, SimulationProject, QuantumSimulation
+from utils.schema import apply_script, table_exists
+
+# index name -> (model, indexed columns, BM25 column weights)
+SEARCH_INDEXES = {
+    'researcher_fts': (Researcher, ('first_name', 'last_name', 'email', 'institution', 'department'), (10, 10, 4, 3, 2)),
+    'project_fts': (SimulationProject, ('title', 'description', 'field_of_study'), (10, 2, 5)),
+    'simulation_fts': (QuantumSimulation, ('simulation_id', 'description', 'algorithm_type', 'framework'), (10, 2, 6, 4))
+}
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def ensure_search_index():
+    """Install the FTS5 tables and sync triggers; populate them when new"""
+    if not table_exists('quantum_simulation'):
+        return False
+
+    created = not table_exists('researcher_fts')
+    apply_script('search_index.sql')
+    if created:
+        rebuild_search_index()
+    return True
+
+
+def _maintain(command):
+    for name in SEARCH_INDEXES:
+        db.session.execute(text(f"INSERT INTO {name} ({name}) VALUES ('{command}')"))
+    db.session.commit()
+
+
+def rebuild_search_index():
+    """Re-read every indexed row from its content table"""
+    _maintain('rebuild')
+
+
+def optimize_search_index():
+    """Merge each index's b-tree segments into one"""
+    _maintain('optimize')
+
+
+def build_match_query(query_text):
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match
+    as a prefix ("surf cod" finds "Surface Code"). Returns None when the
+    text has no searchable words.
+    """
+    tokens = _TOKEN.findall(query_text or '')
+    if not tokens:
+        return None
+    return ' '.join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+
+def match_subquery(index, match_query):
+    """(rowid, score) rows matching an index; lower score is more relevant (BM25)"""
+    _, _, weights = SEARCH_INDEXES[index]
+    return text(
+        f"SELECT rowid, bm25({index}, {', '.join(str(w) for w in weights)}) AS score "
+        f"FROM {index} WHERE {index} MATCH :match_query"
+    ).bindparams(match_query=match_query)\
+     .columns(rowid=Integer, score=Float)\
+     .subquery()
+
+
+def ranked_search(index, query_text, base_query=None, with_score=True):
+    """
+    Query of (model, score) rows matching query_text, best first
+    (plain model rows when with_score is False).
+    base_query narrows the candidates with further ORM filters.
+    """
+    model, _, _ = SEARCH_INDEXES[index]
+    matches = match_subquery(index, build_match_query(query_text))
+    primary_key = model.__mapper__.primary_key[0]
+
+    query = base_query if base_query is not None else model.query
+    query = query.join(matches, matches.c.rowid == primary_key)
+    if with_score:
+        query = query.add_columns(matches.c.score)
+    return query.order_by(matches.c.score, primary_key)
+
+
+def like_predicate(index, query_text):
+    """The pre-FTS substring predicate (ILIKE '%q%' on every indexed column), kept for benchmarking"""
+    model, columns, _ = SEARCH_INDEXES[index]
+    return or_(*[getattr(model, column).ilike(f'%{query_text}%') for column in columns])
+
+
+search_cli = AppGroup('search', help='Maintain the full-text search index.')
+
+
+@search_cli.command('rebuild')
+def rebuild_command():
+    """Repopulate the FTS5 tables from the base tables."""
+    ensure_search_index()
+    rebuild_search_index()
+    click.echo(f"Rebuilt {', '.join(SEARCH_INDEXES)}")
+
+
+@search_cli.command('optimize')
+def optimize_command():
+    """Merge FTS5 segments for faster queries."""
+    optimize_search_index()
+    click.echo(f"Optimized {', '.join(SEARCH_INDEXES)}")
+
+
+@search_cli.command('benchmark')
+@click.argument('queries', nargs=-1)
+@click.option('--repeat', default=50, show_default=True, help='Runs per query and path.')
+@click.option('--limit', default=10, show_default=True, help='Rows fetched per entity.')
+def benchmark_command(queries, repeat, limit):
+    """Time FTS5 MATCH against the ILIKE scan for each query."""
+    queries = queries or ('quantum', 'surface', 'vqe', 'mit', 'qaoa')
+    click.echo(f"{'query':<16}{'index':<16}{'ilike ms':>10}{'fts ms':>10}{'speedup':>10}")
+    for query_text in queries:
+        if build_match_query(query_text) is None:
+            continue
+        for index, (model, _, _) in SEARCH_INDEXES.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                model.query.filter(like_predicate(index, query_text)).limit(limit).all()
+            like_ms = (time.perf_counter() - start) * 1000 / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                ranked_search(index, query_text).limit(limit).all()
+            fts_ms = (time.perf_counter() - start) * 1000 / repeat
+
+            speedup = like_ms / fts_ms if fts_ms else float('inf')
+            click.echo(f"{query_text:<16}{index:<16}{like_ms:>10.3f}{fts_ms:>10.3f}{speedup:>9.1f}x")
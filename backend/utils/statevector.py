@@ -0,0 +1,416 @@
+"""
+NumPy Statevector Reference Simulator for QSLRM
+Re-executes small recorded circuits (up to MAX_QUBITS) deterministically:
+the same circuit and random_seed always give the same measurement counts.
+
+The state is one complex128 array viewed as (2,)*n, qubit q on axis n-1-q,
+so a flat index read in binary is the measured bitstring. Gates are applied
+in place: diagonal gates scale the affected slices directly; other gates
+copy the 2^k target slices of one block of amplitudes into a preallocated
+scratch matrix, contract it with the gate matrix in a single matmul and copy
+it back. No state-sized array is allocated after the first.
+
+A circuit is JSON, in the run's 'circuit' parameter or its circuit.json
+artifact:
+
+    {"num_qubits": 3, "shots": 1000,
+     "gates": [{"gate": "h", "qubits": [0]},
+               {"gate": "cx", "qubits": [0, 1]},
+               {"gate": "rz", "qubits": [2], "params": [0.25]}]}
+
+(or just the gate list). Multi-qubit gates list control qubits first. All
+qubits are measured at the end.
+"""
+
+import cmath
+import itertools
+import json
+import math
+import os
+import time
+
+import click
+import numpy as np
+from flask.cli import AppGroup
+
+from utils.artifacts import artifact_path
+from utils.counts_encoding import indices_to_bitstrings
+from utils.runner import register_executor
+from utils.validators import ValidationError
+
+MAX_QUBITS = 26
+DEFAULT_SHOTS = 1024
+MAX_SHOTS = 10_000_000
+MAX_GATES = 1_000_000
+
+# Amplitudes per contraction block (2^14 complex128 = 256 KiB, so a block and its
+# scratch stay in L2) and the largest gate
+BLOCK_BITS = 14
+MAX_GATE_QUBITS = 3
+
+# Gates between runner checkpoints (cancellation / timeout)
+CHECKPOINT_EVERY = 64
+
+# Largest circuit POST /reexecute runs inline, in amplitude updates
+# ((gates + 2) x 2^qubits, plus shots; about a second here). Larger ones are
+# queued for the job runner, which enforces timeouts.
+REEXECUTE_MAX_WORK = int(os.getenv('REEXECUTE_MAX_WORK', str(2 ** 27)))
+
+CIRCUIT_ARTIFACT = 'circuit.json'
+
+_SQ2 = 1 / math.sqrt(2)
+
+
+def _controlled(matrix, controls=1):
+    """Gate matrix with `controls` leading control qubits"""
+    size = matrix.shape[0] * 2 ** controls
+    full = np.eye(size, dtype=complex)
+    full[-matrix.shape[0]:, -matrix.shape[0]:] = matrix
+    return full
+
+
+def _rx(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+
+def _ry(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz_diag(theta):
+    return np.array([cmath.exp(-0.5j * theta), cmath.exp(0.5j * theta)])
+
+
+def _u(theta, phi, lam):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([
+        [c, -cmath.exp(1j * lam) * s],
+        [cmath.exp(1j * phi) * s, cmath.exp(1j * (phi + lam)) * c]
+    ])
+
+
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_Y = np.array([[0, -1j], [1j, 0]])
+_H = np.array([[_SQ2, _SQ2], [_SQ2, -_SQ2]], dtype=complex)
+_SX = 0.5 * np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]])
+_SWAP = np.eye(4, dtype=complex)[[0, 2, 1, 3]]
+_ISWAP = np.array([[1, 0, 0, 0], [0, 0, 1j, 0], [0, 1j, 0, 0], [0, 0, 0, 1]])
+
+
+def _rxx(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return c * np.eye(4, dtype=complex) - 1j * s * np.kron(_X, _X)
+
+
+def _ryy(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return c * np.eye(4, dtype=complex) - 1j * s * np.kron(_Y, _Y)
+
+
+# name: (qubits, parameters, builder). Diagonal gates return the diagonal only.
+DENSE_GATES = {
+    'x': (1, 0, lambda: _X),
+    'y': (1, 0, lambda: _Y),
+    'h': (1, 0, lambda: _H),
+    'sx': (1, 0, lambda: _SX),
+    'sxdg': (1, 0, lambda: _SX.conj().T),
+    'rx': (1, 1, _rx),
+    'ry': (1, 1, _ry),
+    'u': (1, 3, _u),
+    'u3': (1, 3, _u),
+    'u2': (1, 2, lambda phi, lam: _u(math.pi / 2, phi, lam)),
+    'cx': (2, 0, lambda: _controlled(_X)),
+    'cnot': (2, 0, lambda: _controlled(_X)),
+    'cy': (2, 0, lambda: _controlled(_Y)),
+    'ch': (2, 0, lambda: _controlled(_H)),
+    'crx': (2, 1, lambda theta: _controlled(_rx(theta))),
+    'cry': (2, 1, lambda theta: _controlled(_ry(theta))),
+    'swap': (2, 0, lambda: _SWAP),
+    'iswap': (2, 0, lambda: _ISWAP),
+    'rxx': (2, 1, _rxx),
+    'ryy': (2, 1, _ryy),
+    'ccx': (3, 0, lambda: _controlled(_X, 2)),
+    'toffoli': (3, 0, lambda: _controlled(_X, 2)),
+    'cswap': (3, 0, lambda: _controlled(_SWAP, 1)),
+    'fredkin': (3, 0, lambda: _controlled(_SWAP, 1)),
+}
+
+DIAGONAL_GATES = {
+    'id': (1, 0, lambda: np.ones(2, dtype=complex)),
+    'i': (1, 0, lambda: np.ones(2, dtype=complex)),
+    'z': (1, 0, lambda: np.array([1, -1], dtype=complex)),
+    's': (1, 0, lambda: np.array([1, 1j])),
+    'sdg': (1, 0, lambda: np.array([1, -1j])),
+    't': (1, 0, lambda: np.array([1, cmath.exp(0.25j * math.pi)])),
+    'tdg': (1, 0, lambda: np.array([1, cmath.exp(-0.25j * math.pi)])),
+    'rz': (1, 1, _rz_diag),
+    'p': (1, 1, lambda lam: np.array([1, cmath.exp(1j * lam)])),
+    'phase': (1, 1, lambda lam: np.array([1, cmath.exp(1j * lam)])),
+    'u1': (1, 1, lambda lam: np.array([1, cmath.exp(1j * lam)])),
+    'cz': (2, 0, lambda: np.array([1, 1, 1, -1], dtype=complex)),
+    'cp': (2, 1, lambda lam: np.array([1, 1, 1, cmath.exp(1j * lam)])),
+    'cphase': (2, 1, lambda lam: np.array([1, 1, 1, cmath.exp(1j * lam)])),
+    'cu1': (2, 1, lambda lam: np.array([1, 1, 1, cmath.exp(1j * lam)])),
+    'crz': (2, 1, lambda theta: np.concatenate([[1, 1], _rz_diag(theta)])),
+    'rzz': (2, 1, lambda theta: _rz_diag(theta)[[0, 1, 1, 0]]),
+    'ccz': (3, 0, lambda: np.array([1, 1, 1, 1, 1, 1, 1, -1], dtype=complex)),
+}
+
+# Accepted and skipped: measurement is always of every qubit, at the end
+IGNORED_GATES = {'barrier', 'measure'}
+
+
+class Gate:
+    __slots__ = ('name', 'qubits', 'matrix', 'diagonal')
+
+    def __init__(self, name, qubits, matrix, diagonal):
+        self.name = name
+        self.qubits = qubits
+        self.matrix = matrix
+        self.diagonal = diagonal
+
+
+def compile_gate(spec, num_qubits):
+    """A circuit entry ({"gate", "qubits", "params"}) as a Gate, or None for a skipped one"""
+    if not isinstance(spec, dict) or not isinstance(spec.get('gate'), str):
+        raise ValidationError(f"Invalid gate: {spec}")
+    name = spec['gate'].lower()
+    if name in IGNORED_GATES:
+        return None
+    diagonal = name in DIAGONAL_GATES
+    table = DIAGONAL_GATES if diagonal else DENSE_GATES
+    if name not in table:
+        raise ValidationError(f"Unsupported gate: {spec['gate']}")
+    arity, num_params, build = table[name]
+
+    qubits = spec.get('qubits')
+    if isinstance(qubits, int):
+        qubits = [qubits]
+    if (not isinstance(qubits, list) or len(qubits) != arity
+            or any(isinstance(q, bool) or not isinstance(q, int) or not 0 <= q < num_qubits for q in qubits)
+            or len(set(qubits)) != arity):
+        raise ValidationError(f"{name} needs {arity} distinct qubit(s) in 0..{num_qubits - 1}, got {qubits}")
+    params = spec.get('params') or []
+    if not isinstance(params, list) or len(params) != num_params or not all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in params):
+        raise ValidationError(f"{name} needs {num_params} numeric parameter(s), got {params}")
+    return Gate(name, tuple(qubits), np.asarray(build(*params), dtype=complex), diagonal)
+
+
+class Circuit:
+    def __init__(self, num_qubits, gates, shots):
+        self.num_qubits = num_qubits
+        self.gates = gates
+        self.shots = shots
+
+    @property
+    def work(self):
+        """Rough cost in amplitude updates: every gate touches the whole state,
+        and allocating and sampling it costs about two more passes"""
+        return (len(self.gates) + 2) * 2 ** self.num_qubits + self.shots
+
+
+def parse_circuit(value, num_qubits=None, shots=None):
+    """Validate circuit JSON (text, list or object); num_qubits / shots fill in what it leaves out"""
+    if isinstance(value, (str, bytes)):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValidationError("circuit must be JSON")
+    if isinstance(value, list):
+        value = {'gates': value}
+    if not isinstance(value, dict) or not isinstance(value.get('gates'), list):
+        raise ValidationError("circuit must be a gate list or an object with 'gates'")
+
+    num_qubits = value.get('num_qubits', num_qubits)
+    if isinstance(num_qubits, bool) or not isinstance(num_qubits, int) or not 1 <= num_qubits <= MAX_QUBITS:
+        raise ValidationError(f"The reference simulator runs 1 to {MAX_QUBITS} qubits, got {num_qubits}")
+    shots = value.get('shots', shots if shots is not None else DEFAULT_SHOTS)
+    if isinstance(shots, bool) or not isinstance(shots, int) or not 1 <= shots <= MAX_SHOTS:
+        raise ValidationError(f"shots must be between 1 and {MAX_SHOTS}")
+    if len(value['gates']) > MAX_GATES:
+        raise ValidationError(f"At most {MAX_GATES} gates per circuit")
+
+    gates = [compile_gate(spec, num_qubits) for spec in value['gates']]
+    return Circuit(num_qubits, [gate for gate in gates if gate is not None], shots)
+
+
+def load_circuit(run_id, parameters, num_qubits=None):
+    """A run's circuit: its 'circuit' parameter, else its circuit.json artifact"""
+    shots = parameters.get('shots')
+    try:
+        shots = int(float(shots)) if shots is not None else None
+    except ValueError:
+        raise ValidationError("shots parameter must be an integer")
+    if parameters.get('circuit'):
+        return parse_circuit(parameters['circuit'], num_qubits, shots)
+    path = artifact_path(run_id, CIRCUIT_ARTIFACT)
+    if path.exists():
+        return parse_circuit(path.read_bytes(), num_qubits, shots)
+    raise ValidationError(f"Run {run_id} has no recorded circuit ('circuit' parameter or {CIRCUIT_ARTIFACT} artifact)")
+
+
+class Statevector:
+    """An n-qubit state, |0...0> initially, updated in place gate by gate"""
+
+    def __init__(self, num_qubits, block_bits=BLOCK_BITS):
+        if not 1 <= num_qubits <= MAX_QUBITS:
+            raise ValidationError(f"The reference simulator runs 1 to {MAX_QUBITS} qubits")
+        self.num_qubits = num_qubits
+        self.amplitudes = np.zeros(2 ** num_qubits, dtype=np.complex128)
+        self.amplitudes[0] = 1
+        self.tensor = self.amplitudes.reshape((2,) * num_qubits)
+        self.block_bits = block_bits
+        width = 2 ** min(block_bits, num_qubits)
+        self._gathered = np.empty(2 ** MAX_GATE_QUBITS * width, dtype=np.complex128)
+        self._contracted = np.empty_like(self._gathered)
+
+    def _slices(self, qubits, fixed):
+        """
+        Views of the 2^k target slices (matrix row order: first listed qubit
+        most significant), with the axes in `fixed` pinned to given values
+        """
+        n = self.num_qubits
+        index = [slice(None)] * n
+        for axis, bit in fixed:
+            index[axis] = bit
+        k = len(qubits)
+        views = []
+        for j in range(2 ** k):
+            for i, qubit in enumerate(qubits):
+                index[n - 1 - qubit] = (j >> (k - 1 - i)) & 1
+            # The trailing newaxis keeps a fully indexed slice a view rather than a scalar
+            views.append(self.tensor[tuple(index) + (None,)])
+        return views
+
+    def apply(self, gate):
+        if gate.diagonal:
+            for view, phase in zip(self._slices(gate.qubits, ()), gate.matrix):
+                if phase != 1:
+                    view *= phase
+            return
+
+        n = self.num_qubits
+        targets = {n - 1 - q for q in gate.qubits}
+        free = [axis for axis in range(n) if axis not in targets]
+        # Contract over the trailing (smallest-stride) free axes, loop over the rest
+        inner = free[max(0, len(free) - self.block_bits):]
+        outer = free[:len(free) - len(inner)]
+        dim, width = gate.matrix.shape[0], 2 ** len(inner)
+        gathered = self._gathered[:dim * width].reshape(dim, width)
+        contracted = self._contracted[:dim * width].reshape(dim, width)
+        shape = (2,) * len(inner) + (1,)
+
+        for bits in itertools.product((0, 1), repeat=len(outer)):
+            views = self._slices(gate.qubits, zip(outer, bits))
+            for row, view in zip(gathered, views):
+                np.copyto(row.reshape(shape), view)
+            np.matmul(gate.matrix, gathered, out=contracted)
+            for row, view in zip(contracted, views):
+                np.copyto(view, row.reshape(shape))
+
+    def sample(self, shots, rng):
+        """
+        Measurement outcome indices of `shots` shots, sorted. Probabilities are
+        formed one block at a time against sorted uniforms, so sampling
+        allocates O(block + shots), not another state-sized array.
+        """
+        block = 2 ** min(self.block_bits, self.num_qubits)
+        blocks = self.amplitudes.reshape(-1, block)
+        weights = np.array([np.vdot(b, b).real for b in blocks])
+        bounds = np.cumsum(weights)
+        draws = np.sort(rng.random(shots)) * bounds[-1]
+        owners = np.minimum(np.searchsorted(bounds, draws, side='right'), len(blocks) - 1)
+
+        outcomes = np.empty(shots, dtype=np.int64)
+        starts = np.searchsorted(owners, np.arange(len(blocks) + 1))
+        for b in np.flatnonzero(np.diff(starts)):
+            lo, hi = starts[b], starts[b + 1]
+            local = np.cumsum(np.abs(blocks[b]) ** 2)
+            offset = bounds[b - 1] if b else 0.0
+            positions = np.searchsorted(local, draws[lo:hi] - offset, side='right')
+            outcomes[lo:hi] = b * block + np.minimum(positions, block - 1)
+        return outcomes
+
+
+def run_circuit(circuit, seed=None, checkpoint=None):
+    """
+    Execute a circuit and sample it. Returns ({bitstring: count}, stats); the
+    counts depend only on the circuit and the seed.
+    """
+    started = time.perf_counter()
+    state = Statevector(circuit.num_qubits)
+    allocated = time.perf_counter()
+    for i, gate in enumerate(circuit.gates):
+        if checkpoint is not None and i % CHECKPOINT_EVERY == 0:
+            checkpoint()
+        state.apply(gate)
+    evolved = time.perf_counter()
+
+    outcomes = state.sample(circuit.shots, np.random.default_rng(seed))
+    indices, counts = np.unique(outcomes, return_counts=True)
+    histogram = dict(zip(indices_to_bitstrings(indices.astype(np.uint64), circuit.num_qubits).tolist(), counts.tolist()))
+    finished = time.perf_counter()
+
+    gate_seconds = evolved - allocated
+    return histogram, {
+        'num_qubits': circuit.num_qubits,
+        'gates': len(circuit.gates),
+        'shots': circuit.shots,
+        'seed': seed,
+        'gate_seconds': round(gate_seconds, 6),
+        'gates_per_second': round(len(circuit.gates) / gate_seconds, 1) if gate_seconds > 0 else None,
+        'sampling_seconds': round(finished - evolved, 6),
+        'total_seconds': round(finished - started, 6)
+    }
+
+
+@register_executor('statevector')
+def statevector_executor(spec, checkpoint):
+    """Job runner executor: run the recorded circuit, seeded by the run's random_seed"""
+    circuit = load_circuit(spec['run_id'], spec['parameters'], spec['num_qubits'])
+    counts, stats = run_circuit(circuit, spec['random_seed'], checkpoint)
+    # Timings stay out of the payload so identical re-runs share one stored output
+    return {
+        'measurement_counts': counts,
+        'output_data': {
+            'simulator': 'numpy-statevector',
+            **{key: stats[key] for key in ('num_qubits', 'gates', 'shots', 'seed')}
+        }
+    }
+
+
+statevector_cli = AppGroup('statevector', help='NumPy statevector reference simulator.')
+
+
+def benchmark_circuit(num_qubits, gate, layers):
+    """`layers` layers of one gate type across all qubits (pairs for two-qubit gates)"""
+    arity, num_params = (DIAGONAL_GATES.get(gate) or DENSE_GATES[gate])[:2]
+    params = [0.3] * num_params
+    specs = []
+    for _ in range(layers):
+        for q in range(num_qubits - arity + 1):
+            specs.append({'gate': gate, 'qubits': list(range(q, q + arity)), 'params': params})
+    return parse_circuit({'num_qubits': num_qubits, 'shots': 1, 'gates': specs})
+
+
+@statevector_cli.command('benchmark')
+@click.option('--qubits', '-n', multiple=True, type=int, default=(10, 20, 26), show_default=True)
+@click.option('--gates', '-g', multiple=True, default=('h', 'rz', 'cx', 'rxx', 'ccx'), show_default=True)
+@click.option('--min-gates', default=200, show_default=True, help='Gates timed per cell, at least one layer.')
+def benchmark_command(qubits, gates, min_gates):
+    """Print gates per second by register size and gate."""
+    click.echo(f"{'qubits':>6}  {'state MiB':>9}  " + ''.join(f"{g:>12}" for g in gates))
+    for n in qubits:
+        row = []
+        for gate in gates:
+            arity = (DIAGONAL_GATES.get(gate) or DENSE_GATES[gate])[0]
+            per_layer = max(1, n - arity + 1)
+            # Past 20 qubits, halve the gates timed per extra qubit (one layer at least)
+            budget = max(per_layer, min_gates >> max(0, n - 20))
+            circuit = benchmark_circuit(n, gate, -(-budget // per_layer))
+            _, stats = run_circuit(circuit, seed=0)
+            rate = stats['gates_per_second']
+            row.append(f"{rate:>12,.0f}" if rate >= 100 else f"{rate:>12.2f}")
+        click.echo(f"{n:>6}  {2 ** n * 16 / 2 ** 20:>9,.0f}  " + ''.join(row))
@@ -0,0 +1,382 @@
+"""
+Type-ahead Suggestions for QSLRM
+In-memory sorted prefix index over researcher names, institutions and
+algorithm types, weighted by usage. Built in the background at startup and
+kept current from the values of each commit; writes by other processes are
+picked up through the shared 'suggestion_index' table version.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.exc import OperationalError
+
+from models import db, Researcher, QuantumSimulation
+from utils.cache import shared_versions
+
+SUGGEST_TYPES = ('researcher', 'institution', 'algorithm')
+
+
+def _normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def _prefix_keys(value):
+    """Every word-suffix of a value, so 'UC Berkeley' is found by 'uc' and 'berk'"""
+    words = _normalize(value).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+class PrefixIndex:
+    """Sorted (key, entry) array searched with bisect; entries carry a usage weight"""
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set(self, entry_id, value, weight, **extra):
+        """Insert or replace an entry"""
+        if entry_id in self._entries:
+            self.remove(entry_id)
+        self._entries[entry_id] = dict(extra, value=value, weight=weight)
+        for key in _prefix_keys(value):
+            insort(self._keys, (key, entry_id))
+
+    def get(self, entry_id):
+        return self._entries.get(entry_id)
+
+    def add_weight(self, entry_id, delta):
+        entry = self._entries.get(entry_id)
+        if entry:
+            entry['weight'] += delta
+        return entry is not None
+
+    def remove(self, entry_id):
+        entry = self._entries.pop(entry_id, None)
+        if entry:
+            for key in _prefix_keys(entry['value']):
+                position = bisect_left(self._keys, (key, entry_id))
+                if position < len(self._keys) and self._keys[position] == (key, entry_id):
+                    del self._keys[position]
+
+    def top(self, prefix, k, kind=None):
+        """The k heaviest distinct entries with a key starting with prefix"""
+        prefix = _normalize(prefix)
+        start = bisect_left(self._keys, (prefix,))
+        matches = set()
+        for key, entry_id in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            if kind is None or entry_id[0] == kind:
+                matches.add(entry_id)
+        best = heapq.nlargest(k, matches, key=lambda e: (self._entries[e]['weight'], e[0] == 'researcher'))
+        return [dict(self._entries[e], type=e[0]) for e in best]
+
+
+class SuggestionIndex:
+    """
+    PrefixIndex kept in step with commits. Commits of this process are folded
+    in from their flushed values; a change of the shared 'suggestion_index'
+    version that no commit here accounts for (job runner, CLI, other workers,
+    raw SQL) schedules a rebuild on a background thread, and lookups keep
+    answering from the current index meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self._index = None
+        self._version = None
+        self._reloading = False
+        self.loads = 0
+        self.applied = 0
+
+    def start(self, engine):
+        """Remember the engine and build the index in the background"""
+        self._engine = engine
+        self._schedule_reload()
+
+    def suggest(self, prefix, k=10, kind=None):
+        version = (shared_versions() or {}).get(VERSION_KEY)
+        with self._lock:
+            index = self._index
+            stale = index is not None and version is not None and version != self._version
+        if index is None:
+            # Only the very first lookup waits for a load
+            self._reload()
+        elif stale:
+            self._schedule_reload()
+        with self._lock:
+            return self._index.top(prefix, k, kind)
+
+    def apply(self, deltas):
+        """Fold a committed transaction's deltas in and take the version it left behind"""
+        version = _read_version(self._engine) if self._engine is not None else None
+        with self._lock:
+            # A reload in progress reads the database itself; the version it
+            # records predates this commit, so the next lookup reloads again
+            if self._index is None or self._reloading:
+                return
+            for delta in deltas:
+                _apply_delta(self._index, delta)
+            self._version = version
+            self.applied += len(deltas)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self._index is not None,
+                'entries': len(self._index) if self._index is not None else 0,
+                'version': self._version,
+                'reloading': self._reloading,
+                'loads': self.loads,
+                'applied_deltas': self.applied
+            }
+
+    def _schedule_reload(self):
+        with self._lock:
+            if self._reloading or self._engine is None:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, kwargs={'claimed': True}, name='suggest-reload', daemon=True).start()
+
+    def _reload(self, claimed=False):
+        if not claimed:
+            with self._lock:
+                self._reloading = True
+        try:
+            engine = self._engine or db.engine
+            # The version is read first: a write that lands during the load
+            # leaves it behind the shared one, and the next lookup reloads
+            version = _read_version(engine)
+            with engine.connect() as connection:
+                index = _build_index(connection)
+            with self._lock:
+                self._index = index
+                self._version = version
+                self.loads += 1
+        except Exception as e:
+            print(f"⚠️  Suggestion index reload failed: {e}")
+            if not claimed:
+                raise
+        finally:
+            with self._lock:
+                self._reloading = False
+
+
+VERSION_KEY = 'suggestion_index'
+
+_researchers = Researcher.__table__
+_simulations = QuantumSimulation.__table__
+
+
+def _read_version(engine):
+    """The shared version, or None without table_version"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                text("SELECT version FROM table_version WHERE table_name = :name"), {'name': VERSION_KEY}
+            ).scalar()
+    except OperationalError:
+        return None
+
+
+def _build_index(connection):
+    index = PrefixIndex()
+
+    sim_counts = dict(connection.execute(
+        select(_simulations.c.researcher_id, func.count()).group_by(_simulations.c.researcher_id)
+    ).all())
+
+    institutions = {}
+    for researcher_id, first, last, institution in connection.execute(select(
+        _researchers.c.researcher_id, _researchers.c.first_name, _researchers.c.last_name, _researchers.c.institution
+    )):
+        index.set(('researcher', researcher_id), f"{first} {last}", sim_counts.get(researcher_id, 0),
+                  researcher_id=researcher_id)
+        if institution:
+            institutions[institution] = institutions.get(institution, 0) + 1
+
+    for institution, count in institutions.items():
+        index.set(('institution', institution), institution, count)
+
+    for algorithm, count in connection.execute(
+        select(_simulations.c.algorithm_type, func.count())
+        .where(_simulations.c.algorithm_type.isnot(None)).group_by(_simulations.c.algorithm_type)
+    ):
+        index.set(('algorithm', algorithm), algorithm, count)
+    return index
+
+
+def _apply_delta(index, delta):
+    """('name', researcher_id, full name) or ('weight', kind, key, change)"""
+    if delta[0] == 'name':
+        _, researcher_id, name = delta
+        entry = index.get(('researcher', researcher_id))
+        index.set(('researcher', researcher_id), name, entry['weight'] if entry else 0, researcher_id=researcher_id)
+        return
+
+    _, kind, key, change = delta
+    if key is None:
+        return
+    entry_id = (kind, key)
+    if index.add_weight(entry_id, change):
+        # Institutions and algorithms exist only while something uses them
+        if kind != 'researcher' and index.get(entry_id)['weight'] <= 0:
+            index.remove(entry_id)
+    elif kind != 'researcher' and change > 0:
+        index.set(entry_id, key, change)
+
+
+suggestion_index = SuggestionIndex()
+
+
+# Deltas are gathered per session from flushed objects and Core statements,
+# and handed to the index after commit. Anything whose old values are not
+# at hand (deleted researchers, Core updates of indexed columns, Core
+# deletes, raw SQL writes) marks the transaction opaque instead: its deltas
+# are dropped and the shared version, which the triggers moved, brings the
+# index up to date with a reload.
+_deltas_key = 'qslrm_suggest_deltas'
+_opaque_key = 'qslrm_suggest_opaque'
+
+_INDEXED_COLUMNS = {
+    'researcher': {'first_name', 'last_name', 'institution'},
+    'quantum_simulation': {'researcher_id', 'algorithm_type'}
+}
+
+_UNKNOWN = object()
+
+
+def _columns(obj, names, inserted=False):
+    """{column: (old, new)}, with _UNKNOWN for values that were never loaded"""
+    state = inspect(obj)
+    values = {}
+    for name in names:
+        history = state.attrs[name].history
+        if inserted:
+            values[name] = (None, state.dict.get(name))
+        elif history.has_changes():
+            values[name] = (history.deleted[0] if history.deleted else _UNKNOWN,
+                            history.added[0] if history.added else None)
+        else:
+            value = state.dict.get(name, _UNKNOWN)
+            values[name] = (value, value)
+    return values
+
+
+def _researcher_deltas(obj, operation):
+    if operation == 'delete':
+        return None
+    values = _columns(obj, ('first_name', 'last_name', 'institution'), operation == 'insert')
+    if operation == 'update' and all(old == new for old, new in values.values()):
+        return []
+    if any(_UNKNOWN in pair for pair in values.values()):
+        return None
+    (_, first), (_, last), (old_institution, institution) = values['first_name'], values['last_name'], values['institution']
+    deltas = [('name', obj.researcher_id, f"{first} {last}")]
+    if operation == 'insert':
+        deltas.append(('weight', 'institution', institution, 1))
+    elif old_institution != institution:
+        deltas += [('weight', 'institution', old_institution, -1), ('weight', 'institution', institution, 1)]
+    return deltas
+
+
+def _simulation_deltas(obj, operation):
+    values = _columns(obj, ('researcher_id', 'algorithm_type'), operation == 'insert')
+    if any(_UNKNOWN in pair for pair in values.values()):
+        return None
+    deltas = []
+    for column, kind in (('researcher_id', 'researcher'), ('algorithm_type', 'algorithm')):
+        old, new = values[column]
+        if operation == 'insert':
+            deltas.append(('weight', kind, new, 1))
+        elif operation == 'delete':
+            deltas.append(('weight', kind, old, -1))
+        elif old != new:
+            deltas += [('weight', kind, old, -1), ('weight', kind, new, 1)]
+    return deltas
+
+
+_DELTAS = {Researcher: _researcher_deltas, QuantumSimulation: _simulation_deltas}
+
+
+def _record(session, deltas):
+    if deltas is None:
+        session.info[_opaque_key] = True
+    else:
+        session.info.setdefault(_deltas_key, []).extend(deltas)
+
+
+def _collect_flushed(session, flush_context):
+    for operation, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            collect = _DELTAS.get(type(obj))
+            if collect is None or (operation == 'update' and not session.is_modified(obj)):
+                continue
+            _record(session, collect(obj, operation))
+
+
+def _collect_executed(state):
+    if state.is_select:
+        return
+    table = getattr(getattr(state.statement, 'table', None), 'name', None)
+    if table is None:
+        statement_text = getattr(state.statement, 'text', None)
+        if not (isinstance(statement_text, str) and statement_text.lstrip().upper().startswith('SELECT')):
+            _record(state.session, None)
+        return
+    indexed = _INDEXED_COLUMNS.get(table)
+    if indexed is None:
+        return
+
+    rows = state.parameters
+    rows = [rows] if isinstance(rows, dict) else list(rows or [])
+    if state.is_insert and rows:
+        deltas = []
+        for row in rows:
+            if table == 'quantum_simulation':
+                deltas += [('weight', 'researcher', row.get('researcher_id'), 1),
+                           ('weight', 'algorithm', row.get('algorithm_type'), 1)]
+            elif 'researcher_id' in row:
+                deltas += [('name', row['researcher_id'], f"{row.get('first_name')} {row.get('last_name')}"),
+                           ('weight', 'institution', row.get('institution'), 1)]
+            else:
+                deltas = None
+                break
+        _record(state.session, deltas)
+    elif state.is_update:
+        # Updates of columns the index does not read (status, last_login, ...) are no change
+        try:
+            written = set(state.statement.compile().params) | {key for row in rows for key in row}
+        except Exception:
+            written = indexed
+        if written & indexed:
+            _record(state.session, None)
+    else:
+        _record(state.session, None)
+
+
+def _publish(session):
+    deltas = session.info.pop(_deltas_key, None)
+    if session.info.pop(_opaque_key, False) or not deltas:
+        return
+    suggestion_index.apply(deltas)
+
+
+def _discard(session):
+    session.info.pop(_deltas_key, None)
+    session.info.pop(_opaque_key, None)
+
+
+def track_suggestion_changes(session):
+    """Feed the suggestion index from this (scoped) session's commits"""
+    event.listen(session, 'after_flush', _collect_flushed)
+    event.listen(session, 'do_orm_execute', _collect_executed)
+    event.listen(session, 'after_commit', _publish)
+    event.listen(session, 'after_rollback', _discard)
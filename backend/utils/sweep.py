@@ -0,0 +1,148 @@
+"""
+Parameter-Sweep Matrices for QSLRM
+Pivots a project's parameter rows (through the typed parameter_index) against
+its simulation_result metrics into columnar arrays: one array per parameter
+and per metric, aligned on run_id. One UNION ALL query feeds NumPy scatter
+assignments; there is no per-run Python loop.
+"""
+
+import gc
+from contextlib import contextmanager
+
+import numpy as np
+from sqlalchemy import literal, null, select, union_all
+
+from models import ParameterIndex, QuantumSimulation, SimulationResult
+
+SWEEP_METRICS = ('fidelity', 'success_probability', 'execution_time_seconds', 'energy_value', 'error_rate')
+
+
+def _sweep_query(project_id, parameters, metrics):
+    """
+    Long-format (run_id, parameter_name, numeric_value, string_value) rows:
+    one per parameter, plus one per run and metric with parameter_name NULL,
+    the metric value in numeric_value and the metric name in string_value
+    (every run gets these, so they also fix the run axis)
+    """
+    project_runs = select(QuantumSimulation.run_id).where(QuantumSimulation.project_id == project_id)
+
+    metric_rows = [
+        select(
+            QuantumSimulation.run_id,
+            null().label('parameter_name'),
+            getattr(SimulationResult, metric).label('numeric_value'),
+            literal(metric).label('string_value')
+        ).outerjoin(SimulationResult, SimulationResult.run_id == QuantumSimulation.run_id)
+         .where(QuantumSimulation.project_id == project_id)
+        for metric in metrics
+    ]
+
+    # IN (...) lets SQLite walk parameter_index once instead of probing per row
+    parameter_rows = select(
+        ParameterIndex.run_id,
+        ParameterIndex.parameter_name,
+        ParameterIndex.numeric_value,
+        ParameterIndex.string_value
+    ).where(ParameterIndex.run_id.in_(project_runs))
+    if parameters:
+        parameter_rows = parameter_rows.where(ParameterIndex.parameter_name.in_(parameters))
+
+    return union_all(*metric_rows, parameter_rows)
+
+
+@contextmanager
+def _gc_paused():
+    """Millions of row tuples would otherwise trigger repeated full GC passes;
+    none of them form cycles"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _column(values):
+    """JSON-ready list from a float array, NaN -> None"""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def pivot_sweep(rows, metrics=SWEEP_METRICS):
+    """
+    Pivot long-format sweep rows into {'run_ids', 'parameters', 'parameter_types',
+    'metrics'}. A parameter whose every value is numeric comes back as numbers,
+    otherwise as its stored text; runs without the parameter get None. When a
+    run repeats a parameter name the last row wins.
+    """
+    if not rows:
+        return {'run_ids': [], 'parameters': {}, 'parameter_types': {}, 'metrics': {m: [] for m in metrics}}
+
+    run_id, name, numeric, text = zip(*rows)
+    run_id = np.array(run_id, dtype=np.int64)
+    numeric = np.array(numeric, dtype=np.float64)
+
+    # Parameter names coded to small ints; -1 marks metric rows
+    names = sorted(set(name) - {None})
+    codes = {parameter: index for index, parameter in enumerate(names)}
+    codes[None] = -1
+    slot = np.fromiter(map(codes.__getitem__, name), dtype=np.int64, count=len(rows))
+    is_metric_row = slot < 0
+    is_parameter_row = ~is_metric_row
+
+    run_ids = np.unique(run_id[is_metric_row])
+    positions = np.searchsorted(run_ids, run_id)
+
+    # Metrics: one row per (run, metric), scattered into a metrics x runs matrix
+    metric_codes = {metric: index for index, metric in enumerate(metrics)}
+    metric_text = np.array(text, dtype=object)[is_metric_row]
+    metric_slot = np.fromiter(map(metric_codes.__getitem__, metric_text), dtype=np.int64, count=len(metric_text))
+    metric_matrix = np.full((len(metrics), len(run_ids)), np.nan)
+    metric_matrix[metric_slot, positions[is_metric_row]] = numeric[is_metric_row]
+
+    # Parameters: the same scatter over parameter rows
+    slot = slot[is_parameter_row]
+    positions = positions[is_parameter_row]
+    numeric = numeric[is_parameter_row]
+    has_number = ~np.isnan(numeric)
+    numbers = np.full((len(names), len(run_ids)), np.nan)
+    numbers[slot[has_number], positions[has_number]] = numeric[has_number]
+
+    # Parameters with any non-numeric value are reported as their stored text
+    textual = np.zeros(len(names), dtype=bool)
+    textual[slot[~has_number]] = True
+    strings = {}
+    if textual.any():
+        in_textual = textual[slot]
+        text_values = np.array(text, dtype=object)[is_parameter_row][in_textual]
+        text_slot = slot[in_textual]
+        text_positions = positions[in_textual]
+        for index in np.flatnonzero(textual):
+            column = np.full(len(run_ids), None, dtype=object)
+            selected = text_slot == index
+            column[text_positions[selected]] = text_values[selected]
+            strings[index] = column.tolist()
+
+    parameters = {}
+    parameter_types = {}
+    for index, parameter in enumerate(names):
+        if textual[index]:
+            parameters[parameter] = strings[index]
+            parameter_types[parameter] = 'string'
+        else:
+            parameters[parameter] = _column(numbers[index])
+            parameter_types[parameter] = 'numeric'
+
+    return {
+        'run_ids': run_ids.tolist(),
+        'parameters': parameters,
+        'parameter_types': parameter_types,
+        'metrics': {metric: _column(metric_matrix[index]) for index, metric in enumerate(metrics)}
+    }
+
+
+def sweep_matrix(session, project_id, parameters=None, metrics=SWEEP_METRICS):
+    """Columnar sweep payload for one project (one query)"""
+    with _gc_paused():
+        rows = session.execute(_sweep_query(project_id, parameters, metrics)).all()
+        return pivot_sweep(rows, metrics)
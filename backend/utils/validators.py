@@ -260,4 +260,83 @@ def validate_parameter_data(data):
     if 'parameter_type' in data:
         validate_parameter_type(data['parameter_type'])
     
-    return True
\ No newline at end of file
+    return True
+
+
+def coerce_id(value, field_name):
+    """Return an integer id from an int or a digit string, or raise ValidationError"""
+    if isinstance(value, bool):
+        raise ValidationError(f"{field_name} must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise ValidationError(f"{field_name} must be an integer, got: {value!r}")
+
+
+def validate_field_types(data, strings=(), integers=(), numbers=(), prefix=''):
+    """Check that the present, non-null fields have JSON scalar types the columns can store"""
+    for field in strings:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            raise ValidationError(f"{prefix}{field} must be a string")
+    for field in integers:
+        value = data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValidationError(f"{prefix}{field} must be an integer")
+    for field in numbers:
+        value = data.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValidationError(f"{prefix}{field} must be a number")
+    return True
+
+
+def validate_simulation_record(data):
+    """
+    Validate a complete run record for bulk ingestion (simulation + nested
+    result/metadata/parameters), down to the types of the scalar fields, so a
+    bad record is rejected on its own. project_id, researcher_id and
+    metadata.verified_by are coerced to integers in place.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError("Each record must be a JSON object")
+    
+    for field in ('project_id', 'researcher_id'):
+        if data.get(field) is not None:
+            data[field] = coerce_id(data[field], field)
+    validate_field_types(data, strings=('simulation_id', 'framework', 'description', 'algorithm_type', 'status'))
+    
+    validate_simulation_data(data)
+    
+    if data.get('result') is not None:
+        if not isinstance(data['result'], dict):
+            raise ValidationError("result must be an object")
+        validate_field_types(data['result'], numbers=(
+            'execution_time_seconds', 'success_probability', 'fidelity', 'energy_value', 'error_rate'
+        ), prefix='result.')
+        validate_result_data(data['result'])
+    
+    if data.get('metadata') is not None:
+        if not isinstance(data['metadata'], dict):
+            raise ValidationError("metadata must be an object")
+        metadata = data['metadata']
+        if metadata.get('verified_by') is not None:
+            metadata['verified_by'] = coerce_id(metadata['verified_by'], 'metadata.verified_by')
+        validate_field_types(metadata, strings=('hardware_backend', 'framework_version'),
+                             integers=('random_seed',), numbers=('reproducibility_score',), prefix='metadata.')
+        validate_metadata_data(metadata)
+    
+    parameters = data.get('parameters') or []
+    if not isinstance(parameters, list):
+        raise ValidationError("parameters must be an array")
+    
+    names = set()
+    for param in parameters:
+        if not isinstance(param, dict):
+            raise ValidationError("Each parameter must be an object")
+        validate_parameter_data(param)
+        validate_field_types(param, strings=('parameter_name', 'parameter_unit', 'parameter_type'))
+        if param['parameter_name'] in names:
+            raise ValidationError(f"Duplicate parameter: {param['parameter_name']}")
+        names.add(param['parameter_name'])
+    
+    return True
@@ -0,0 +1,19 @@
+-- =====================================================
+-- QSLRM Access-Log Counters - SQLite
+-- Per-minute / per-hour / lifetime event counts behind
+-- /api/triggers/activity and /api/triggers/stats.
+-- Maintained by the audit writer as it flushes (utils/audit.py);
+-- safe to re-run. Rebuild with: flask --app app audit rebuild-counters
+-- =====================================================
+
+-- resolution is 'minute', 'hour' or 'all' (bucket '' for lifetime totals);
+-- buckets are 'YYYY-MM-DD HH:MM:00' / 'YYYY-MM-DD HH:00:00' in UTC
+CREATE TABLE IF NOT EXISTS access_log_counter (
+    resolution TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    target_entity TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    last_at TIMESTAMP,
+    PRIMARY KEY (resolution, bucket, action_type, target_entity)
+);
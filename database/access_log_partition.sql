@@ -0,0 +1,22 @@
+-- =====================================================
+-- QSLRM Access-Log Partition - SQLite
+-- Schema of one monthly audit-log file, database/access_log/access_log_YYYY_MM.db.
+-- Created by the audit writer (utils/log_partitions.py) and ATTACHed on demand;
+-- safe to re-run.
+-- =====================================================
+
+-- Same columns as access_log in schema.sql. No foreign key (it could not
+-- cross database files) and only the timestamp index: partitions are
+-- append-only and read newest-first or by time window.
+CREATE TABLE IF NOT EXISTS access_log (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    researcher_id INTEGER NOT NULL,
+    action_type TEXT NOT NULL CHECK (action_type IN ('create', 'read', 'update', 'delete', 'login', 'logout')),
+    target_entity TEXT NOT NULL CHECK (target_entity IN ('researcher', 'project', 'simulation', 'result', 'metadata', 'parameter', 'circuit')),
+    target_id INTEGER,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ip_address TEXT,
+    user_agent TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_log_timestamp ON access_log(timestamp);
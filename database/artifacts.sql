@@ -0,0 +1,21 @@
+-- =====================================================
+-- QSLRM Simulation Artifacts - SQLite
+-- One row per large file attached to a run (statevectors, density
+-- matrices, shot logs). The bytes live on the filesystem under
+-- ARTIFACT_DIR/<run_id>/<name>; this table records their size and SHA-256.
+-- Applied automatically by the backend on startup (utils/artifacts.py);
+-- safe to re-run.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS simulation_artifact (
+    artifact_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    content_type TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (run_id, name),
+    FOREIGN KEY (run_id) REFERENCES quantum_simulation(run_id) ON DELETE CASCADE
+);
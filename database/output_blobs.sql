@@ -0,0 +1,20 @@
+-- =====================================================
+-- QSLRM Output Blob Store - SQLite
+-- Content-addressed, compressed simulation output payloads. Each payload
+-- is stored once under the SHA-256 of its canonical JSON; simulation_result
+-- rows reference it through output_digest.
+-- Applied automatically by the backend on startup (utils/output_store.py),
+-- which also adds simulation_result.output_digest to older databases;
+-- safe to re-run. Unreferenced blobs are removed by: flask --app app results gc-outputs
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS output_blob (
+    digest TEXT PRIMARY KEY,  -- hex SHA-256 of the uncompressed payload
+    codec TEXT NOT NULL CHECK (codec IN ('raw', 'zlib', 'lzma')),
+    size INTEGER NOT NULL,  -- uncompressed bytes
+    stored_size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_output_digest ON simulation_result(output_digest);
@@ -0,0 +1,73 @@
+-- =====================================================
+-- QSLRM Typed Parameter Index - SQLite
+-- Shadow copy of parameter values parsed into numeric / boolean / string
+-- columns, behind /api/simulations/by-parameters.
+-- Applied automatically by the backend on startup (utils/parameter_index.py);
+-- safe to re-run. Rebuild with: flask --app app parameters rebuild
+-- =====================================================
+
+-- parameter_value is TEXT whatever its parameter_type tag says, so the
+-- typed columns are parsed from the text itself: numeric_value when it
+-- reads as a number, bool_value for true/false/yes/no/on/off/1/0
+CREATE VIEW IF NOT EXISTS vw_parameter_typed AS
+SELECT
+    parameter_id,
+    run_id,
+    parameter_name,
+    CASE
+        WHEN trim(parameter_value) GLOB '*[0-9]*'
+         AND trim(parameter_value) NOT GLOB '*[^0-9.eE+-]*'
+         AND trim(parameter_value) NOT GLOB '*.*.*'
+         AND trim(parameter_value) NOT GLOB '*[eE]*[eE]*'
+         AND trim(parameter_value) NOT GLOB '[eE]*'
+         AND trim(parameter_value) NOT GLOB '*[eE+-]'
+         -- a sign only leads the mantissa or the exponent ('2024-01-05' is text)
+         AND replace(replace(replace(replace(substr(trim(parameter_value), 2),
+                 'e-', 'e'), 'e+', 'e'), 'E-', 'E'), 'E+', 'E')
+             NOT GLOB '*[+-]*'
+        THEN CAST(trim(parameter_value) AS REAL)
+    END AS numeric_value,
+    CASE
+        WHEN lower(trim(parameter_value)) IN ('true', 'yes', 'on', '1') THEN 1
+        WHEN lower(trim(parameter_value)) IN ('false', 'no', 'off', '0') THEN 0
+    END AS bool_value,
+    parameter_value AS string_value
+FROM parameter;
+
+CREATE TABLE IF NOT EXISTS parameter_index (
+    parameter_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    parameter_name TEXT NOT NULL,
+    numeric_value REAL,
+    bool_value INTEGER,
+    string_value TEXT
+);
+
+-- run_id trails each key so every predicate is answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_param_numeric ON parameter_index(parameter_name, numeric_value, run_id);
+CREATE INDEX IF NOT EXISTS idx_param_bool ON parameter_index(parameter_name, bool_value, run_id);
+CREATE INDEX IF NOT EXISTS idx_param_string ON parameter_index(parameter_name, string_value, run_id);
+
+CREATE TRIGGER IF NOT EXISTS parameter_index_insert
+    AFTER INSERT ON parameter
+    FOR EACH ROW
+BEGIN
+    INSERT OR REPLACE INTO parameter_index
+    SELECT * FROM vw_parameter_typed WHERE parameter_id = NEW.parameter_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS parameter_index_update
+    AFTER UPDATE ON parameter
+    FOR EACH ROW
+BEGIN
+    DELETE FROM parameter_index WHERE parameter_id = OLD.parameter_id;
+    INSERT OR REPLACE INTO parameter_index
+    SELECT * FROM vw_parameter_typed WHERE parameter_id = NEW.parameter_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS parameter_index_delete
+    AFTER DELETE ON parameter
+    FOR EACH ROW
+BEGIN
+    DELETE FROM parameter_index WHERE parameter_id = OLD.parameter_id;
+END;
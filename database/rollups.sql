@@ -0,0 +1,404 @@
+-- =====================================================
+-- QSLRM Analytics Rollups - SQLite
+-- Running counts/sums behind /api/analytics/frameworks,
+-- /algorithms, /qubit-scaling, /institutions and /trends.
+-- Applied automatically by the backend on startup (utils/rollups.py);
+-- safe to re-run. Rebuild with: flask --app app rollups rebuild
+-- =====================================================
+
+-- One row per (framework, algorithm_type, num_qubits, researcher_id) group.
+-- Averages are sum / count so NULL metrics are skipped exactly like AVG().
+-- algorithm_type NULL is stored as '' so the primary key can match it.
+CREATE TABLE IF NOT EXISTS simulation_rollup (
+    framework TEXT NOT NULL,
+    algorithm_type TEXT NOT NULL DEFAULT '',
+    num_qubits INTEGER NOT NULL,
+    researcher_id INTEGER NOT NULL,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    fidelity_sum REAL NOT NULL DEFAULT 0,
+    fidelity_count INTEGER NOT NULL DEFAULT 0,
+    success_sum REAL NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    time_sum REAL NOT NULL DEFAULT 0,
+    time_count INTEGER NOT NULL DEFAULT 0,
+    repro_sum REAL NOT NULL DEFAULT 0,
+    repro_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (framework, algorithm_type, num_qubits, researcher_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_researcher ON simulation_rollup(researcher_id);
+
+-- =====================================================
+-- QUANTUM_SIMULATION: a run joins/leaves its group together with
+-- whatever result and metadata rows it already has
+-- =====================================================
+CREATE TRIGGER IF NOT EXISTS rollup_simulation_insert
+    AFTER INSERT ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO simulation_rollup (framework, algorithm_type, num_qubits, researcher_id)
+    VALUES (NEW.framework, COALESCE(NEW.algorithm_type, ''), NEW.num_qubits, NEW.researcher_id);
+
+    UPDATE simulation_rollup SET
+        run_count = run_count + 1,
+        fidelity_sum = fidelity_sum + COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        fidelity_count = fidelity_count + (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = NEW.run_id),
+        success_sum = success_sum + COALESCE((SELECT SUM(success_probability) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        success_count = success_count + (SELECT COUNT(success_probability) FROM simulation_result WHERE run_id = NEW.run_id),
+        time_sum = time_sum + COALESCE((SELECT SUM(execution_time_seconds) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        time_count = time_count + (SELECT COUNT(execution_time_seconds) FROM simulation_result WHERE run_id = NEW.run_id),
+        repro_sum = repro_sum + COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id), 0),
+        repro_count = repro_count + (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id)
+    WHERE framework = NEW.framework
+      AND algorithm_type = COALESCE(NEW.algorithm_type, '')
+      AND num_qubits = NEW.num_qubits
+      AND researcher_id = NEW.researcher_id;
+END;
+
+-- BEFORE DELETE so the children are still visible: the ORM deletes them
+-- first (their own triggers subtract), an FK cascade deletes them after
+-- (their triggers no longer find the run and do nothing)
+CREATE TRIGGER IF NOT EXISTS rollup_simulation_delete
+    BEFORE DELETE ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        run_count = run_count - 1,
+        fidelity_sum = fidelity_sum - COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        fidelity_count = fidelity_count - (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = OLD.run_id),
+        success_sum = success_sum - COALESCE((SELECT SUM(success_probability) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        success_count = success_count - (SELECT COUNT(success_probability) FROM simulation_result WHERE run_id = OLD.run_id),
+        time_sum = time_sum - COALESCE((SELECT SUM(execution_time_seconds) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        time_count = time_count - (SELECT COUNT(execution_time_seconds) FROM simulation_result WHERE run_id = OLD.run_id),
+        repro_sum = repro_sum - COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id), 0),
+        repro_count = repro_count - (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id)
+    WHERE framework = OLD.framework
+      AND algorithm_type = COALESCE(OLD.algorithm_type, '')
+      AND num_qubits = OLD.num_qubits
+      AND researcher_id = OLD.researcher_id;
+
+    DELETE FROM simulation_rollup
+    WHERE framework = OLD.framework
+      AND algorithm_type = COALESCE(OLD.algorithm_type, '')
+      AND num_qubits = OLD.num_qubits
+      AND researcher_id = OLD.researcher_id
+      AND run_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_simulation_update
+    AFTER UPDATE OF framework, algorithm_type, num_qubits, researcher_id ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        run_count = run_count - 1,
+        fidelity_sum = fidelity_sum - COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        fidelity_count = fidelity_count - (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = OLD.run_id),
+        success_sum = success_sum - COALESCE((SELECT SUM(success_probability) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        success_count = success_count - (SELECT COUNT(success_probability) FROM simulation_result WHERE run_id = OLD.run_id),
+        time_sum = time_sum - COALESCE((SELECT SUM(execution_time_seconds) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        time_count = time_count - (SELECT COUNT(execution_time_seconds) FROM simulation_result WHERE run_id = OLD.run_id),
+        repro_sum = repro_sum - COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id), 0),
+        repro_count = repro_count - (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id)
+    WHERE framework = OLD.framework
+      AND algorithm_type = COALESCE(OLD.algorithm_type, '')
+      AND num_qubits = OLD.num_qubits
+      AND researcher_id = OLD.researcher_id;
+
+    DELETE FROM simulation_rollup
+    WHERE framework = OLD.framework
+      AND algorithm_type = COALESCE(OLD.algorithm_type, '')
+      AND num_qubits = OLD.num_qubits
+      AND researcher_id = OLD.researcher_id
+      AND run_count <= 0;
+
+    INSERT OR IGNORE INTO simulation_rollup (framework, algorithm_type, num_qubits, researcher_id)
+    VALUES (NEW.framework, COALESCE(NEW.algorithm_type, ''), NEW.num_qubits, NEW.researcher_id);
+
+    UPDATE simulation_rollup SET
+        run_count = run_count + 1,
+        fidelity_sum = fidelity_sum + COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        fidelity_count = fidelity_count + (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = NEW.run_id),
+        success_sum = success_sum + COALESCE((SELECT SUM(success_probability) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        success_count = success_count + (SELECT COUNT(success_probability) FROM simulation_result WHERE run_id = NEW.run_id),
+        time_sum = time_sum + COALESCE((SELECT SUM(execution_time_seconds) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        time_count = time_count + (SELECT COUNT(execution_time_seconds) FROM simulation_result WHERE run_id = NEW.run_id),
+        repro_sum = repro_sum + COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id), 0),
+        repro_count = repro_count + (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id)
+    WHERE framework = NEW.framework
+      AND algorithm_type = COALESCE(NEW.algorithm_type, '')
+      AND num_qubits = NEW.num_qubits
+      AND researcher_id = NEW.researcher_id;
+END;
+
+-- =====================================================
+-- SIMULATION_RESULT: fidelity / success / execution time
+-- =====================================================
+CREATE TRIGGER IF NOT EXISTS rollup_result_insert
+    AFTER INSERT ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        fidelity_sum = fidelity_sum + COALESCE(NEW.fidelity, 0),
+        fidelity_count = fidelity_count + (NEW.fidelity IS NOT NULL),
+        success_sum = success_sum + COALESCE(NEW.success_probability, 0),
+        success_count = success_count + (NEW.success_probability IS NOT NULL),
+        time_sum = time_sum + COALESCE(NEW.execution_time_seconds, 0),
+        time_count = time_count + (NEW.execution_time_seconds IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_result_delete
+    AFTER DELETE ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        fidelity_sum = fidelity_sum - COALESCE(OLD.fidelity, 0),
+        fidelity_count = fidelity_count - (OLD.fidelity IS NOT NULL),
+        success_sum = success_sum - COALESCE(OLD.success_probability, 0),
+        success_count = success_count - (OLD.success_probability IS NOT NULL),
+        time_sum = time_sum - COALESCE(OLD.execution_time_seconds, 0),
+        time_count = time_count - (OLD.execution_time_seconds IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = OLD.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_result_update
+    AFTER UPDATE OF run_id, fidelity, success_probability, execution_time_seconds ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        fidelity_sum = fidelity_sum - COALESCE(OLD.fidelity, 0),
+        fidelity_count = fidelity_count - (OLD.fidelity IS NOT NULL),
+        success_sum = success_sum - COALESCE(OLD.success_probability, 0),
+        success_count = success_count - (OLD.success_probability IS NOT NULL),
+        time_sum = time_sum - COALESCE(OLD.execution_time_seconds, 0),
+        time_count = time_count - (OLD.execution_time_seconds IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = OLD.run_id);
+
+    UPDATE simulation_rollup SET
+        fidelity_sum = fidelity_sum + COALESCE(NEW.fidelity, 0),
+        fidelity_count = fidelity_count + (NEW.fidelity IS NOT NULL),
+        success_sum = success_sum + COALESCE(NEW.success_probability, 0),
+        success_count = success_count + (NEW.success_probability IS NOT NULL),
+        time_sum = time_sum + COALESCE(NEW.execution_time_seconds, 0),
+        time_count = time_count + (NEW.execution_time_seconds IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = NEW.run_id);
+END;
+
+-- =====================================================
+-- REPRODUCIBILITY_METADATA: reproducibility score
+-- =====================================================
+CREATE TRIGGER IF NOT EXISTS rollup_metadata_insert
+    AFTER INSERT ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        repro_sum = repro_sum + COALESCE(NEW.reproducibility_score, 0),
+        repro_count = repro_count + (NEW.reproducibility_score IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_metadata_delete
+    AFTER DELETE ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        repro_sum = repro_sum - COALESCE(OLD.reproducibility_score, 0),
+        repro_count = repro_count - (OLD.reproducibility_score IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = OLD.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_metadata_update
+    AFTER UPDATE OF run_id, reproducibility_score ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_rollup SET
+        repro_sum = repro_sum - COALESCE(OLD.reproducibility_score, 0),
+        repro_count = repro_count - (OLD.reproducibility_score IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = OLD.run_id);
+
+    UPDATE simulation_rollup SET
+        repro_sum = repro_sum + COALESCE(NEW.reproducibility_score, 0),
+        repro_count = repro_count + (NEW.reproducibility_score IS NOT NULL)
+    WHERE (framework, algorithm_type, num_qubits, researcher_id) =
+          (SELECT framework, COALESCE(algorithm_type, ''), num_qubits, researcher_id
+           FROM quantum_simulation WHERE run_id = NEW.run_id);
+END;
+
+-- =====================================================
+-- TRENDS: the same running sums per time bucket, kept at
+-- hour, day and week (Monday-start) resolution
+-- =====================================================
+CREATE TABLE IF NOT EXISTS simulation_trend_rollup (
+    resolution TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    fidelity_sum REAL NOT NULL DEFAULT 0,
+    fidelity_count INTEGER NOT NULL DEFAULT 0,
+    repro_sum REAL NOT NULL DEFAULT 0,
+    repro_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (resolution, bucket)
+);
+
+-- The buckets each run falls into, one row per resolution
+CREATE VIEW IF NOT EXISTS vw_simulation_trend_bucket AS
+SELECT
+    qs.run_id,
+    r.resolution,
+    CASE r.resolution
+        WHEN 'hour' THEN strftime('%Y-%m-%d %H:00:00', qs.execution_date)
+        WHEN 'day' THEN date(qs.execution_date)
+        ELSE date(qs.execution_date, 'weekday 0', '-6 days')
+    END AS bucket
+FROM quantum_simulation qs
+CROSS JOIN (SELECT 'hour' AS resolution UNION ALL SELECT 'day' UNION ALL SELECT 'week') r;
+
+CREATE TRIGGER IF NOT EXISTS trend_simulation_insert
+    AFTER INSERT ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO simulation_trend_rollup (resolution, bucket)
+    SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id;
+
+    UPDATE simulation_trend_rollup SET
+        run_count = run_count + 1,
+        fidelity_sum = fidelity_sum + COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        fidelity_count = fidelity_count + (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = NEW.run_id),
+        repro_sum = repro_sum + COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id), 0),
+        repro_count = repro_count + (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
+
+-- BEFORE DELETE / BEFORE UPDATE so the view still shows the old buckets
+CREATE TRIGGER IF NOT EXISTS trend_simulation_delete
+    BEFORE DELETE ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        run_count = run_count - 1,
+        fidelity_sum = fidelity_sum - COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        fidelity_count = fidelity_count - (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = OLD.run_id),
+        repro_sum = repro_sum - COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id), 0),
+        repro_count = repro_count - (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+
+    DELETE FROM simulation_trend_rollup
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id)
+      AND run_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_simulation_move_out
+    BEFORE UPDATE OF execution_date ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        run_count = run_count - 1,
+        fidelity_sum = fidelity_sum - COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = OLD.run_id), 0),
+        fidelity_count = fidelity_count - (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = OLD.run_id),
+        repro_sum = repro_sum - COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id), 0),
+        repro_count = repro_count - (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = OLD.run_id)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+
+    DELETE FROM simulation_trend_rollup
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id)
+      AND run_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_simulation_move_in
+    AFTER UPDATE OF execution_date ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO simulation_trend_rollup (resolution, bucket)
+    SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id;
+
+    UPDATE simulation_trend_rollup SET
+        run_count = run_count + 1,
+        fidelity_sum = fidelity_sum + COALESCE((SELECT SUM(fidelity) FROM simulation_result WHERE run_id = NEW.run_id), 0),
+        fidelity_count = fidelity_count + (SELECT COUNT(fidelity) FROM simulation_result WHERE run_id = NEW.run_id),
+        repro_sum = repro_sum + COALESCE((SELECT SUM(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id), 0),
+        repro_count = repro_count + (SELECT COUNT(reproducibility_score) FROM reproducibility_metadata WHERE run_id = NEW.run_id)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_result_insert
+    AFTER INSERT ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        fidelity_sum = fidelity_sum + COALESCE(NEW.fidelity, 0),
+        fidelity_count = fidelity_count + (NEW.fidelity IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_result_delete
+    AFTER DELETE ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        fidelity_sum = fidelity_sum - COALESCE(OLD.fidelity, 0),
+        fidelity_count = fidelity_count - (OLD.fidelity IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_result_update
+    AFTER UPDATE OF run_id, fidelity ON simulation_result
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        fidelity_sum = fidelity_sum - COALESCE(OLD.fidelity, 0),
+        fidelity_count = fidelity_count - (OLD.fidelity IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+
+    UPDATE simulation_trend_rollup SET
+        fidelity_sum = fidelity_sum + COALESCE(NEW.fidelity, 0),
+        fidelity_count = fidelity_count + (NEW.fidelity IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_metadata_insert
+    AFTER INSERT ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        repro_sum = repro_sum + COALESCE(NEW.reproducibility_score, 0),
+        repro_count = repro_count + (NEW.reproducibility_score IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_metadata_delete
+    AFTER DELETE ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        repro_sum = repro_sum - COALESCE(OLD.reproducibility_score, 0),
+        repro_count = repro_count - (OLD.reproducibility_score IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trend_metadata_update
+    AFTER UPDATE OF run_id, reproducibility_score ON reproducibility_metadata
+    FOR EACH ROW
+BEGIN
+    UPDATE simulation_trend_rollup SET
+        repro_sum = repro_sum - COALESCE(OLD.reproducibility_score, 0),
+        repro_count = repro_count - (OLD.reproducibility_score IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = OLD.run_id);
+
+    UPDATE simulation_trend_rollup SET
+        repro_sum = repro_sum + COALESCE(NEW.reproducibility_score, 0),
+        repro_count = repro_count + (NEW.reproducibility_score IS NOT NULL)
+    WHERE (resolution, bucket) IN (SELECT resolution, bucket FROM vw_simulation_trend_bucket WHERE run_id = NEW.run_id);
+END;
@@ -7,6 +7,18 @@
 PRAGMA foreign_keys = ON;
 
 -- Drop existing tables in reverse dependency order
+DROP TABLE IF EXISTS table_version;
+DROP VIEW IF EXISTS vw_simulation_trend_bucket;
+DROP TABLE IF EXISTS simulation_trend_rollup;
+DROP TABLE IF EXISTS simulation_rollup;
+DROP TABLE IF EXISTS researcher_fts;
+DROP TABLE IF EXISTS project_fts;
+DROP TABLE IF EXISTS simulation_fts;
+DROP TABLE IF EXISTS access_log_counter;
+DROP VIEW IF EXISTS vw_parameter_typed;
+DROP TABLE IF EXISTS parameter_index;
+DROP TABLE IF EXISTS output_blob;
+DROP TABLE IF EXISTS simulation_artifact;
 DROP TABLE IF EXISTS access_log;
 DROP TABLE IF EXISTS reproducibility_metadata;
 DROP TABLE IF EXISTS simulation_result;
@@ -143,12 +155,13 @@ CREATE INDEX idx_circuit_commit ON quantum_circuit_version(commit_hash);
 CREATE TABLE simulation_result (
     result_id INTEGER PRIMARY KEY AUTOINCREMENT,
     run_id INTEGER UNIQUE NOT NULL,
-    output_data TEXT,  -- JSON stored as TEXT in SQLite
+    output_data TEXT,  -- legacy inline payloads; new ones go to output_blob (output_blobs.sql)
+    output_digest TEXT,  -- SHA-256 of the payload in output_blob
     execution_time_seconds REAL CHECK (execution_time_seconds >= 0),
     success_probability REAL CHECK (success_probability BETWEEN 0 AND 1),
     fidelity REAL CHECK (fidelity BETWEEN 0 AND 1),
     energy_value REAL,
-    measurement_counts TEXT,  -- JSON stored as TEXT
+    measurement_counts BLOB,  -- packed histogram (see backend/utils/counts_encoding.py); older rows hold JSON text
     error_rate REAL CHECK (error_rate BETWEEN 0 AND 1),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (run_id) REFERENCES quantum_simulation(run_id) ON DELETE CASCADE
@@ -261,6 +274,22 @@ LEFT JOIN reproducibility_metadata rm ON qs.run_id = rm.run_id
 JOIN simulation_project p ON qs.project_id = qs.project_id
 JOIN researcher r ON qs.researcher_id = r.researcher_id;
 
+-- =====================================================
+-- DERIVED TABLES
+-- Analytics and trend rollups and their maintenance triggers live in rollups.sql,
+-- the FTS5 search index and its sync triggers in search_index.sql,
+-- access-log counters (kept by the audit writer) in access_counters.sql,
+-- the typed parameter index behind /api/simulations/by-parameters in
+-- parameter_index.sql, the content-addressed output payload store in
+-- output_blobs.sql, and the index of on-disk run artifacts
+-- (ARTIFACT_DIR/<run_id>/<name>) in artifacts.sql, and the per-table change
+-- counters behind response caching and ETags in table_versions.sql;
+-- the backend applies all of them on startup.
+-- New audit rows go to monthly partition files (access_log_partition.sql,
+-- database/access_log/); access_log above keeps older rows until
+-- 'flask --app app audit migrate' moves them.
+-- =====================================================
+
 -- =====================================================
 -- END OF SCHEMA
 -- =====================================================
\ No newline at end of file
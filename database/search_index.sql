@@ -0,0 +1,127 @@
+-- =====================================================
+-- QSLRM Full-Text Search Index - SQLite FTS5
+-- External-content FTS5 tables over researcher, simulation_project and
+-- quantum_simulation, kept in sync by triggers. Backs /api/search.
+-- Applied automatically by the backend on startup (utils/search_index.py);
+-- safe to re-run. Maintenance: flask --app app search rebuild|optimize|benchmark
+-- =====================================================
+
+-- =====================================================
+-- 1. RESEARCHER_FTS (researcher)
+-- =====================================================
+CREATE VIRTUAL TABLE IF NOT EXISTS researcher_fts USING fts5(
+    first_name,
+    last_name,
+    email,
+    institution,
+    department,
+    content='researcher',
+    content_rowid='researcher_id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS researcher_fts_insert
+    AFTER INSERT ON researcher
+    FOR EACH ROW
+BEGIN
+    INSERT INTO researcher_fts (rowid, first_name, last_name, email, institution, department)
+    VALUES (NEW.researcher_id, NEW.first_name, NEW.last_name, NEW.email, NEW.institution, NEW.department);
+END;
+
+CREATE TRIGGER IF NOT EXISTS researcher_fts_delete
+    AFTER DELETE ON researcher
+    FOR EACH ROW
+BEGIN
+    INSERT INTO researcher_fts (researcher_fts, rowid, first_name, last_name, email, institution, department)
+    VALUES ('delete', OLD.researcher_id, OLD.first_name, OLD.last_name, OLD.email, OLD.institution, OLD.department);
+END;
+
+CREATE TRIGGER IF NOT EXISTS researcher_fts_update
+    AFTER UPDATE OF first_name, last_name, email, institution, department ON researcher
+    FOR EACH ROW
+BEGIN
+    INSERT INTO researcher_fts (researcher_fts, rowid, first_name, last_name, email, institution, department)
+    VALUES ('delete', OLD.researcher_id, OLD.first_name, OLD.last_name, OLD.email, OLD.institution, OLD.department);
+    INSERT INTO researcher_fts (rowid, first_name, last_name, email, institution, department)
+    VALUES (NEW.researcher_id, NEW.first_name, NEW.last_name, NEW.email, NEW.institution, NEW.department);
+END;
+
+-- =====================================================
+-- 2. PROJECT_FTS (simulation_project)
+-- =====================================================
+CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5(
+    title,
+    description,
+    field_of_study,
+    content='simulation_project',
+    content_rowid='project_id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS project_fts_insert
+    AFTER INSERT ON simulation_project
+    FOR EACH ROW
+BEGIN
+    INSERT INTO project_fts (rowid, title, description, field_of_study)
+    VALUES (NEW.project_id, NEW.title, NEW.description, NEW.field_of_study);
+END;
+
+CREATE TRIGGER IF NOT EXISTS project_fts_delete
+    AFTER DELETE ON simulation_project
+    FOR EACH ROW
+BEGIN
+    INSERT INTO project_fts (project_fts, rowid, title, description, field_of_study)
+    VALUES ('delete', OLD.project_id, OLD.title, OLD.description, OLD.field_of_study);
+END;
+
+CREATE TRIGGER IF NOT EXISTS project_fts_update
+    AFTER UPDATE OF title, description, field_of_study ON simulation_project
+    FOR EACH ROW
+BEGIN
+    INSERT INTO project_fts (project_fts, rowid, title, description, field_of_study)
+    VALUES ('delete', OLD.project_id, OLD.title, OLD.description, OLD.field_of_study);
+    INSERT INTO project_fts (rowid, title, description, field_of_study)
+    VALUES (NEW.project_id, NEW.title, NEW.description, NEW.field_of_study);
+END;
+
+-- =====================================================
+-- 3. SIMULATION_FTS (quantum_simulation)
+-- =====================================================
+CREATE VIRTUAL TABLE IF NOT EXISTS simulation_fts USING fts5(
+    simulation_id,
+    description,
+    algorithm_type,
+    framework,
+    content='quantum_simulation',
+    content_rowid='run_id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS simulation_fts_insert
+    AFTER INSERT ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT INTO simulation_fts (rowid, simulation_id, description, algorithm_type, framework)
+    VALUES (NEW.run_id, NEW.simulation_id, NEW.description, NEW.algorithm_type, NEW.framework);
+END;
+
+CREATE TRIGGER IF NOT EXISTS simulation_fts_delete
+    AFTER DELETE ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT INTO simulation_fts (simulation_fts, rowid, simulation_id, description, algorithm_type, framework)
+    VALUES ('delete', OLD.run_id, OLD.simulation_id, OLD.description, OLD.algorithm_type, OLD.framework);
+END;
+
+CREATE TRIGGER IF NOT EXISTS simulation_fts_update
+    AFTER UPDATE OF simulation_id, description, algorithm_type, framework ON quantum_simulation
+    FOR EACH ROW
+BEGIN
+    INSERT INTO simulation_fts (simulation_fts, rowid, simulation_id, description, algorithm_type, framework)
+    VALUES ('delete', OLD.run_id, OLD.simulation_id, OLD.description, OLD.algorithm_type, OLD.framework);
+    INSERT INTO simulation_fts (rowid, simulation_id, description, algorithm_type, framework)
+    VALUES (NEW.run_id, NEW.simulation_id, NEW.description, NEW.algorithm_type, NEW.framework);
+END;
@@ -0,0 +1,201 @@
+-- =====================================================
+-- QSLRM Table Versions - SQLite
+-- One change counter per table, bumped by triggers on every row written,
+-- so every process sharing the database (web workers, the job runner, CLI
+-- commands) sees the same versions. Cached GET responses and ETags are
+-- keyed on them (backend/utils/cache.py).
+-- Applied automatically by the backend on startup; safe to re-run.
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS table_version (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO table_version (table_name) VALUES
+    ('researcher'),
+    ('simulation_project'),
+    ('project_researchers'),
+    ('quantum_simulation'),
+    ('parameter'),
+    ('quantum_circuit_version'),
+    ('simulation_result'),
+    ('reproducibility_metadata'),
+    ('output_blob'),
+    ('simulation_artifact');
+
+-- researcher
+CREATE TRIGGER IF NOT EXISTS trg_version_researcher_insert AFTER INSERT ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'researcher';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_researcher_update AFTER UPDATE ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'researcher';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_researcher_delete AFTER DELETE ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'researcher';
+END;
+
+-- simulation_project
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_project_insert AFTER INSERT ON simulation_project
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_project';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_project_update AFTER UPDATE ON simulation_project
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_project';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_project_delete AFTER DELETE ON simulation_project
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_project';
+END;
+
+-- project_researchers
+CREATE TRIGGER IF NOT EXISTS trg_version_project_researchers_insert AFTER INSERT ON project_researchers
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'project_researchers';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_project_researchers_update AFTER UPDATE ON project_researchers
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'project_researchers';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_project_researchers_delete AFTER DELETE ON project_researchers
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'project_researchers';
+END;
+
+-- quantum_simulation
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_simulation_insert AFTER INSERT ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_simulation';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_simulation_update AFTER UPDATE ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_simulation';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_simulation_delete AFTER DELETE ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_simulation';
+END;
+
+-- parameter
+CREATE TRIGGER IF NOT EXISTS trg_version_parameter_insert AFTER INSERT ON parameter
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'parameter';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_parameter_update AFTER UPDATE ON parameter
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'parameter';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_parameter_delete AFTER DELETE ON parameter
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'parameter';
+END;
+
+-- quantum_circuit_version
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_circuit_version_insert AFTER INSERT ON quantum_circuit_version
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_circuit_version';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_circuit_version_update AFTER UPDATE ON quantum_circuit_version
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_circuit_version';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_quantum_circuit_version_delete AFTER DELETE ON quantum_circuit_version
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'quantum_circuit_version';
+END;
+
+-- simulation_result
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_result_insert AFTER INSERT ON simulation_result
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_result';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_result_update AFTER UPDATE ON simulation_result
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_result';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_result_delete AFTER DELETE ON simulation_result
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_result';
+END;
+
+-- reproducibility_metadata
+CREATE TRIGGER IF NOT EXISTS trg_version_reproducibility_metadata_insert AFTER INSERT ON reproducibility_metadata
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'reproducibility_metadata';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_reproducibility_metadata_update AFTER UPDATE ON reproducibility_metadata
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'reproducibility_metadata';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_reproducibility_metadata_delete AFTER DELETE ON reproducibility_metadata
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'reproducibility_metadata';
+END;
+
+-- output_blob
+CREATE TRIGGER IF NOT EXISTS trg_version_output_blob_insert AFTER INSERT ON output_blob
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'output_blob';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_output_blob_update AFTER UPDATE ON output_blob
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'output_blob';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_output_blob_delete AFTER DELETE ON output_blob
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'output_blob';
+END;
+
+-- simulation_artifact
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_artifact_insert AFTER INSERT ON simulation_artifact
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_artifact';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_artifact_update AFTER UPDATE ON simulation_artifact
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_artifact';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_version_simulation_artifact_delete AFTER DELETE ON simulation_artifact
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'simulation_artifact';
+END;
+
+-- suggestion_index: only writes to the columns the type-ahead index reads
+-- (backend/utils/suggest.py), so status changes and logins leave it alone
+INSERT OR IGNORE INTO table_version (table_name) VALUES ('suggestion_index');
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_researcher_insert AFTER INSERT ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_researcher_update
+AFTER UPDATE OF first_name, last_name, institution ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_researcher_delete AFTER DELETE ON researcher
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_simulation_insert AFTER INSERT ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_simulation_update
+AFTER UPDATE OF researcher_id, algorithm_type ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_suggest_simulation_delete AFTER DELETE ON quantum_simulation
+BEGIN
+    UPDATE table_version SET version = version + 1 WHERE table_name = 'suggestion_index';
+END;
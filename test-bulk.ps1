@@ -0,0 +1,78 @@
+# QSLRM Bulk Ingestion Testing Script
+# A mixed batch must come back 207 with one status per record
+
+Write-Host ""
+Write-Host "========================================" -ForegroundColor Cyan
+Write-Host "QSLRM - Bulk Ingestion Test" -ForegroundColor Cyan
+Write-Host "========================================" -ForegroundColor Cyan
+Write-Host ""
+
+$baseUrl = "http://localhost:5000/api"
+$testPassed = 0
+$testFailed = 0
+$stamp = Get-Date -Format "yyyyMMddHHmmss"
+
+function Check($condition, $message) {
+    if ($condition) {
+        Write-Host "   ✓ $message" -ForegroundColor Green
+        $script:testPassed++
+    } else {
+        Write-Host "   ✗ $message" -ForegroundColor Red
+        $script:testFailed++
+    }
+}
+
+# TEST 1: Mixed batch - one valid record, records with wrongly typed scalar fields
+Write-Host "1. Posting a mixed batch..." -ForegroundColor Yellow
+$records = @(
+    @{ project_id = 1; researcher_id = 1; simulation_id = "BULK-OK-$stamp"; framework = "Qiskit"; num_qubits = 2
+       description = "valid record"; result = @{ fidelity = 0.9 }; metadata = @{ random_seed = 42 } },
+    @{ project_id = 1; researcher_id = 1; simulation_id = "BULK-DESC-$stamp"; framework = "Qiskit"; num_qubits = 2
+       description = @{ text = "not a string" } },
+    @{ project_id = 1; researcher_id = 1; simulation_id = "BULK-SEED-$stamp"; framework = "Qiskit"; num_qubits = 2
+       metadata = @{ random_seed = "seven" } },
+    @{ project_id = 1; researcher_id = 1; simulation_id = "BULK-FID-$stamp"; framework = "Qiskit"; num_qubits = 2
+       result = @{ fidelity = "high" } }
+)
+$body = ConvertTo-Json -InputObject $records -Depth 5
+
+$response = $null
+try {
+    $response = Invoke-WebRequest -Uri "$baseUrl/simulations/bulk" -Method POST -Body $body -ContentType "application/json" -UseBasicParsing
+} catch {
+    Write-Host "   ✗ Bulk request failed: $($_.Exception.Message)" -ForegroundColor Red
+    $testFailed++
+}
+
+if ($response) {
+    $result = $response.Content | ConvertFrom-Json
+    Check ($response.StatusCode -eq 207) "Status code is 207 (got $($response.StatusCode))"
+    Check ($result.created -eq 1) "One record created (got $($result.created))"
+    Check ($result.failed -eq 3) "Three records failed (got $($result.failed))"
+    Check ($result.items.Count -eq 4) "One status per record"
+    Check ($result.items[0].status -eq "created") "Valid record created"
+    Check ($result.items[1].status -eq "error" -and $result.items[1].error -like "*description*") "Object description rejected on its own"
+    Check ($result.items[2].status -eq "error" -and $result.items[2].error -like "*random_seed*") "String random_seed rejected on its own"
+    Check ($result.items[3].status -eq "error" -and $result.items[3].error -like "*fidelity*") "String fidelity rejected on its own"
+
+    # CLEANUP
+    if ($result.items[0].run_id) {
+        try {
+            Invoke-RestMethod -Uri "$baseUrl/simulations/$($result.items[0].run_id)" -Method DELETE | Out-Null
+        } catch {
+            Write-Host "   ⚠ Cleanup failed: $($_.Exception.Message)" -ForegroundColor Yellow
+        }
+    }
+}
+
+# SUMMARY
+Write-Host ""
+Write-Host "========================================" -ForegroundColor Cyan
+Write-Host "Tests Passed: " -NoNewline
+Write-Host "$testPassed" -ForegroundColor Green
+Write-Host "Tests Failed: " -NoNewline
+Write-Host "$testFailed" -ForegroundColor $(if ($testFailed -eq 0) { "Green" } else { "Red" })
+Write-Host "========================================" -ForegroundColor Cyan
+Write-Host ""
+
+exit $(if ($testFailed -eq 0) { 0 } else { 1 })